@@ -0,0 +1,87 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+import threading
+import weakref
+
+from managers import STORAGE_MODE, FinancialManager
+
+
+# مخزن مشترک FinancialManager ها برای چند کاربر: هر حساب قفل مخصوص خودش را
+# دارد تا نوشتن‌های کاربران مختلف موازی انجام شوند؛ حداکثر max_accounts حساب
+# در حافظه می‌ماند و کم‌استفاده‌ترین حساب پس از ذخیره و بستن کنار گذاشته می‌شود
+class AccountService:
+    MAX_ACCOUNTS = 64
+
+    def __init__(self, max_accounts=None, storage_mode=STORAGE_MODE, factory=FinancialManager):
+        self.max_accounts = max_accounts or self.MAX_ACCOUNTS
+        self.storage_mode = storage_mode
+        self.factory = factory
+        self.accounts = OrderedDict()
+        # قفل هر حساب فقط تا وقتی کسی آن را در دست دارد نگه داشته می‌شود؛ قفل تازه‌ای که
+        # بعد از آن ساخته شود امن است چون دیگر کسی قفل قبلی را ندارد
+        self.locks = weakref.WeakValueDictionary()
+        # فقط برای دسترسی به accounts و locks؛ هیچ I/O زیر این قفل انجام نمی‌شود
+        self.pool_lock = threading.Lock()
+
+    def lock(self, user_id):
+        with self.pool_lock:
+            lock = self.locks.get(user_id)
+            if lock is None:
+                lock = self.locks[user_id] = threading.RLock()
+            return lock
+
+    @contextmanager
+    def account(self, user_id):
+        try:
+            with self.lock(user_id):
+                yield self.load(user_id)
+        finally:
+            self.evict()
+
+    # فقط با در دست داشتن قفل حساب صدا زده می‌شود
+    def load(self, user_id):
+        with self.pool_lock:
+            fm = self.accounts.get(user_id)
+            if fm is not None:
+                self.accounts.move_to_end(user_id)
+                return fm
+        fm = self.factory(user_id, self.storage_mode)
+        with self.pool_lock:
+            self.accounts[user_id] = fm
+        return fm
+
+    def evict(self):
+        while True:
+            with self.pool_lock:
+                if len(self.accounts) <= self.max_accounts:
+                    return
+                user_id, fm = next(iter(self.accounts.items()))
+            # حساب فقط زیر قفل خودش بسته می‌شود تا بارگذاری دوباره منتظر ذخیره بماند
+            with self.lock(user_id):
+                with self.pool_lock:
+                    if self.accounts.get(user_id) is not fm:
+                        continue
+                    del self.accounts[user_id]
+                fm.close()
+
+    def add_income(self, user_id, amount, description, source):
+        with self.account(user_id) as fm:
+            return fm.add_income(amount, description, source)
+
+    def add_expense(self, user_id, amount, description, category):
+        with self.account(user_id) as fm:
+            return fm.add_expense(amount, description, category)
+
+    def get_balance(self, user_id):
+        with self.account(user_id) as fm:
+            return fm.get_balance()
+
+    def close(self):
+        with self.pool_lock:
+            user_ids = list(self.accounts)
+        for user_id in user_ids:
+            with self.lock(user_id):
+                with self.pool_lock:
+                    fm = self.accounts.pop(user_id, None)
+                if fm is not None:
+                    fm.close()
@@ -0,0 +1,195 @@
+from storage import (ColumnarTransactions, StringTable, TimeIndex, TRANSACTION_TYPES, TYPE_CODES,
+                     format_timestamp, transaction_timestamp)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+DAY = 86400
+
+
+def day_label(day, key):
+    return format_timestamp(day * DAY)[:10 if key == 'day' else 7]
+
+
+# مسیر پایتون خالص؛ نتایج آن با NumpyAnalytics یکسان است
+class PythonAnalytics:
+    name = 'python'
+
+    def __init__(self, rows=()):
+        self.columns = ColumnarTransactions(rows)
+        self.time_index = None
+
+    @property
+    def count(self):
+        return len(self.columns)
+
+    def append(self, transaction):
+        self.columns.append(transaction)
+        if self.time_index is not None:
+            self.time_index.add(transaction_timestamp(transaction), transaction['type'], transaction['amount'])
+
+    def totals(self):
+        return self.columns.totals_by('type')
+
+    def totals_by(self, key, transaction_type=None):
+        return self.columns.totals_by(key, transaction_type)
+
+    def period_totals(self, start=None, end=None):
+        if self.time_index is None:
+            self.time_index = TimeIndex(self.columns.entries())
+        return self.time_index.range_totals(start, end)
+
+    # جمع پنجره لغزان روزانه: برای هر روز، جمع window_days روز منتهی به آن
+    def rolling_totals(self, transaction_type='expense', window_days=7):
+        columns = self.columns
+        code = TYPE_CODES[transaction_type]
+        days = [ts // DAY for ts in columns.times]
+        if not days:
+            return []
+        first_day = min(days)
+        daily = [0.0] * (max(days) - first_day + 1)
+        for day, t, amount in zip(days, columns.types, columns.amounts):
+            if t == code:
+                daily[day - first_day] += amount
+
+        prefix = [0.0]
+        for amount in daily:
+            prefix.append(prefix[-1] + amount)
+        return [
+            (day_label(first_day + i, 'day'), prefix[i + 1] - prefix[max(0, i + 1 - window_days)])
+            for i in range(len(daily))
+        ]
+
+
+# همان محاسبات به صورت برداری روی آرایه‌های NumPy؛ آرایه‌ها با دو برابر
+# شدن ظرفیت رشد می‌کنند تا افزودن تراکنش تک‌تک هم سرشکن O(1) باشد
+class NumpyAnalytics:
+    name = 'numpy'
+
+    def __init__(self, rows=()):
+        columns = rows if isinstance(rows, ColumnarTransactions) else ColumnarTransactions(rows)
+        self.strings = StringTable()
+        self.strings.values = list(columns.strings.values)
+        self.strings.codes = dict(columns.strings.codes)
+        self.size = len(columns)
+        capacity = max(1024, self.size)
+        self.times = np.zeros(capacity, dtype=np.int64)
+        self.types = np.zeros(capacity, dtype=np.int8)
+        self.amounts = np.zeros(capacity, dtype=np.float64)
+        self.categories = np.zeros(capacity, dtype=np.int32)
+        self.sources = np.zeros(capacity, dtype=np.int32)
+        self.times[:self.size] = np.frombuffer(columns.times, dtype=np.int64)
+        self.types[:self.size] = np.frombuffer(columns.types, dtype=np.int8)
+        self.amounts[:self.size] = np.frombuffer(columns.amounts, dtype=np.float64)
+        self.categories[:self.size] = np.frombuffer(columns.categories, dtype=np.int32)
+        self.sources[:self.size] = np.frombuffer(columns.sources, dtype=np.int32)
+        self.sorted_order = None
+
+    @property
+    def count(self):
+        return self.size
+
+    def append(self, transaction):
+        if self.size == len(self.times):
+            capacity = 2 * len(self.times)
+            for name in ('times', 'types', 'amounts', 'categories', 'sources'):
+                column = getattr(self, name)
+                grown = np.zeros(capacity, dtype=column.dtype)
+                grown[:self.size] = column[:self.size]
+                setattr(self, name, grown)
+        i = self.size
+        self.times[i] = transaction_timestamp(transaction)
+        self.types[i] = TYPE_CODES[transaction['type']]
+        self.amounts[i] = transaction['amount']
+        self.categories[i] = self.strings.intern(transaction.get('category'))
+        self.sources[i] = self.strings.intern(transaction.get('source'))
+        self.size += 1
+        self.sorted_order = None
+
+    def column(self, name):
+        return getattr(self, name)[:self.size]
+
+    def totals(self):
+        sums = np.bincount(self.column('types'), weights=self.column('amounts'), minlength=len(TRANSACTION_TYPES))
+        present = np.bincount(self.column('types'), minlength=len(TRANSACTION_TYPES))
+        return {TRANSACTION_TYPES[code]: float(sums[code]) for code in range(len(TRANSACTION_TYPES)) if present[code]}
+
+    def totals_by(self, key, transaction_type=None):
+        if key == 'type':
+            totals = self.totals()
+            if transaction_type is not None:
+                return {k: v for k, v in totals.items() if k == transaction_type}
+            return totals
+
+        amounts = self.column('amounts')
+        if key in ('category', 'source'):
+            codes = self.column('categories' if key == 'category' else 'sources')
+        else:
+            codes = self.column('times') // DAY
+        if transaction_type is not None:
+            mask = self.column('types') == TYPE_CODES[transaction_type]
+            codes = codes[mask]
+            amounts = amounts[mask]
+
+        if key in ('category', 'source'):
+            mask = codes >= 0
+            codes = codes[mask]
+            amounts = amounts[mask]
+            if not len(codes):
+                return {}
+            sums = np.bincount(codes, weights=amounts)
+            present = np.bincount(codes)
+            return {self.strings.values[code]: float(sums[code]) for code in np.nonzero(present)[0]}
+
+        if not len(codes):
+            return {}
+        first_day = int(codes.min())
+        sums = np.bincount(codes - first_day, weights=amounts)
+        present = np.bincount(codes - first_day)
+        totals = {}
+        for offset in np.nonzero(present)[0]:
+            group = day_label(first_day + int(offset), key)
+            totals[group] = totals.get(group, 0) + float(sums[offset])
+        return totals
+
+    def period_totals(self, start=None, end=None):
+        if self.sorted_order is None:
+            order = np.argsort(self.column('times'), kind='stable')
+            self.sorted_times = self.column('times')[order]
+            sorted_types = self.column('types')[order]
+            sorted_amounts = self.column('amounts')[order]
+            self.prefix = {}
+            for name, code in TYPE_CODES.items():
+                self.prefix[name] = np.concatenate(([0.0], np.cumsum(np.where(sorted_types == code, sorted_amounts, 0.0))))
+            self.sorted_order = order
+
+        i = 0 if start is None else int(np.searchsorted(self.sorted_times, start, side='left'))
+        j = self.size if end is None else int(np.searchsorted(self.sorted_times, end, side='left'))
+        j = max(i, j)
+        totals = {name: float(prefix[j] - prefix[i]) for name, prefix in self.prefix.items()}
+        totals['count'] = j - i
+        return totals
+
+    def rolling_totals(self, transaction_type='expense', window_days=7):
+        if not self.size:
+            return []
+        days = self.column('times') // DAY
+        first_day = int(days.min())
+        weights = np.where(self.column('types') == TYPE_CODES[transaction_type], self.column('amounts'), 0.0)
+        daily = np.bincount(days - first_day, weights=weights)
+        prefix = np.concatenate(([0.0], np.cumsum(daily)))
+        ends = np.arange(1, len(daily) + 1)
+        rolling = prefix[ends] - prefix[np.maximum(0, ends - window_days)]
+        return [(day_label(first_day + i, 'day'), float(value)) for i, value in enumerate(rolling)]
+
+
+def create_analytics(rows=(), use_numpy=None):
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+    if use_numpy:
+        return NumpyAnalytics(rows)
+    return PythonAnalytics(rows)
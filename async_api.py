@@ -0,0 +1,178 @@
+import asyncio
+import threading
+
+from managers import FinancialManager
+
+
+# تراکنش‌هایی که هم‌زمان برای یک حساب ثبت می‌شوند در صف همان حساب جمع و
+# با یک append_many در executor نوشته می‌شوند؛ برای هر حساب در هر لحظه
+# فقط یک نوشتن در جریان است و درخواست‌های رسیده در این فاصله دسته بعدی را می‌سازند
+class WriteBatcher:
+    def __init__(self, write_batch, executor=None):
+        self.write_batch = write_batch
+        self.executor = executor
+        self.pending = {}
+        self.running = {}
+
+    async def submit(self, key, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.setdefault(key, []).append((item, future))
+        if key not in self.running:
+            self.running[key] = loop.create_task(self.drain(key))
+        return await future
+
+    async def drain(self, key):
+        loop = asyncio.get_running_loop()
+        try:
+            while self.pending.get(key):
+                batch = self.pending.pop(key)
+                try:
+                    await loop.run_in_executor(self.executor, self.write_batch, key, [item for item, _ in batch])
+                except Exception as e:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_result(True)
+        finally:
+            del self.running[key]
+
+
+class AsyncFinancialManager:
+    def __init__(self, fm, executor=None):
+        self.fm = fm
+        self.executor = executor
+        # نوشتن دسته‌ای و خواندن‌های executor روی یک حساب پشت سر هم انجام می‌شوند
+        self.lock = threading.Lock()
+        self.batcher = WriteBatcher(self.write_batch, executor)
+
+    def write_batch(self, user_id, transactions):
+        with self.lock:
+            self.fm.add_transactions(transactions)
+
+    async def call(self, method, *args):
+        def run():
+            with self.lock:
+                return getattr(self.fm, method)(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, run)
+
+    async def add_transaction(self, transaction):
+        return await self.batcher.submit(self.fm.user_id, transaction)
+
+    async def add_income(self, amount, description, source):
+        return await self.add_transaction(FinancialManager.income_transaction(amount, description, source))
+
+    async def add_expense(self, amount, description, category):
+        return await self.add_transaction(FinancialManager.expense_transaction(amount, description, category))
+
+    # جمع‌های جاری در حافظه‌اند و نیازی به executor ندارند
+    async def get_balance(self):
+        return self.fm.get_balance()
+
+    async def get_total_income(self):
+        return self.fm.get_total_income()
+
+    async def get_total_expense(self):
+        return self.fm.get_total_expense()
+
+    async def get_category_expenses(self):
+        return await self.call('get_category_expenses')
+
+    async def get_weekly_report(self):
+        return await self.call('get_weekly_report')
+
+    async def get_monthly_report(self):
+        return await self.call('get_monthly_report')
+
+    async def import_statement(self, path, fmt=None):
+        return await self.call('import_statement', path, fmt)
+
+    async def save_data(self):
+        return await self.call('save_data')
+
+    async def close(self):
+        return await self.call('close')
+
+
+# همان API برای چند حساب از طریق AccountService؛ دسته‌ها به ازای user_id ساخته می‌شوند
+class AsyncAccountService:
+    def __init__(self, service, executor=None):
+        self.service = service
+        self.executor = executor
+        self.batcher = WriteBatcher(self.write_batch, executor)
+
+    def write_batch(self, user_id, transactions):
+        with self.service.account(user_id) as fm:
+            fm.add_transactions(transactions)
+
+    async def call(self, user_id, method, *args):
+        def run():
+            with self.service.account(user_id) as fm:
+                return getattr(fm, method)(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, run)
+
+    async def add_income(self, user_id, amount, description, source):
+        transaction = FinancialManager.income_transaction(amount, description, source)
+        return await self.batcher.submit(user_id, transaction)
+
+    async def add_expense(self, user_id, amount, description, category):
+        transaction = FinancialManager.expense_transaction(amount, description, category)
+        return await self.batcher.submit(user_id, transaction)
+
+    async def get_balance(self, user_id):
+        return await self.call(user_id, 'get_balance')
+
+    async def close(self):
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.service.close)
+
+
+# current_user برای یک کاربر رابط گرافیکی است؛ اینجا چند فراخواننده هم‌زمان‌اند،
+# پس login توکن نشست برمی‌گرداند و بقیه متدها همان توکن را می‌گیرند
+class AsyncUserManager:
+    def __init__(self, um, executor=None):
+        self.um = um
+        self.executor = executor
+
+    async def call(self, method, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, getattr(self.um, method), *args)
+
+    async def register_user(self, username, password, email):
+        return await self.call('register_user', username, password, email)
+
+    # خروجی: (success, message, token)
+    async def login_user(self, username, password):
+        return await self.call('open_session', username, password)
+
+    async def logout_user(self, token):
+        return self.um.close_session(token)
+
+    async def get_user_data(self, token):
+        def run():
+            username = self.um.session_user(token)
+            return None if username is None else self.um.get_user(username)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, run)
+
+
+# NotificationManager فقط در حافظه کار می‌کند و نوشتن فایل را به WRITER می‌سپارد،
+# پس متدها بدون executor و مستقیما در حلقه رویداد اجرا می‌شوند
+class AsyncNotificationManager:
+    def __init__(self, nm):
+        self.nm = nm
+
+    async def add_notification(self, title, message, notification_type="info"):
+        return self.nm.add_notification(title, message, notification_type)
+
+    async def mark_as_read(self, notification_id):
+        return self.nm.mark_as_read(notification_id)
+
+    async def mark_all_as_read(self):
+        return self.nm.mark_all_as_read()
+
+    async def get_unread_count(self):
+        return self.nm.get_unread_count()
+
+    async def get_recent_notifications(self, count=5):
+        return self.nm.get_recent_notifications(count)
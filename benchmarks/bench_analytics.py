@@ -0,0 +1,97 @@
+# مقایسه مسیر پایتون خالص و NumPy در analytics.py
+# اجرا: python benchmarks/bench_analytics.py [--sizes 10000,100000,1000000]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics import HAS_NUMPY, NumpyAnalytics, PythonAnalytics  # noqa: E402
+from storage import ColumnarTransactions, to_timestamp  # noqa: E402
+from datetime import datetime  # noqa: E402
+
+CATEGORIES = ['🍔 خوراک', '🚗 حمل‌ونقل', '🏠 مسکن', '🎮 تفریح', '🏥 سلامت', '📦 دیگر']
+SOURCES = ['حقوق', 'پروژه', 'سود بانکی']
+
+
+def make_columns(size, seed=42):
+    rng = random.Random(seed)
+    columns = ColumnarTransactions()
+    start = to_timestamp(datetime(2020, 1, 1))
+    span = to_timestamp(datetime(2026, 1, 1)) - start
+    category_codes = [columns.strings.intern(c) for c in CATEGORIES]
+    source_codes = [columns.strings.intern(s) for s in SOURCES]
+    description = columns.strings.intern('')
+    for _ in range(size):
+        is_income = rng.random() < 0.2
+        columns.amounts.append(float(rng.randint(10, 5000) * 1000))
+        columns.times.append(start + rng.randrange(span))
+        columns.types.append(0 if is_income else 1)
+        columns.categories.append(-1 if is_income else rng.choice(category_codes))
+        columns.sources.append(rng.choice(source_codes) if is_income else -1)
+        columns.descriptions.append(description)
+    return columns
+
+
+def operations(engine):
+    middle = to_timestamp(datetime(2023, 1, 1))
+    return {
+        'totals': lambda: engine.totals(),
+        'totals_by category': lambda: engine.totals_by('category', 'expense'),
+        'totals_by month': lambda: engine.totals_by('month'),
+        'period_totals': lambda: engine.period_totals(middle, middle + 90 * 86400),
+        'rolling 30d': lambda: engine.rolling_totals('expense', 30),
+    }
+
+
+def same(a, b):
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(x[0] == y[0] and same(x[1], y[1]) for x, y in zip(a, b))
+    return abs(a - b) <= 1e-6 * max(1.0, abs(a))
+
+
+def timed(func, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='10000,100000,1000000')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if not HAS_NUMPY:
+        print('NumPy نصب نیست؛ فقط مسیر پایتون اجرا می‌شود')
+
+    for size in (int(s) for s in args.sizes.split(',')):
+        columns = make_columns(size)
+        engines = [PythonAnalytics(columns)]
+        if HAS_NUMPY:
+            engines.append(NumpyAnalytics(columns))
+
+        print(f'\n{size:,} تراکنش')
+        print(f"{'operation':<22}" + ''.join(f'{engine.name:>12}' for engine in engines))
+        for name in operations(engines[0]):
+            timings = []
+            results = []
+            for engine in engines:
+                elapsed, result = timed(operations(engine)[name], args.repeat)
+                timings.append(elapsed)
+                results.append(result)
+            mismatch = '' if all(same(results[0], r) for r in results[1:]) else '  MISMATCH'
+            print(f'{name:<22}' + ''.join(f'{t * 1000:>10.1f}ms' for t in timings) + mismatch)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# سرعت ورود کاربران با پارامترهای مختلف KDF و با/بدون کش نشست
+# اجرا: python benchmarks/bench_login.py [--users 200] [--algorithm scrypt] [--n 16384] [--iterations 200000]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credentials import HAS_SCRYPT, PasswordHasher  # noqa: E402
+from managers import UserManager  # noqa: E402
+from persistence import WRITER  # noqa: E402
+
+
+def rate(count, elapsed):
+    return f'{count / elapsed:>10.1f} عملیات/ثانیه  ({elapsed * 1000 / count:.2f}ms)'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--algorithm', choices=['scrypt', 'pbkdf2_sha256'],
+                        default='scrypt' if HAS_SCRYPT else 'pbkdf2_sha256')
+    parser.add_argument('--n', type=int, default=PasswordHasher.SCRYPT_N)
+    parser.add_argument('--r', type=int, default=PasswordHasher.SCRYPT_R)
+    parser.add_argument('--p', type=int, default=PasswordHasher.SCRYPT_P)
+    parser.add_argument('--iterations', type=int, default=PasswordHasher.PBKDF2_ITERATIONS)
+    args = parser.parse_args()
+
+    hasher = PasswordHasher(args.algorithm, args.n, args.r, args.p, args.iterations)
+    print(f'{args.algorithm} {hasher.params()}، {args.users} کاربر')
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        users = UserManager(hasher)
+        started = time.perf_counter()
+        for i in range(args.users):
+            users.register_user(f'user{i}', f'password{i}', f'user{i}@example.com')
+        print(f"{'register':<16}" + rate(args.users, time.perf_counter() - started))
+
+        for label in ('login (KDF)', 'login (cached)'):
+            started = time.perf_counter()
+            for i in range(args.users):
+                success, _ = users.login_user(f'user{i}', f'password{i}')
+                assert success
+            print(f'{label:<16}' + rate(args.users, time.perf_counter() - started))
+
+        tokens = []
+        for i in range(args.users):
+            users.login_user(f'user{i}', f'password{i}')
+            tokens.append(users.session_token)
+        started = time.perf_counter()
+        for token in tokens:
+            assert users.resume_session(token)
+        print(f"{'resume session':<16}" + rate(args.users, time.perf_counter() - started))
+        WRITER.flush()
+        os.chdir(os.path.dirname(workdir))
+
+
+if __name__ == '__main__':
+    main()
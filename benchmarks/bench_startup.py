@@ -0,0 +1,82 @@
+# زمان شروع برنامه: import سرد ماژول‌ها، ساخت مدیرها و خواندن داده‌های مالی
+# اجرا: python benchmarks/bench_startup.py [--transactions 100000] [--repeat 5]
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from managers import FinancialManager  # noqa: E402
+from persistence import WRITER  # noqa: E402
+from storage import STORAGE_BACKENDS  # noqa: E402
+
+HAS_KIVY = importlib.util.find_spec('kivy') is not None
+
+SCREEN_MODULES = ['screens.login', 'screens.dashboard', 'screens.transactions', 'screens.notifications',
+                  'screens.profile', 'screens.report', 'screens.history']
+
+
+# هر اندازه‌گیری در یک فرایند تازه اجرا می‌شود تا import ها سرد باشند
+def cold(code, cwd, repeat):
+    script = f'import sys, time\nsys.path.insert(0, {ROOT!r})\nstarted = time.perf_counter()\n{code}\nprint(time.perf_counter() - started)'
+    best = None
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', script], cwd=cwd, capture_output=True, text=True, check=True)
+        elapsed = float(output.stdout.split()[-1])
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def make_account(mode, count):
+    fm = FinancialManager('bench', mode)
+    transactions = []
+    for i in range(count):
+        if i % 5 == 0:
+            transactions.append(FinancialManager.income_transaction(1000000, '', 'حقوق'))
+        else:
+            transactions.append(FinancialManager.expense_transaction(1000 * (i % 97 + 1), '', fm.categories[i % len(fm.categories)]))
+    fm.add_transactions(transactions)
+    fm.close()
+    WRITER.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--transactions', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        rows = [
+            ('import managers', 'import managers'),
+            ('UserManager()', 'from managers import UserManager\nUserManager()'),
+            ('NotificationManager()', 'from managers import NotificationManager\nNotificationManager()'),
+        ]
+        if HAS_KIVY:
+            rows.append(('import main (lazy)', 'import main'))
+            rows.append(('import main + screens', 'import main\n' + '\n'.join(f'import {m}' for m in SCREEN_MODULES)))
+        else:
+            print('Kivy نصب نیست؛ زمان import صفحه‌ها اندازه‌گیری نمی‌شود')
+
+        print(f"{'operation':<28}{'time':>12}")
+        for label, code in rows:
+            print(f'{label:<28}{cold(code, workdir, args.repeat) * 1000:>10.1f}ms')
+
+        print(f'\nخواندن حساب با {args.transactions:,} تراکنش')
+        for mode in STORAGE_BACKENDS:
+            mode_dir = os.path.join(workdir, mode)
+            os.mkdir(mode_dir)
+            os.chdir(mode_dir)
+            make_account(mode, args.transactions)
+            code = f"from managers import FinancialManager\nFinancialManager('bench', {mode!r})"
+            print(f'{"FinancialManager " + mode:<28}{cold(code, mode_dir, args.repeat) * 1000:>10.1f}ms')
+        os.chdir(os.path.dirname(workdir))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+from storage import to_timestamp, transaction_timestamp
+
+BUDGET_PERIODS = ('month', 'week')
+
+
+def period_start(period, now=None):
+    day = (now or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == 'week':
+        return to_timestamp(day - timedelta(days=day.weekday()))
+    return to_timestamp(day.replace(day=1))
+
+
+def alert_message(alert):
+    if alert['threshold'] >= 1:
+        return f"هشدار: بودجه {alert['category']} تمام شده است!"
+    return f"هشدار: بودجه {alert['category']} در حال اتمام است!"
+
+
+# هشدار بودجه هنگام ثبت هزینه: فقط شمارنده دسته همان تراکنش در دوره جاری
+# (ماه یا هفته) به‌روز می‌شود و عبور از هر آستانه در هر دوره یک بار گزارش می‌شود
+class BudgetAlertEngine:
+    THRESHOLDS = (0.9, 1.0)
+
+    def __init__(self, budget, periods, thresholds=THRESHOLDS):
+        self.budget = budget
+        self.periods = periods
+        self.thresholds = sorted(thresholds)
+        # category -> (شروع دوره, جمع هزینه در دوره)
+        self.spent = {}
+        # (category, شروع دوره, threshold)
+        self.emitted = set()
+
+    def period(self, category):
+        return self.periods.get(category, 'month')
+
+    # totals_since(start) جمع هزینه هر دسته از start را برمی‌گرداند
+    def load(self, totals_since, emitted=(), now=None):
+        starts = {category: period_start(self.period(category), now) for category in self.budget}
+        totals = {start: totals_since(start) for start in set(starts.values())}
+        self.spent = {category: (start, totals[start].get(category, 0)) for category, start in starts.items()}
+        self.emitted = {tuple(key) for key in emitted if key[0] in starts and key[1] == starts[key[0]]}
+
+    def record(self, transaction, now=None):
+        category = transaction['category']
+        start = period_start(self.period(category), now)
+        if transaction_timestamp(transaction) < start:
+            return []
+        period, amount = self.spent.get(category, (start, 0))
+        if period != start:
+            amount = 0
+        amount += transaction['amount']
+        self.spent[category] = (start, amount)
+        return self.crossings(category, start, amount)
+
+    # فقط بالاترین آستانه تازه عبورشده گزارش می‌شود و پایین‌ترها هم ثبت می‌شوند
+    def crossings(self, category, start, amount):
+        budget = self.budget.get(category, 0)
+        crossed = [t for t in self.thresholds if budget > 0 and amount >= budget * t]
+        new = [t for t in crossed if (category, start, t) not in self.emitted]
+        if not new:
+            return []
+        for threshold in crossed:
+            self.emitted.add((category, start, threshold))
+        return [self.alert(category, new[-1], amount)]
+
+    def alert(self, category, threshold, amount):
+        return {
+            'category': category,
+            'threshold': threshold,
+            'spent': amount,
+            'budget': self.budget[category],
+            'period': self.period(category),
+        }
+
+    # وضعیت فعلی همه دسته‌ها بدون پیمایش تراکنش‌ها
+    def status(self, now=None):
+        alerts = []
+        for category, budget in self.budget.items():
+            start = period_start(self.period(category), now)
+            period, amount = self.spent.get(category, (start, 0))
+            if budget <= 0 or period != start:
+                continue
+            crossed = [t for t in self.thresholds if amount >= budget * t]
+            if crossed:
+                alerts.append(self.alert(category, crossed[-1], amount))
+        return alerts
+
+    def get_state(self):
+        return sorted(list(key) for key in self.emitted)
@@ -4,8 +4,9 @@ package.name = hooshmali
 package.domain = com.hooshmali.app
 source.dir = .
 source.include_exts = py,png,jpg,kv,atlas,ttf,json
+source.exclude_dirs = benchmarks
 version = 1.0
-requirements = python3,kivy
+requirements = python3,kivy,sqlite3
 orientation = portrait
 
 [buildozer]
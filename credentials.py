@@ -0,0 +1,121 @@
+from collections import OrderedDict
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+
+HAS_SCRYPT = hasattr(hashlib, 'scrypt')
+
+
+# رمزها به صورت «الگوریتم$پارامترها$salt$hash» ذخیره می‌شوند؛ رکوردهای قدیمی
+# MD5 (۳۲ رقم hex بدون salt) هنوز پذیرفته می‌شوند ولی needs_rehash برای آن‌ها True است
+class PasswordHasher:
+    SCRYPT_N = 2 ** 14
+    SCRYPT_R = 8
+    SCRYPT_P = 1
+    PBKDF2_ITERATIONS = 200000
+    SALT_BYTES = 16
+
+    def __init__(self, algorithm=None, n=None, r=None, p=None, iterations=None):
+        self.algorithm = algorithm or ('scrypt' if HAS_SCRYPT else 'pbkdf2_sha256')
+        self.n = n or self.SCRYPT_N
+        self.r = r or self.SCRYPT_R
+        self.p = p or self.SCRYPT_P
+        self.iterations = iterations or self.PBKDF2_ITERATIONS
+
+    def params(self):
+        if self.algorithm == 'scrypt':
+            return [self.n, self.r, self.p]
+        return [self.iterations]
+
+    def derive(self, algorithm, params, password, salt):
+        if algorithm == 'scrypt':
+            n, r, p = params
+            return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                                  maxmem=256 * n * r + 1024 * 1024)
+        if algorithm == 'pbkdf2_sha256':
+            return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, params[0])
+        raise ValueError(f'unknown password algorithm: {algorithm}')
+
+    def hash(self, password):
+        salt = secrets.token_bytes(self.SALT_BYTES)
+        params = self.params()
+        digest = self.derive(self.algorithm, params, password, salt)
+        return '$'.join([self.algorithm, *map(str, params), salt.hex(), digest.hex()])
+
+    @staticmethod
+    def parse(encoded):
+        parts = encoded.split('$')
+        return parts[0], [int(value) for value in parts[1:-2]], bytes.fromhex(parts[-2]), bytes.fromhex(parts[-1])
+
+    def verify(self, password, encoded):
+        if '$' not in encoded:
+            return hmac.compare_digest(encoded, hashlib.md5(password.encode()).hexdigest())
+        algorithm, params, salt, digest = self.parse(encoded)
+        return hmac.compare_digest(digest, self.derive(algorithm, params, password, salt))
+
+    def needs_rehash(self, encoded):
+        if '$' not in encoded:
+            return True
+        algorithm, params, _, _ = self.parse(encoded)
+        return algorithm != self.algorithm or params != self.params()
+
+
+# ورودهای تکراری با همان رمز، به جای KDF با یک HMAC سریع (با کلید تصادفی همین
+# فرایند) بررسی می‌شوند؛ توکن نشست هم برای ادامه ورود بدون رمز صادر می‌شود.
+# ورودهای هم‌زمان از executor به این کش می‌رسند، پس همه دسترسی‌ها پشت یک قفل‌اند
+class SessionCache:
+    TTL = 3600
+    MAX_ENTRIES = 10000
+
+    def __init__(self, ttl=None, max_entries=None):
+        self.ttl = ttl or self.TTL
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self.key = secrets.token_bytes(32)
+        self.lock = threading.Lock()
+        self.verified = OrderedDict()
+        self.tokens = OrderedDict()
+
+    def digest(self, username, password):
+        return hmac.new(self.key, f'{username}\0{password}'.encode(), hashlib.sha256).digest()
+
+    def remember(self, username, password):
+        expires = time.monotonic() + self.ttl
+        digest = self.digest(username, password)
+        token = secrets.token_urlsafe(32)
+        with self.lock:
+            self.store(self.verified, username, (digest, expires))
+            self.store(self.tokens, token, (username, expires))
+        return token
+
+    def store(self, entries, key, value):
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def check(self, username, password):
+        with self.lock:
+            entry = self.verified.get(username)
+        if entry is None or entry[1] < time.monotonic():
+            return False
+        return hmac.compare_digest(entry[0], self.digest(username, password))
+
+    def resume(self, token):
+        with self.lock:
+            entry = self.tokens.get(token)
+            if entry is None or entry[1] < time.monotonic():
+                self.tokens.pop(token, None)
+                return None
+            return entry[0]
+
+    def revoke(self, token):
+        with self.lock:
+            self.tokens.pop(token, None)
+
+    def forget(self, username):
+        with self.lock:
+            self.verified.pop(username, None)
+            for token in [token for token, (name, _) in self.tokens.items() if name == username]:
+                del self.tokens[token]
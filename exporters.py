@@ -0,0 +1,149 @@
+from array import array
+import csv
+import json
+import os
+import struct
+import sys
+
+from storage import TRANSACTION_COLUMNS, TRANSACTION_TYPES, TYPE_CODES, format_timestamp, transaction_timestamp
+
+CSV_FIELDS = ('date', 'type', 'amount', 'category', 'source', 'description')
+
+# قالب ستونی: MAGIC و سپس گروه‌های سطر؛ هر گروه با تعداد سطر و جدول رشته‌های
+# خودش شروع می‌شود تا حافظه مصرفی به اندازه فایل بستگی نداشته باشد.
+# گروه با تعداد صفر پایان فایل است. همه اعداد little-endian هستند
+COLUMNAR_MAGIC = b'HMCOL1\n'
+COLUMNAR_GROUP_SIZE = 4096
+COLUMNAR_COLUMNS = (
+    ('amount', 'd'),
+    ('ts', 'q'),
+    ('type', 'b'),
+    ('category', 'i'),
+    ('source', 'i'),
+    ('description', 'i'),
+)
+
+
+# فایل موقت + rename تا خروجی نیمه‌کاره جای فایل قبلی را نگیرد
+def open_atomic(path, mode, **kwargs):
+    return open(f'{path}.tmp', mode, **kwargs)
+
+
+def finish_atomic(path):
+    os.replace(f'{path}.tmp', path)
+
+
+def write_csv(path, transactions):
+    count = 0
+    with open_atomic(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        for transaction in transactions:
+            writer.writerow([transaction.get(field) or '' for field in CSV_FIELDS])
+            count += 1
+    finish_atomic(path)
+    return count
+
+
+def write_jsonl(path, transactions):
+    count = 0
+    with open_atomic(path, 'w', encoding='utf-8') as f:
+        for transaction in transactions:
+            record = {key: transaction.get(key) for key in TRANSACTION_COLUMNS if transaction.get(key) is not None}
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+    finish_atomic(path)
+    return count
+
+
+def to_little_endian(values):
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_group(f, rows):
+    strings = {}
+    columns = {name: array(code) for name, code in COLUMNAR_COLUMNS}
+    for transaction in rows:
+        columns['amount'].append(transaction['amount'])
+        columns['ts'].append(transaction_timestamp(transaction))
+        columns['type'].append(TYPE_CODES[transaction['type']])
+        for name in ('category', 'source', 'description'):
+            value = transaction.get(name)
+            columns[name].append(-1 if value is None else strings.setdefault(value, len(strings)))
+    table = json.dumps(list(strings), ensure_ascii=False).encode('utf-8')
+    f.write(struct.pack('<II', len(rows), len(table)))
+    f.write(table)
+    for name, _ in COLUMNAR_COLUMNS:
+        f.write(to_little_endian(columns[name]))
+
+
+def write_columnar(path, transactions, group_size=COLUMNAR_GROUP_SIZE):
+    count = 0
+    with open_atomic(path, 'wb') as f:
+        f.write(COLUMNAR_MAGIC)
+        rows = []
+        for transaction in transactions:
+            rows.append(transaction)
+            if len(rows) >= group_size:
+                write_group(f, rows)
+                count += len(rows)
+                rows = []
+        if rows:
+            write_group(f, rows)
+            count += len(rows)
+        f.write(struct.pack('<II', 0, 0))
+    finish_atomic(path)
+    return count
+
+
+def read_exact(f, size):
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError('truncated columnar file')
+    return data
+
+
+# خواندن گروه به گروه فایل ستونی؛ خروجی همان dict تراکنش‌های برنامه است
+def read_columnar(path):
+    with open(path, 'rb') as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError('not a columnar export file')
+        while True:
+            count, table_size = struct.unpack('<II', read_exact(f, 8))
+            if count == 0:
+                return
+            strings = json.loads(read_exact(f, table_size).decode('utf-8'))
+            columns = {}
+            for name, code in COLUMNAR_COLUMNS:
+                values = array(code)
+                values.frombytes(read_exact(f, values.itemsize * count))
+                if sys.byteorder == 'big':
+                    values.byteswap()
+                columns[name] = values
+            for i in range(count):
+                transaction = {
+                    'type': TRANSACTION_TYPES[columns['type'][i]],
+                    'amount': columns['amount'][i],
+                    'date': format_timestamp(columns['ts'][i]),
+                    'ts': columns['ts'][i],
+                }
+                for name in ('category', 'source', 'description'):
+                    if columns[name][i] >= 0:
+                        transaction[name] = strings[columns[name][i]]
+                yield transaction
+
+
+WRITERS = {
+    'csv': write_csv,
+    'jsonl': write_jsonl,
+    'hmc': write_columnar,
+}
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension not in WRITERS:
+        raise ValueError(f'unsupported export format: {extension}')
+    return extension
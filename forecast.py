@@ -0,0 +1,148 @@
+from calendar import monthrange
+from collections import deque
+from datetime import datetime
+
+from storage import format_timestamp, to_timestamp, transaction_timestamp
+
+DAY = 86400
+
+
+# پیش‌بینی هزینه‌ها: برای هر دسته (و درآمد) جمع لغزان روزانه در window_days روز
+# اخیر، نرخ مصرف با میانگین نمایی (نیمه‌عمر تقریبی span_days روز) و جمع ماه جاری
+# نگه داشته می‌شود. هر تراکنش فقط وضعیت دسته خودش را به‌روز می‌کند و forecast
+# با O(تعداد دسته‌ها) حساب می‌شود
+class CategoryTrend:
+    def __init__(self):
+        # [روز, جمع روز] به ترتیب روز، فقط در پنجره
+        self.days = deque()
+        self.window_total = 0
+        # نرخ روزانه تا پایان روز day (بدون خود روز) و جمع روز day
+        self.rate = 0.0
+        self.day = None
+        self.today = 0
+        self.month = None
+        self.month_total = 0
+
+
+class ForecastEngine:
+    WINDOW_DAYS = 30
+    SPAN_DAYS = 14
+    # برای ساختن وضعیت اولیه فقط همین تعداد روز اخیر خوانده می‌شود
+    HISTORY_DAYS = 90
+
+    def __init__(self, window_days=None, span_days=None):
+        self.window_days = window_days or self.WINDOW_DAYS
+        self.alpha = 2 / ((span_days or self.SPAN_DAYS) + 1)
+        self.trends = {}
+        self.income = CategoryTrend()
+
+    @classmethod
+    def history_start(cls, now=None):
+        return to_timestamp(now or datetime.now()) - cls.HISTORY_DAYS * DAY
+
+    @classmethod
+    def build(cls, transactions):
+        engine = cls()
+        for transaction in transactions:
+            engine.add(transaction)
+        return engine
+
+    def trend(self, transaction):
+        if transaction['type'] == 'income':
+            return self.income
+        category = transaction.get('category')
+        if category not in self.trends:
+            self.trends[category] = CategoryTrend()
+        return self.trends[category]
+
+    def add(self, transaction):
+        ts = transaction_timestamp(transaction)
+        amount = transaction['amount']
+        trend = self.trend(transaction)
+        day = ts // DAY
+
+        self.advance(trend, day)
+        if day == trend.day:
+            trend.today += amount
+        else:
+            # تراکنش با تاریخ گذشته: سهمش با همان ضریب کاهشی که تا امروز داشت
+            trend.rate += self.alpha * amount * (1 - self.alpha) ** (trend.day - day - 1)
+
+        if trend.days and trend.days[-1][0] == day:
+            trend.days[-1][1] += amount
+            trend.window_total += amount
+        elif day > trend.day - self.window_days:
+            position = len(trend.days)
+            while position and trend.days[position - 1][0] > day:
+                position -= 1
+            if position and trend.days[position - 1][0] == day:
+                trend.days[position - 1][1] += amount
+            else:
+                trend.days.insert(position, [day, amount])
+            trend.window_total += amount
+
+        month = format_timestamp(ts)[:7]
+        if trend.month is None or month > trend.month:
+            trend.month = month
+            trend.month_total = 0
+        if month == trend.month:
+            trend.month_total += amount
+
+    # بستن روزهای تمام‌شده تا روز day
+    def advance(self, trend, day):
+        if trend.day is None:
+            trend.day = day
+            return
+        if day <= trend.day:
+            return
+        decay = 1 - self.alpha
+        trend.rate = (self.alpha * trend.today + decay * trend.rate) * decay ** (day - trend.day - 1)
+        trend.day = day
+        trend.today = 0
+        while trend.days and trend.days[0][0] <= day - self.window_days:
+            trend.window_total -= trend.days.popleft()[1]
+
+    def daily_rate(self, trend, day):
+        self.advance(trend, day)
+        # روز جاری هنوز تمام نشده؛ با همان وزن یک روز کامل حساب می‌شود
+        return self.alpha * trend.today + (1 - self.alpha) * trend.rate
+
+    def month_total(self, trend, month):
+        return trend.month_total if trend.month == month else 0
+
+    def forecast(self, balance, budget, now=None):
+        now = now or datetime.now()
+        day = to_timestamp(now) // DAY
+        month = now.strftime('%Y-%m')
+        days_left = monthrange(now.year, now.month)[1] - now.day
+
+        categories = {}
+        burn_rate = 0
+        for category, trend in self.trends.items():
+            rate = self.daily_rate(trend, day)
+            spent = self.month_total(trend, month)
+            categories[category] = {
+                'average': trend.window_total / self.window_days,
+                'burn_rate': rate,
+                'month_spent': spent,
+                'projected': spent + rate * days_left,
+                'budget': budget.get(category, 0),
+            }
+            burn_rate += rate
+        self.daily_rate(self.income, day)
+        income_rate = self.income.window_total / self.window_days
+
+        overruns = []
+        for category, item in categories.items():
+            if item['budget'] > 0 and item['projected'] > item['budget'] > item['month_spent']:
+                days_to_limit = (item['budget'] - item['month_spent']) / item['burn_rate']
+                overruns.append(dict(item, category=category, day=now.day + int(days_to_limit) + 1))
+        return {
+            'month': month,
+            'days_left': days_left,
+            'income_rate': income_rate,
+            'burn_rate': burn_rate,
+            'projected_balance': balance + (income_rate - burn_rate) * days_left,
+            'categories': categories,
+            'overruns': overruns,
+        }
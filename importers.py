@@ -0,0 +1,237 @@
+from collections import Counter
+from datetime import datetime, timedelta
+import csv
+import os
+import re
+
+from storage import to_timestamp
+
+PERSIAN_DIGITS = str.maketrans('۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩٬', '01234567890123456789,')
+
+CSV_DATE_FORMATS = ('%Y/%m/%d %H:%M:%S', '%Y/%m/%d', '%d/%m/%Y', '%d.%m.%Y')
+
+YEAR_FIRST_DATE = re.compile(r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})(?:[ T](\d{1,2}):(\d{2})(?::(\d{2}))?)?')
+
+# سال‌های کوچک‌تر از این مقدار شمسی در نظر گرفته می‌شوند (مثل 1403/05/10)
+JALALI_YEAR_LIMIT = 1700
+
+# نام ستون‌های رایج در خروجی CSV بانک‌ها
+CSV_COLUMNS = {
+    'date': ('date', 'تاریخ', 'transaction date', 'posted date', 'booking date'),
+    'amount': ('amount', 'مبلغ', 'value'),
+    'debit': ('debit', 'برداشت', 'withdrawal'),
+    'credit': ('credit', 'واریز', 'deposit'),
+    'description': ('description', 'شرح', 'توضیحات', 'memo', 'payee', 'name', 'details'),
+}
+
+# کلمات کلیدی برای دسته‌بندی خودکار هزینه‌ها؛ کلید، بخشی از نام دسته است
+CATEGORY_KEYWORDS = {
+    'خوراک': ('رستوران', 'فست', 'سوپرمارکت', 'نان', 'کافه', 'food', 'restaurant', 'cafe', 'market', 'grocery'),
+    'حمل‌ونقل': ('تاکسی', 'اسنپ', 'مترو', 'بنزین', 'سوخت', 'taxi', 'snapp', 'uber', 'metro', 'fuel', 'gas'),
+    'مسکن': ('اجاره', 'قبض', 'آب', 'برق', 'گاز', 'rent', 'electric', 'water', 'utility'),
+    'تفریح': ('سینما', 'بازی', 'کتاب', 'cinema', 'game', 'netflix', 'spotify'),
+    'سلامت': ('داروخانه', 'دکتر', 'بیمارستان', 'pharmacy', 'doctor', 'hospital', 'clinic'),
+}
+
+
+def parse_amount(text):
+    text = str(text).translate(PERSIAN_DIGITS).replace(',', '').replace(' ', '').strip()
+    if not text:
+        return None
+    if text.startswith('(') and text.endswith(')'):
+        text = '-' + text[1:-1]
+    return float(text)
+
+
+# تبدیل تاریخ شمسی به میلادی (الگوریتم jdf)
+def jalali_to_gregorian(year, month, day):
+    year += 1595
+    days = -355668 + 365 * year + (year // 33) * 8 + ((year % 33) + 3) // 4 + day
+    days += (month - 1) * 31 if month < 7 else (month - 7) * 30 + 186
+    gregorian_year = 400 * (days // 146097)
+    days %= 146097
+    if days > 36524:
+        days -= 1
+        gregorian_year += 100 * (days // 36524)
+        days %= 36524
+        if days >= 365:
+            days += 1
+    gregorian_year += 4 * (days // 1461)
+    days %= 1461
+    if days > 365:
+        gregorian_year += (days - 1) // 365
+        days = (days - 1) % 365
+    return (datetime(gregorian_year, 1, 1) + timedelta(days=days)).date()
+
+
+def parse_jalali_date(match):
+    year, month, day, hour, minute, second = (int(value or 0) for value in match.groups())
+    if not 1 <= month <= 12 or not 1 <= day <= (31 if month <= 6 else 30):
+        return None
+    date = jalali_to_gregorian(year, month, day)
+    try:
+        return datetime(date.year, date.month, date.day, hour, minute, second)
+    except ValueError:
+        return None
+
+
+def parse_date(text):
+    text = str(text).translate(PERSIAN_DIGITS).strip()
+    match = YEAR_FIRST_DATE.fullmatch(text)
+    if match and int(match.group(1)) < JALALI_YEAR_LIMIT:
+        return parse_jalali_date(match)
+    try:
+        # مسیر سریع برای قالب رایج YYYY-MM-DD[ HH:MM:SS]
+        return datetime.fromisoformat(text).replace(tzinfo=None)
+    except ValueError:
+        pass
+    for date_format in CSV_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def find_column(fieldnames, key):
+    names = {name.strip().lower(): name for name in fieldnames if name}
+    for candidate in CSV_COLUMNS[key]:
+        if candidate in names:
+            return names[candidate]
+    return None
+
+
+# خواندن سطر به سطر CSV؛ خروجی: (date, amount علامت‌دار, description)
+def read_csv(path):
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames or []
+        columns = {key: find_column(fieldnames, key) for key in CSV_COLUMNS}
+        for row in reader:
+            try:
+                if columns['amount']:
+                    amount = parse_amount(row[columns['amount']])
+                else:
+                    credit = parse_amount(row.get(columns['credit']) or '') if columns['credit'] else None
+                    debit = parse_amount(row.get(columns['debit']) or '') if columns['debit'] else None
+                    amount = (credit or 0) - abs(debit or 0)
+            except ValueError:
+                amount = None
+            date = parse_date(row.get(columns['date'], '')) if columns['date'] else None
+            description = (row.get(columns['description']) or '').strip() if columns['description'] else ''
+            yield date, amount, description
+
+
+OFX_TRANSACTION = re.compile(r'<STMTTRN>(.*?)</STMTTRN>', re.S | re.I)
+OFX_TAG = re.compile(r'<(\w+)>([^<\r\n]*)')
+
+
+def parse_ofx_date(text):
+    digits = re.match(r'\d+', text.strip())
+    if not digits or len(digits.group()) < 8:
+        return None
+    value = digits.group()[:14].ljust(14, '0')
+    try:
+        return datetime.strptime(value, '%Y%m%d%H%M%S')
+    except ValueError:
+        return None
+
+
+# خواندن جریانی OFX (هم SGML و هم XML): فقط بلوک‌های STMTTRN در حافظه نگه داشته می‌شوند
+def read_ofx(path, chunk_size=65536):
+    buffer = ''
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            buffer += chunk
+            end = 0
+            for match in OFX_TRANSACTION.finditer(buffer):
+                fields = {tag.upper(): value.strip() for tag, value in OFX_TAG.findall(match.group(1))}
+                try:
+                    amount = parse_amount(fields.get('TRNAMT', ''))
+                except ValueError:
+                    amount = None
+                description = fields.get('NAME') or fields.get('MEMO') or fields.get('PAYEE') or ''
+                if fields.get('MEMO') and fields.get('NAME') and fields['MEMO'] != fields['NAME']:
+                    description = f"{fields['NAME']} - {fields['MEMO']}"
+                yield parse_ofx_date(fields.get('DTPOSTED', '')), amount, description
+                end = match.end()
+            buffer = buffer[end:]
+            if not chunk:
+                break
+            # نگه داشتن فقط بخش ناتمام آخرین تراکنش
+            start = buffer.upper().rfind('<STMTTRN>')
+            buffer = buffer[start:] if start >= 0 else buffer[-16:]
+
+
+def categorize(description, categories):
+    text = description.lower()
+    for keyword_category, keywords in CATEGORY_KEYWORDS.items():
+        if any(keyword in text for keyword in keywords):
+            for category in categories:
+                if keyword_category in category:
+                    return category
+    return categories[-1]
+
+
+def normalize(records, categories, stats):
+    for date, amount, description in records:
+        if date is None or not amount:
+            stats['skipped'] += 1
+            continue
+        transaction = {
+            'type': 'income' if amount > 0 else 'expense',
+            'amount': abs(amount),
+            'description': description or 'تراکنش بانکی',
+            'date': date.strftime("%Y-%m-%d %H:%M:%S"),
+            'ts': to_timestamp(date.replace(microsecond=0)),
+        }
+        if amount > 0:
+            transaction['source'] = description or 'بانک'
+        else:
+            transaction['category'] = categorize(description, categories)
+        yield transaction
+
+
+def transaction_key(transaction):
+    return (transaction['date'], transaction['type'], round(transaction['amount'], 2),
+            transaction.get('description', ''))
+
+
+# حذف تکراری‌ها به صورت چندمجموعه‌ای: دو خرید یکسان در یک روز هر دو وارد می‌شوند
+# مگر اینکه در تاریخچه هم دو بار ثبت شده باشند
+def deduplicate(transactions, existing, stats, occurrences=None):
+    occurrences = Counter() if occurrences is None else occurrences
+    for transaction in transactions:
+        key = transaction_key(transaction)
+        if key in existing:
+            occurrences[key] += 1
+            if occurrences[key] <= existing[key]:
+                stats['duplicates'] += 1
+                continue
+        yield transaction
+
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+READERS = {
+    'csv': read_csv,
+    'ofx': read_ofx,
+    'qfx': read_ofx,
+}
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension not in READERS:
+        raise ValueError(f'unsupported statement format: {extension}')
+    return extension
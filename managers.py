@@ -0,0 +1,574 @@
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from itertools import islice
+import json
+import hashlib
+
+from analytics import HAS_NUMPY, create_analytics
+from budget import BudgetAlertEngine, alert_message
+from credentials import PasswordHasher, SessionCache
+import exporters
+from forecast import ForecastEngine
+import importers
+from observable import Observable, ObservableProperty
+from persistence import WRITER, write_json_atomic
+from reports import ReportCache
+from rollups import compare_periods, month_periods, year_periods
+from storage import STORAGE_BACKENDS, HistoryFeed, UserDirectory, to_timestamp
+
+# محل ذخیره داده‌های مالی: 'sqlite'، 'mmap'، 'journal' یا 'json'
+STORAGE_MODE = 'sqlite'
+
+class NotificationManager(Observable):
+    unread_count = ObservableProperty(0)
+    
+    # سقف تعداد و عمر اعلان‌ها؛ قدیمی‌ترها هنگام افزودن حذف می‌شوند
+    MAX_NOTIFICATIONS = 200
+    RETENTION_DAYS = 30
+    
+    def __init__(self, max_notifications=None, retention_days=None):
+        self.max_notifications = max_notifications or self.MAX_NOTIFICATIONS
+        self.retention_days = retention_days or self.RETENTION_DAYS
+        # صف به ترتیب زمان (قدیمی در چپ)، فهرست id و مجموعه خوانده‌نشده‌ها
+        self.notifications = deque()
+        self.by_id = {}
+        self.unread_ids = set()
+        self.next_id = 1
+        self.load_notifications()
+    
+    def add_notification(self, title, message, notification_type="info"):
+        notification = {
+            'id': self.next_id,
+            'title': title,
+            'message': message,
+            'type': notification_type,
+            'time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'read': False
+        }
+        self.index_notification(notification)
+        self.evict()
+        self.unread_count = len(self.unread_ids)
+        self.save_notifications()
+    
+    def index_notification(self, notification):
+        self.notifications.append(notification)
+        self.by_id[notification['id']] = notification
+        if not notification['read']:
+            self.unread_ids.add(notification['id'])
+        self.next_id = max(self.next_id, notification['id'] + 1)
+    
+    def evict(self):
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime("%Y-%m-%d %H:%M:%S")
+        notifications = self.notifications
+        while notifications and (len(notifications) > self.max_notifications or notifications[0]['time'] < cutoff):
+            notification = notifications.popleft()
+            del self.by_id[notification['id']]
+            self.unread_ids.discard(notification['id'])
+    
+    def get_unread_count(self):
+        return len(self.unread_ids)
+    
+    def mark_as_read(self, notification_id):
+        notification = self.by_id.get(notification_id)
+        if notification is None or notification['read']:
+            return
+        notification['read'] = True
+        self.unread_ids.discard(notification_id)
+        self.unread_count = len(self.unread_ids)
+        self.save_notifications()
+    
+    def mark_all_as_read(self):
+        if not self.unread_ids:
+            return
+        for notification_id in self.unread_ids:
+            self.by_id[notification_id]['read'] = True
+        self.unread_ids.clear()
+        self.unread_count = 0
+        self.save_notifications()
+    
+    def get_recent_notifications(self, count=5):
+        return list(islice(reversed(self.notifications), count))
+    
+    def save_notifications(self):
+        # کپی در همین لحظه؛ صف نباید هنگام نوشتن در thread پس‌زمینه پیمایش شود
+        notifications = list(self.notifications)
+        WRITER.schedule('notifications.json',
+                        lambda: write_json_atomic('notifications.json', notifications))
+    
+    def load_notifications(self):
+        try:
+            with open('notifications.json', 'r', encoding='utf-8') as f:
+                notifications = json.load(f)
+        except FileNotFoundError:
+            notifications = []
+        
+        for notification in sorted(notifications, key=lambda x: x['time']):
+            # فایل‌های قدیمی ممکن است id تکراری داشته باشند
+            if notification['id'] in self.by_id:
+                notification['id'] = self.next_id
+            self.index_notification(notification)
+        self.evict()
+        self.unread_count = len(self.unread_ids)
+
+class UserManager:
+    # به‌روزرسانی last_login فوری نوشته نمی‌شود و با نوشتن‌های بعدی یکی می‌شود
+    LAST_LOGIN_DELAY = 60
+    
+    def __init__(self, hasher=None, directory=None):
+        self.current_user = None
+        self.session_token = None
+        self.hasher = hasher or PasswordHasher()
+        self.sessions = SessionCache()
+        # کاربران هنگام جستجو از فهرست خوانده می‌شوند، نه یک‌جا در شروع برنامه
+        self.directory = directory or UserDirectory()
+    
+    def get_user(self, username):
+        return self.directory.get(username)
+    
+    def register_user(self, username, password, email):
+        if self.get_user(username) is not None:
+            return False, "این نام کاربری قبلا ثبت شده است"
+        
+        user_id = hashlib.md5(f"{username}{datetime.now()}".encode()).hexdigest()[:8]
+        user_data = {
+            'user_id': user_id,
+            'username': username,
+            'password': self.hasher.hash(password),
+            'email': email,
+            'created_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'last_login': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        
+        if not self.directory.add(user_data):
+            return False, "این نام کاربری قبلا ثبت شده است"
+        return True, "ثبت‌نام با موفقیت انجام شد"
+    
+    def login_user(self, username, password):
+        success, message, token = self.open_session(username, password)
+        if success:
+            self.current_user = username
+            self.session_token = token
+        return success, message
+    
+    # ورود بدون تغییر current_user؛ هر فراخواننده توکن نشست خودش را نگه می‌دارد
+    def open_session(self, username, password):
+        user = self.get_user(username)
+        if user is None:
+            return False, "نام کاربری یا رمز عبور اشتباه است", None
+        
+        if self.sessions.check(username, password) or self.verify_password(user, password):
+            token = self.sessions.remember(username, password)
+            self.directory.touch(username, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), self.LAST_LOGIN_DELAY)
+            return True, "ورود موفقیت‌آمیز بود", token
+        
+        return False, "نام کاربری یا رمز عبور اشتباه است", None
+    
+    # رمزهای قدیمی (MD5) یا با پارامترهای قدیمی، پس از ورود موفق دوباره hash می‌شوند
+    def verify_password(self, user, password):
+        if not self.hasher.verify(password, user['password']):
+            return False
+        if self.hasher.needs_rehash(user['password']):
+            user['password'] = self.hasher.hash(password)
+            self.directory.update(user)
+        return True
+    
+    # ورود دوباره با توکن نشست، بدون رمز
+    def resume_session(self, token):
+        username = self.session_user(token)
+        if username is None:
+            return False
+        self.current_user = username
+        self.session_token = token
+        return True
+    
+    def session_user(self, token):
+        username = self.sessions.resume(token)
+        if username is None or self.get_user(username) is None:
+            return None
+        return username
+    
+    def close_session(self, token):
+        self.sessions.revoke(token)
+        return True
+    
+    def logout_user(self):
+        if self.session_token is not None:
+            self.close_session(self.session_token)
+        self.current_user = None
+        self.session_token = None
+        return True
+    
+    def get_current_user_data(self):
+        if self.current_user:
+            return self.get_user(self.current_user)
+        return None
+
+class FinancialManager(Observable):
+    # جمع‌های قابل مشاهده برای اتصال مستقیم ویجت‌ها
+    balance = ObservableProperty(0)
+    total_income = ObservableProperty(0)
+    total_expense = ObservableProperty(0)
+    transaction_count = ObservableProperty(0)
+    
+    def __init__(self, user_id, storage_mode=STORAGE_MODE, columnar=False):
+        self.user_id = user_id
+        # columnar فقط برای حالت‌های json و journal که داده در حافظه است
+        backend = STORAGE_BACKENDS[storage_mode]
+        if columnar and not backend.in_memory:
+            raise ValueError(f'columnar storage is only supported by in-memory backends, not {storage_mode!r}')
+        options = {'columnar': True} if columnar else {}
+        self.storage = backend(user_id, **options)
+        self.categories = ['🍔 خوراک', '🚗 حمل‌ونقل', '🏠 مسکن', '🎮 تفریح', '🏥 سلامت', '📦 دیگر']
+        self.budget = {category: 0 for category in self.categories}
+        self.totals = self.empty_totals()
+        self.analytics = None
+        # با هر تغییر جمع‌ها زیاد می‌شود تا بررسی‌های دوره‌ای بدون تغییر رد شوند
+        self.version = 0
+        # گزارش‌های صفحه گزارش؛ با هر تراکنش جدید وصله می‌شوند
+        self.reports = ReportCache(user_id)
+        # موتور پیش‌بینی در اولین درخواست از روی روزهای اخیر ساخته می‌شود
+        self.forecast = None
+        self.load_data()
+    
+    @property
+    def transactions(self):
+        return self.storage.transactions
+    
+    @staticmethod
+    def empty_totals():
+        return {'count': 0, 'income': 0, 'expense': 0, 'categories': {}}
+    
+    @staticmethod
+    def income_transaction(amount, description, source):
+        now = datetime.now()
+        return {
+            'type': 'income',
+            'amount': amount,
+            'description': description,
+            'source': source,
+            'date': now.strftime("%Y-%m-%d %H:%M:%S"),
+            'ts': to_timestamp(now.replace(microsecond=0))
+        }
+    
+    @staticmethod
+    def expense_transaction(amount, description, category):
+        now = datetime.now()
+        return {
+            'type': 'expense',
+            'amount': amount,
+            'description': description,
+            'category': category,
+            'date': now.strftime("%Y-%m-%d %H:%M:%S"),
+            'ts': to_timestamp(now.replace(microsecond=0))
+        }
+    
+    def add_income(self, amount, description, source):
+        self.add_transaction(self.income_transaction(amount, description, source))
+        return True
+    
+    def add_expense(self, amount, description, category):
+        self.add_transaction(self.expense_transaction(amount, description, category))
+        return True
+    
+    def add_transaction(self, transaction):
+        self.track_transaction(transaction)
+        self.reports.record(transaction)
+        alerts = self.alert_engine.record(transaction) if transaction['type'] == 'expense' else []
+        self.storage.append(transaction, self.get_state())
+        if self.analytics is not None:
+            self.analytics.append(transaction)
+        if self.forecast is not None:
+            self.forecast.add(transaction)
+        self.publish_totals()
+        self.dispatch_alerts(alerts)
+    
+    # چند تراکنش با یک بار نوشتن در storage
+    def add_transactions(self, transactions):
+        alerts = []
+        for transaction in transactions:
+            self.track_transaction(transaction)
+            self.reports.record(transaction)
+            if transaction['type'] == 'expense':
+                alerts.extend(self.alert_engine.record(transaction))
+        self.storage.append_many(transactions, self.get_state())
+        if self.analytics is not None:
+            for transaction in transactions:
+                self.analytics.append(transaction)
+        if self.forecast is not None:
+            for transaction in transactions:
+                self.forecast.add(transaction)
+        self.publish_totals()
+        self.dispatch_alerts(alerts)
+    
+    # رویداد budget_alert برای هر عبور از آستانه بودجه
+    def dispatch_alerts(self, alerts):
+        for alert in alerts:
+            self.dispatch('budget_alert', alert)
+    
+    # ورود دسته‌ای صورتحساب بانکی (CSV یا OFX) به صورت جریانی و در دسته‌های batch_size تایی
+    def import_statement(self, path, fmt=None, batch_size=1000):
+        return self.statement_import(path, fmt, batch_size).run()
+    
+    def statement_import(self, path, fmt=None, batch_size=1000):
+        return StatementImport(self, path, fmt, batch_size)
+    
+    # کلیدهای تراکنش‌های ثبت‌شده فقط در بازه [start, end] صورتحساب
+    def existing_keys(self, start, end):
+        if start is None:
+            return Counter()
+        return Counter(importers.transaction_key(t) for t in self.storage.iter_range(start, end + 1))
+    
+    # تراکنش‌ها به ترتیب ثبت و به صورت جریانی؛ start و end از نوع datetime یا None
+    def iter_transactions(self, start=None, end=None, category=None, transaction_type=None):
+        filters = {}
+        if transaction_type is not None:
+            filters['type'] = transaction_type
+        if category is not None:
+            filters['category'] = category
+        return self.storage.iter_range(
+            None if start is None else to_timestamp(start),
+            None if end is None else to_timestamp(end),
+            **filters
+        )
+    
+    # خروجی CSV، JSON Lines یا ستونی (.hmc) بدون ساختن کل فهرست در حافظه؛
+    # تعداد تراکنش‌های نوشته‌شده را برمی‌گرداند
+    def export_transactions(self, path, fmt=None, start=None, end=None, category=None, transaction_type=None):
+        fmt = fmt or exporters.detect_format(path)
+        return exporters.WRITERS[fmt](path, self.iter_transactions(start, end, category, transaction_type))
+    
+    # منبع داده صفحه تاریخچه: تراکنش‌ها از جدید به قدیم، صفحه به صفحه
+    def get_history_feed(self, transaction_type=None, category=None):
+        filters = {}
+        if transaction_type is not None:
+            filters['type'] = transaction_type
+        if category is not None:
+            filters['category'] = category
+        return HistoryFeed(self.storage.iter_recent(**filters))
+    
+    # موتور تحلیلی (NumPy در صورت نصب بودن) که یک بار از روی داده‌ها ساخته می‌شود
+    def get_analytics(self):
+        if self.analytics is None:
+            self.analytics = create_analytics(self.transactions)
+        return self.analytics
+    
+    # به‌روزرسانی O(1) جمع‌های جاری به ازای هر تراکنش
+    def track_transaction(self, transaction):
+        totals = self.totals
+        amount = transaction['amount']
+        totals['count'] += 1
+        totals[transaction['type']] += amount
+        if transaction['type'] == 'expense':
+            categories = totals['categories']
+            categories[transaction['category']] = categories.get(transaction['category'], 0) + amount
+    
+    def publish_totals(self):
+        totals = self.totals
+        self.version += 1
+        self.total_income = totals['income']
+        self.total_expense = totals['expense']
+        self.balance = totals['income'] - totals['expense']
+        self.transaction_count = totals['count']
+    
+    def compute_totals(self):
+        return {
+            'count': len(self.transactions),
+            'income': self.storage.total('income'),
+            'expense': self.storage.total('expense'),
+            'categories': self.storage.totals_by('category', 'expense')
+        }
+    
+    def rebuild_totals(self):
+        self.totals = self.compute_totals()
+        self.storage.rebuild_rollups()
+        self.reports.invalidate()
+        self.publish_totals()
+    
+    def verify_totals(self, tolerance=0.01):
+        expected = self.compute_totals()
+        actual = self.totals
+        categories = set(expected['categories']) | set(actual['categories'])
+        drifted = (
+            expected['count'] != actual['count']
+            or abs(expected['income'] - actual['income']) > tolerance
+            or abs(expected['expense'] - actual['expense']) > tolerance
+            or any(abs(expected['categories'].get(c, 0) - actual['categories'].get(c, 0)) > tolerance
+                   for c in categories)
+        )
+        if drifted:
+            self.totals = expected
+            self.reports.invalidate()
+            self.publish_totals()
+            self.save_data()
+        return not drifted
+    
+    def get_balance(self):
+        return self.totals['income'] - self.totals['expense']
+    
+    # جمع مبالغ در یک گذر بر اساس category، source، type، day یا month
+    def get_totals_by(self, key, transaction_type=None):
+        if key == 'category' and transaction_type == 'expense':
+            return dict(self.totals['categories'])
+        if HAS_NUMPY and self.storage.in_memory:
+            return self.get_analytics().totals_by(key, transaction_type)
+        return self.storage.totals_by(key, transaction_type)
+    
+    # جمع لغزان روزانه در پنجره window_days روزه
+    def get_rolling_report(self, transaction_type='expense', window_days=7):
+        return self.get_analytics().rolling_totals(transaction_type, window_days)
+    
+    def get_category_expenses(self):
+        expenses = {category: 0 for category in self.categories}
+        expenses.update(self.get_totals_by('category', 'expense'))
+        return expenses
+    
+    # report_type: 'summary'، 'categories' یا 'sources'؛ period: 'all'، 'month' یا 'week'
+    def get_report(self, report_type, period='all'):
+        return self.reports.get(self, report_type, period)
+    
+    # میانگین لغزان و نرخ مصرف هر دسته و موجودی پیش‌بینی‌شده پایان ماه
+    def get_forecast(self, now=None):
+        if self.forecast is None:
+            self.forecast = ForecastEngine.build(self.storage.iter_range(ForecastEngine.history_start(now)))
+        return self.forecast.forecast(self.get_balance(), self.budget, now)
+    
+    def get_total_income(self):
+        return self.totals['income']
+    
+    def get_total_expense(self):
+        return self.totals['expense']
+    
+    def check_budget_alerts(self):
+        return [alert_message(alert) for alert in self.alert_engine.status()]
+    
+    # period: 'month' یا 'week'
+    def set_budget(self, category, amount, period='month'):
+        self.budget[category] = amount
+        self.budget_periods[category] = period
+        self.load_budget_alerts(self.get_state())
+        self.save_data()
+    
+    def load_budget_alerts(self, state):
+        self.budget_periods = state.get('budget_periods', {})
+        self.alert_engine = BudgetAlertEngine(self.budget, self.budget_periods)
+        self.alert_engine.load(lambda start: self.storage.totals_by('category', 'expense', start),
+                               state.get('budget_alerts', []))
+    
+    # جمع درآمد و هزینه در بازه [start, end)؛ هر دو datetime یا None
+    def get_period_report(self, start=None, end=None):
+        return self.storage.period_totals(
+            None if start is None else to_timestamp(start),
+            None if end is None else to_timestamp(end)
+        )
+    
+    # جمع درآمد و هزینه هر روز، ماه یا سال از جدول rollup؛ start و end رشته دوره‌اند
+    def get_rollup_totals(self, level, start=None, end=None, category=None):
+        return self.storage.rollup_totals(level, start, end, category)
+    
+    # مقایسه هر ماه با ماه قبل برای months ماه اخیر (category اختیاری)
+    def get_month_over_month_report(self, months=12, category=None):
+        periods = month_periods(months + 1)
+        return compare_periods(periods, self.get_rollup_totals('month', periods[0], category=category))
+    
+    def get_year_over_year_report(self, years=5, category=None):
+        periods = year_periods(years + 1)
+        return compare_periods(periods, self.get_rollup_totals('year', periods[0], category=category))
+    
+    def get_weekly_report(self):
+        one_week_ago = datetime.now() - timedelta(days=7)
+        report = self.get_period_report(one_week_ago)
+        
+        return report['income'], report['expense']
+    
+    def get_monthly_report(self):
+        month_start = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        report = self.get_period_report(month_start)
+        
+        return report['income'], report['expense']
+    
+    # کپی وضعیت تا نوشتن در thread پس‌زمینه با تغییرات بعدی تداخل نداشته باشد
+    def get_state(self):
+        totals = dict(self.totals, categories=dict(self.totals['categories']))
+        return {
+            'budget': dict(self.budget),
+            'budget_periods': dict(self.budget_periods),
+            'budget_alerts': self.alert_engine.get_state(),
+            'totals': totals
+        }
+    
+    def save_data(self):
+        self.storage.save(self.get_state())
+    
+    def close(self):
+        self.save_data()
+        self.storage.close()
+    
+    def load_data(self):
+        self.analytics = None
+        self.forecast = None
+        self.reports.invalidate()
+        state = self.storage.load()
+        if state is None:
+            self.budget = {category: 0 for category in self.categories}
+            # ژورنال بدون snapshot (پیش از اولین compaction یا پس از قطع برنامه)
+            self.totals = self.compute_totals() if len(self.transactions) else self.empty_totals()
+            self.publish_totals()
+            self.load_budget_alerts({})
+            return
+        
+        self.budget = state.get('budget', {})
+        totals = state.get('totals')
+        if totals is None or totals['count'] > len(self.transactions):
+            self.rebuild_totals()
+        else:
+            # تراکنش‌های بعد از آخرین ذخیره جمع‌ها (مثلا دنباله ژورنال)
+            self.totals = totals
+            for transaction in self.transactions[totals['count']:]:
+                self.track_transaction(transaction)
+            self.publish_totals()
+        self.load_budget_alerts(state)
+
+# ورود صورتحساب در دو گذر جریانی روی فایل: read_range فقط بازه زمانی را پیدا می‌کند تا
+# کلیدهای تکراری فقط از همان بازه خوانده شوند و batches دسته‌ها را می‌سازد. این دو به حساب
+# دست نمی‌زنند و در thread جداگانه امن‌اند؛ apply در thread صاحب حساب اجرا می‌شود
+class StatementImport:
+    def __init__(self, fm, path, fmt=None, batch_size=1000):
+        self.fm = fm
+        self.path = path
+        self.fmt = fmt or importers.detect_format(path)
+        self.batch_size = batch_size
+        self.categories = list(fm.categories)
+        self.stats = {'imported': 0, 'duplicates': 0, 'skipped': 0, 'income': 0, 'expense': 0}
+        self.start = None
+        self.end = None
+        self.existing = None
+        self.occurrences = Counter()
+    
+    def normalized(self, stats):
+        return importers.normalize(importers.READERS[self.fmt](self.path), self.categories, stats)
+    
+    def read_range(self):
+        for transaction in self.normalized(Counter()):
+            ts = transaction['ts']
+            self.start = ts if self.start is None else min(self.start, ts)
+            self.end = ts if self.end is None else max(self.end, ts)
+    
+    def batches(self):
+        return importers.batched(self.normalized(self.stats), self.batch_size)
+    
+    # occurrences بین دسته‌ها مشترک است تا تکراری‌های یک کلید در دسته‌های مختلف درست شمرده شوند
+    def apply(self, batch):
+        if self.existing is None:
+            self.existing = self.fm.existing_keys(self.start, self.end)
+        batch = list(importers.deduplicate(batch, self.existing, self.stats, self.occurrences))
+        for transaction in batch:
+            self.stats[transaction['type']] += transaction['amount']
+        if batch:
+            self.fm.add_transactions(batch)
+        self.stats['imported'] += len(batch)
+    
+    def run(self):
+        self.read_range()
+        for batch in self.batches():
+            self.apply(batch)
+        return self.stats
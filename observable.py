@@ -0,0 +1,38 @@
+class ObservableProperty:
+    def __init__(self, default=0):
+        self.default = default
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance.__dict__.get(self.name, self.default)
+
+    def __set__(self, instance, value):
+        old = instance.__dict__.get(self.name, self.default)
+        instance.__dict__[self.name] = value
+        # فقط تغییر واقعی مقدار به شنونده‌ها اطلاع داده می‌شود
+        if value != old:
+            instance.dispatch(self.name, value)
+
+
+# مشابه bind/unbind در EventDispatcher کیوی ولی بدون وابستگی به آن، تا
+# مدیرها در thread پس‌زمینه یا بدون رابط کاربری هم قابل استفاده باشند
+class Observable:
+    def bind(self, **callbacks):
+        observers = self.__dict__.setdefault('observers', {})
+        for name, callback in callbacks.items():
+            observers.setdefault(name, []).append(callback)
+
+    def unbind(self, **callbacks):
+        observers = self.__dict__.get('observers', {})
+        for name, callback in callbacks.items():
+            if callback in observers.get(name, ()):
+                observers[name].remove(callback)
+
+    def dispatch(self, name, value):
+        for callback in list(self.__dict__.get('observers', {}).get(name, ())):
+            callback(self, value)
@@ -0,0 +1,113 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def write_json_atomic(filename, data):
+    # فایل موقت + rename تا در صورت قطع برنامه، فایل قبلی سالم بماند
+    tmp_filename = f'{filename}.tmp'
+    with open(tmp_filename, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_filename, filename)
+
+
+# نوشتن با تاخیر در یک thread جداگانه: هر تغییر فقط کلید فایل را «کثیف»
+# علامت می‌زند و همه تغییرات یک فایل در بازه delay ثانیه یک بار نوشته می‌شوند
+class WriteBehind:
+    MAX_RETRIES = 3
+
+    def __init__(self, delay=1.0):
+        self.delay = delay
+        self.pending = {}
+        # کلیدهایی که برداشته شده‌اند (در thread پس‌زمینه یا flush) ولی هنوز نوشته نشده‌اند؛
+        # تا پایان آن نوشتن، نوشتن تازه‌تر همان کلید شروع نمی‌شود تا ترتیب نوشتن‌ها حفظ شود
+        self.in_flight = set()
+        self.condition = threading.Condition()
+        # نوشتن‌ها (از thread پس‌زمینه یا flush) پشت سر هم انجام می‌شوند
+        self.io_lock = threading.Lock()
+        self.thread = None
+
+    # delay (اختیاری): تاخیر بیشتر برای تغییرات کم‌اهمیت؛ زودترین موعد حفظ می‌شود
+    def schedule(self, key, writer, delay=None):
+        deadline = time.monotonic() + (self.delay if delay is None else delay)
+        with self.condition:
+            retries = 0
+            if key in self.pending:
+                pending_deadline, _, retries = self.pending[key]
+                deadline = min(deadline, pending_deadline)
+            self.pending[key] = (deadline, writer, retries)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='write-behind', daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def is_pending(self, key):
+        with self.condition:
+            return key in self.pending
+
+    def run(self):
+        while True:
+            with self.condition:
+                ready = {key: item for key, item in self.pending.items() if key not in self.in_flight}
+                if not ready:
+                    self.condition.wait()
+                    continue
+                now = time.monotonic()
+                deadline = min(item[0] for item in ready.values())
+                if deadline > now:
+                    self.condition.wait(deadline - now)
+                    continue
+                due = {key: item for key, item in ready.items() if item[0] <= now}
+                for key in due:
+                    del self.pending[key]
+                self.in_flight.update(due)
+            for key, (_, writer, retries) in due.items():
+                try:
+                    self.write(key, writer, retries)
+                finally:
+                    with self.condition:
+                        self.in_flight.discard(key)
+                        self.condition.notify_all()
+
+    def write(self, key, writer, retries=0):
+        with self.io_lock:
+            try:
+                writer()
+            except Exception:
+                logger.exception('write-behind: writing %s failed', key)
+                if retries < self.MAX_RETRIES:
+                    with self.condition:
+                        if key not in self.pending:
+                            self.pending[key] = (time.monotonic() + self.delay, writer, retries + 1)
+                            self.condition.notify()
+
+    # key: فقط نوشتن در انتظار همان فایل؛ بدون key همه
+    def flush(self, key=None):
+        with self.condition:
+            # نوشتن قدیمی‌تری که thread پس‌زمینه در جریان دارد باید پیش از نسخه تازه تمام شود
+            while self.in_flight if key is None else key in self.in_flight:
+                self.condition.wait()
+            if key is None:
+                due = self.pending
+                self.pending = {}
+            else:
+                due = {key: self.pending.pop(key)} if key in self.pending else {}
+            self.in_flight.update(due)
+        for due_key, (_, writer, retries) in due.items():
+            try:
+                self.write(due_key, writer, retries)
+            finally:
+                with self.condition:
+                    self.in_flight.discard(due_key)
+                    self.condition.notify_all()
+
+
+WRITER = WriteBehind()
+atexit.register(WRITER.flush)
@@ -0,0 +1,103 @@
+from collections import deque
+
+from budget import period_start
+from storage import transaction_timestamp
+
+REPORT_PERIODS = ('all', 'month', 'week')
+
+
+def compute_summary(fm, start):
+    if start is None:
+        return {'income': fm.totals['income'], 'expense': fm.totals['expense'], 'count': fm.totals['count']}
+    return fm.storage.period_totals(start)
+
+
+def patch_summary(report, transaction):
+    report[transaction['type']] += transaction['amount']
+    report['count'] += 1
+
+
+def compute_categories(fm, start):
+    if start is None:
+        return dict(fm.totals['categories'])
+    return fm.storage.totals_by('category', 'expense', start)
+
+
+def patch_categories(report, transaction):
+    if transaction['type'] == 'expense':
+        category = transaction['category']
+        report[category] = report.get(category, 0) + transaction['amount']
+
+
+def compute_sources(fm, start):
+    return fm.storage.totals_by('source', 'income', start)
+
+
+def patch_sources(report, transaction):
+    if transaction['type'] == 'income':
+        source = transaction['source']
+        report[source] = report.get(source, 0) + transaction['amount']
+
+
+# نوع گزارش -> (محاسبه کامل از storage، افزودن یک تراکنش به گزارش موجود)
+REPORT_TYPES = {
+    'summary': (compute_summary, patch_summary),
+    'categories': (compute_categories, patch_categories),
+    'sources': (compute_sources, patch_sources),
+}
+
+
+# گزارش‌ها با کلید (حساب، دوره، نوع) نگه داشته می‌شوند؛ هر تراکنش جدید شماره
+# نسخه را زیاد می‌کند و گزارش کهنه با تراکنش‌های همین فاصله وصله می‌شود.
+# فقط اگر فاصله از max_delta بیشتر باشد یا دوره عوض شده باشد دوباره محاسبه می‌شود.
+# get یک کپی برمی‌گرداند تا تغییر گزارش توسط فراخواننده نسخه نگه‌داشته‌شده را خراب نکند
+class ReportCache:
+    MAX_DELTA = 1000
+
+    def __init__(self, account, max_delta=None):
+        self.account = account
+        self.max_delta = max_delta or self.MAX_DELTA
+        self.version = 0
+        # (version, transaction) آخرین تراکنش‌ها برای وصله کردن
+        self.log = deque(maxlen=self.max_delta)
+        # key -> [version, شروع دوره, گزارش]
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.patches = 0
+
+    def record(self, transaction):
+        self.version += 1
+        self.log.append((self.version, transaction))
+
+    # پس از بازسازی جمع‌ها یا بارگذاری دوباره، وصله‌ها دیگر معتبر نیستند
+    def invalidate(self):
+        self.version += 1
+        self.log.clear()
+        self.entries.clear()
+
+    def get(self, fm, report_type, period='all', now=None):
+        compute, patch = REPORT_TYPES[report_type]
+        start = None if period == 'all' else period_start(period, now)
+        key = (self.account, period, report_type)
+        entry = self.entries.get(key)
+        if entry is not None and entry[1] == start:
+            version, _, report = entry
+            if version == self.version:
+                self.hits += 1
+                return dict(report)
+            missing = self.version - version
+            if self.log and missing <= len(self.log) and self.log[-missing][0] == version + 1:
+                for _, transaction in list(self.log)[-missing:]:
+                    if start is None or transaction_timestamp(transaction) >= start:
+                        patch(report, transaction)
+                entry[0] = self.version
+                self.patches += 1
+                return dict(report)
+        self.misses += 1
+        report = compute(fm, start)
+        self.entries[key] = [self.version, start, report]
+        return dict(report)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'patches': self.patches, 'entries': len(self.entries)}
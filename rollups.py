@@ -0,0 +1,103 @@
+from datetime import datetime
+
+# طول پیشوند تاریخ ('YYYY-MM-DD HH:MM:SS') برای هر سطح
+ROLLUP_LEVELS = {'day': 10, 'month': 7, 'year': 4}
+
+
+def rollup_key(transaction):
+    return transaction.get('category') or transaction.get('source') or ''
+
+
+# جمع مبلغ و تعداد تراکنش‌ها به ازای (سطح، دوره، نوع، دسته یا منبع)؛
+# هر تراکنش فقط سه سطر (روز، ماه، سال) را به‌روز می‌کند. مقدار سطرها tuple است
+# و جایگزین می‌شود، پس copy با کپی سطحی dict ها یک snapshot ثابت می‌سازد
+class Rollups:
+    def __init__(self):
+        self.rows = {level: {} for level in ROLLUP_LEVELS}
+        # تعداد تراکنش‌هایی که در جمع‌ها آمده‌اند؛ برای اعتبارسنجی نسخه ذخیره‌شده
+        self.count = 0
+
+    @classmethod
+    def build(cls, transactions):
+        rollups = cls()
+        for transaction in transactions:
+            rollups.add(transaction)
+        return rollups
+
+    @classmethod
+    def from_state(cls, state):
+        rollups = cls()
+        for level, period, transaction_type, key, amount, count in state['rows']:
+            rollups.rows[level][(period, transaction_type, key)] = (amount, count)
+        rollups.count = state['count']
+        return rollups
+
+    def copy(self):
+        rollups = Rollups()
+        rollups.rows = {level: dict(groups) for level, groups in self.rows.items()}
+        rollups.count = self.count
+        return rollups
+
+    def get_state(self):
+        rows = [[level, *group, *values] for level, groups in self.rows.items() for group, values in groups.items()]
+        return {'count': self.count, 'rows': rows}
+
+    def add(self, transaction):
+        date = transaction['date']
+        group = (transaction['type'], rollup_key(transaction))
+        for level, length in ROLLUP_LEVELS.items():
+            rows = self.rows[level]
+            key = (date[:length], *group)
+            amount, count = rows.get(key, (0, 0))
+            rows[key] = (amount + transaction['amount'], count + 1)
+        self.count += 1
+
+    # start و end رشته دوره (مثلا '2025-03')؛ end خودش شامل نمی‌شود
+    def totals(self, level, start=None, end=None, key=None):
+        totals = {}
+        for (period, transaction_type, row_key), (amount, _) in self.rows[level].items():
+            if (start is not None and period < start) or (end is not None and period >= end):
+                continue
+            if key is not None and row_key != key:
+                continue
+            period_totals = totals.setdefault(period, {'income': 0, 'expense': 0})
+            period_totals[transaction_type] += amount
+        return totals
+
+
+def month_periods(count, now=None):
+    now = now or datetime.now()
+    index = now.year * 12 + now.month - 1 - (count - 1)
+    periods = []
+    for _ in range(count):
+        periods.append(f'{index // 12:04d}-{index % 12 + 1:02d}')
+        index += 1
+    return periods
+
+
+def year_periods(count, now=None):
+    year = (now or datetime.now()).year
+    return [f'{y:04d}' for y in range(year - count + 1, year + 1)]
+
+
+def percent_change(current, previous):
+    if not previous:
+        return None
+    return round((current - previous) / previous * 100, 1)
+
+
+# درصد تغییر درآمد و هزینه هر دوره نسبت به دوره قبل؛ periods[0] فقط مبنای مقایسه است
+def compare_periods(periods, totals):
+    empty = {'income': 0, 'expense': 0}
+    report = []
+    for previous_period, period in zip(periods, periods[1:]):
+        previous = totals.get(previous_period, empty)
+        current = totals.get(period, empty)
+        report.append({
+            'period': period,
+            'income': current['income'],
+            'expense': current['expense'],
+            'income_change': percent_change(current['income'], previous['income']),
+            'expense_change': percent_change(current['expense'], previous['expense']),
+        })
+    return report
@@ -0,0 +1,104 @@
+from datetime import datetime
+import json
+
+from persistence import WRITER, write_json_atomic
+
+
+def report_period(now):
+    year, week, _ = now.isocalendar()
+    return f'{year}-W{week:02d}'
+
+
+# گزارش هفتگی فقط یک بار در هر هفته و هشدار پیش‌بینی هر دسته یک بار در هر ماه
+# ارسال می‌شود (هشدارهای بودجه هنگام ثبت هزینه توسط BudgetAlertEngine ارسال
+# می‌شوند)؛ تا وقتی تراکنش‌ها یا هفته عوض نشده‌اند هیچ محاسبه‌ای انجام نمی‌شود و
+# فاصله بررسی‌ها تا MAX_INTERVAL دو برابر می‌شود
+class NotificationScheduler:
+    MIN_INTERVAL = 30
+    MAX_INTERVAL = 600
+
+    def __init__(self, notification_manager, filename='notification_schedule.json'):
+        self.notification_manager = notification_manager
+        self.filename = filename
+        self.interval = self.MIN_INTERVAL
+        self.last_key = None
+        # user_id -> آخرین هفته‌ای که گزارش آن ارسال شده
+        self.reports = {}
+        # user_id -> کلیدهای «ماه:دسته» هشدارهای پیش‌بینی ارسال‌شده در ماه جاری
+        self.forecasts = {}
+        self.load()
+
+    def tick(self, fm, now=None):
+        now = now or datetime.now()
+        key = (fm.user_id, fm.version, report_period(now))
+        if key == self.last_key:
+            self.interval = min(self.interval * 2, self.MAX_INTERVAL)
+            return
+        self.last_key = key
+        self.interval = self.MIN_INTERVAL
+
+        changed = self.check_weekly_report(fm, now)
+        changed = self.check_forecast(fm, now) or changed
+        if changed:
+            self.save()
+
+    def check_weekly_report(self, fm, now):
+        period = report_period(now)
+        if self.reports.get(fm.user_id) == period:
+            return False
+        weekly_income, weekly_expense = fm.get_weekly_report()
+        if weekly_income <= 0 and weekly_expense <= 0:
+            return False
+        self.reports[fm.user_id] = period
+        self.notification_manager.add_notification(
+            "گزارش هفتگی 📈",
+            f"درآمد هفته: {weekly_income:,} تومان\nهزینه هفته: {weekly_expense:,} تومان",
+            "info"
+        )
+        return True
+
+    def check_forecast(self, fm, now):
+        forecast = fm.get_forecast(now)
+        month = forecast['month']
+        sent = [key for key in self.forecasts.get(fm.user_id, []) if key.startswith(f'{month}:')]
+        messages = []
+        for overrun in forecast['overruns']:
+            key = f"{month}:{overrun['category']}"
+            if key not in sent:
+                sent.append(key)
+                messages.append((
+                    "پیش‌بینی بودجه 🔮",
+                    f"با روند فعلی، بودجه {overrun['category']} حدود روز {overrun['day']} ماه تمام می‌شود\n"
+                    f"هزینه پیش‌بینی‌شده ماه: {overrun['projected']:,.0f} از {overrun['budget']:,} تومان",
+                    "warning"
+                ))
+        key = f'{month}:balance'
+        if forecast['projected_balance'] < 0 <= fm.get_balance() and key not in sent:
+            sent.append(key)
+            messages.append((
+                "پیش‌بینی موجودی 🔮",
+                f"با روند فعلی، موجودی پایان ماه به {forecast['projected_balance']:,.0f} تومان می‌رسد",
+                "danger"
+            ))
+        self.forecasts[fm.user_id] = sent
+        for title, message, notification_type in messages:
+            self.notification_manager.add_notification(title, message, notification_type)
+        return bool(messages)
+
+    # پس از توقف برنامه، بررسی بعدی بلافاصله و با فاصله کمینه انجام می‌شود
+    def reset(self):
+        self.last_key = None
+        self.interval = self.MIN_INTERVAL
+
+    def save(self):
+        state = {'reports': dict(self.reports), 'forecasts': {key: list(value) for key, value in self.forecasts.items()}}
+        WRITER.schedule(self.filename, lambda: write_json_atomic(self.filename, state))
+
+    def load(self):
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        self.reports = state.get('reports', {})
+        self.forecasts = state.get('forecasts', {})
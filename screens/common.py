@@ -0,0 +1,91 @@
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.core.window import Window
+from kivy.graphics import Color, RoundedRectangle
+from kivy.utils import get_color_from_hex
+from kivy.clock import Clock
+
+# تنظیمات رنگ‌های مدرن
+COLORS = {
+    'primary': get_color_from_hex('#4361ee'),
+    'secondary': get_color_from_hex('#3a0ca3'),
+    'success': get_color_from_hex('#4cc9f0'),
+    'danger': get_color_from_hex('#f72585'),
+    'warning': get_color_from_hex('#f8961e'),
+    'light': get_color_from_hex('#f8f9fa'),
+    'dark': get_color_from_hex('#212529'),
+    'background': get_color_from_hex('#ffffff')
+}
+
+Window.clearcolor = COLORS['background']
+
+class RoundedButton(Button):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.background_color = (0, 0, 0, 0)
+        self.color = COLORS['light']
+        self.font_size = '18sp'
+        self.bold = True
+        
+        with self.canvas.before:
+            Color(*COLORS['primary'])
+            self.rect = RoundedRectangle(radius=[25])
+            self.bind(pos=self.update_rect, size=self.update_rect)
+    
+    def update_rect(self, *args):
+        self.rect.pos = self.pos
+        self.rect.size = self.size
+
+class ModernCard(BoxLayout):
+    def __init__(self, title, value, color, icon, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.size_hint_y = None
+        self.height = 120
+        self.padding = 15
+        self.spacing = 10
+        self.binding = None
+        
+        with self.canvas.before:
+            self.color = Color(*color)
+            self.rect = RoundedRectangle(radius=[20])
+            self.bind(pos=self.update_rect, size=self.update_rect)
+        
+        title_layout = BoxLayout(size_hint_y=0.4)
+        title_icon = Label(text=icon, font_size='20sp', color=COLORS['light'])
+        title_label = Label(text=title, font_size='16sp', color=COLORS['light'], bold=True)
+        title_layout.add_widget(title_icon)
+        title_layout.add_widget(title_label)
+        
+        self.value_label = Label(text=str(value), font_size='24sp', color=COLORS['light'], bold=True)
+        
+        self.add_widget(title_layout)
+        self.add_widget(self.value_label)
+    
+    def set_value(self, value):
+        self.value_label.text = str(value)
+    
+    def set_color(self, color):
+        self.color.rgba = color
+    
+    # اتصال مقدار کارت به یک ویژگی Observable؛ تغییرات ممکن است از thread
+    # پس‌زمینه (ورود صورتحساب) برسند، پس برچسب در thread اصلی به‌روز می‌شود
+    def bind_value(self, source, name, fmt=str):
+        def on_change(instance, value):
+            Clock.schedule_once(lambda dt: self.set_value(fmt(value)))
+        
+        self.unbind_value()
+        self.binding = (source, name, on_change)
+        source.bind(**{name: on_change})
+        self.set_value(fmt(getattr(source, name)))
+    
+    def unbind_value(self):
+        if self.binding is not None:
+            source, name, callback = self.binding
+            source.unbind(**{name: callback})
+            self.binding = None
+    
+    def update_rect(self, *args):
+        self.rect.pos = self.pos
+        self.rect.size = self.size
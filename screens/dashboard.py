@@ -0,0 +1,132 @@
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.gridlayout import GridLayout
+from kivy.clock import Clock
+
+from screens.common import COLORS, ModernCard, RoundedButton
+
+class MainScreen(BoxLayout):
+    def __init__(self, app, **kwargs):
+        super().__init__(**kwargs)
+        self.app = app
+        self.orientation = 'vertical'
+        self.padding = [20, 10, 20, 10]
+        self.spacing = 15
+        self.create_main_menu()
+        self.app.notification_manager.bind(unread_count=self.on_unread_count)
+        self.update_badge(self.app.notification_manager.unread_count)
+        self.app.fm.bind(transaction_count=self.on_transaction_count)
+        self.update_forecast()
+    
+    def create_main_menu(self):
+        header = BoxLayout(size_hint_y=0.15)
+        title = Label(
+            text='💰 هوش مالی',
+            font_size='28sp',
+            bold=True,
+            color=COLORS['primary']
+        )
+        
+        self.notification_btn = Button(
+            text='🔔',
+            size_hint_x=0.2,
+            background_color=(0,0,0,0),
+            font_size='20sp'
+        )
+        self.notification_btn.bind(on_press=self.app.show_notification_screen)
+        
+        profile_btn = Button(
+            text='👤',
+            size_hint_x=0.2,
+            background_color=(0,0,0,0),
+            font_size='20sp'
+        )
+        profile_btn.bind(on_press=self.app.show_profile_screen)
+        
+        header.add_widget(profile_btn)
+        header.add_widget(title)
+        header.add_widget(self.notification_btn)
+        self.add_widget(header)
+        
+        cards_layout = BoxLayout(size_hint_y=0.3, spacing=15)
+        
+        self.balance_card = ModernCard(
+            title='موجودی', 
+            value='',
+            color=COLORS['primary'],
+            icon='💰'
+        )
+        self.balance_card.bind_value(self.app.fm, 'balance', lambda value: f'{value:,} تومان')
+        
+        self.income_card = ModernCard(
+            title='کل درآمد', 
+            value='',
+            color=COLORS['success'],
+            icon='📈'
+        )
+        self.income_card.bind_value(self.app.fm, 'total_income', lambda value: f'{value:,}')
+        
+        self.expense_card = ModernCard(
+            title='کل هزینه', 
+            value='',
+            color=COLORS['danger'],
+            icon='📉'
+        )
+        self.expense_card.bind_value(self.app.fm, 'total_expense', lambda value: f'{value:,}')
+        
+        cards_layout.add_widget(self.balance_card)
+        cards_layout.add_widget(self.income_card)
+        cards_layout.add_widget(self.expense_card)
+        self.add_widget(cards_layout)
+        
+        self.forecast_card = ModernCard(
+            title='پیش‌بینی موجودی پایان ماه',
+            value='',
+            color=COLORS['secondary'],
+            icon='🔮'
+        )
+        self.add_widget(self.forecast_card)
+        
+        buttons_layout = GridLayout(cols=2, spacing=15, size_hint_y=0.4)
+        
+        buttons = [
+            ('➕ درآمد', COLORS['success'], self.app.show_income_screen),
+            ('➖ هزینه', COLORS['danger'], self.app.show_expense_screen),
+            ('📊 گزارش', COLORS['primary'], self.app.show_report_screen),
+            ('📋 تاریخچه', COLORS['warning'], self.app.show_history_screen),
+        ]
+        
+        for text, color, callback in buttons:
+            btn = RoundedButton(text=text)
+            btn.canvas.before.children[0].rgba = color
+            btn.bind(on_press=callback)
+            buttons_layout.add_widget(btn)
+        
+        self.add_widget(buttons_layout)
+    
+    # کارت‌ها و نشان اعلان‌ها از طریق bind به‌روز می‌مانند؛ پیش‌بینی به روز جاری
+    # هم بستگی دارد و با هر نمایش دوباره حساب می‌شود
+    def refresh(self):
+        self.update_forecast()
+    
+    def on_transaction_count(self, instance, value):
+        Clock.schedule_once(lambda dt: self.update_forecast())
+    
+    def update_forecast(self):
+        forecast = self.app.fm.get_forecast()
+        projected = forecast['projected_balance']
+        self.forecast_card.set_value(f'{projected:,.0f} تومان')
+        self.forecast_card.set_color(COLORS['secondary'] if projected >= 0 else COLORS['danger'])
+    
+    def on_unread_count(self, instance, value):
+        Clock.schedule_once(lambda dt: self.update_badge(value))
+    
+    def update_badge(self, unread):
+        self.notification_btn.text = f'🔔 {unread}' if unread else '🔔'
+    
+    def unbind_data(self):
+        for card in (self.balance_card, self.income_card, self.expense_card):
+            card.unbind_value()
+        self.app.notification_manager.unbind(unread_count=self.on_unread_count)
+        self.app.fm.unbind(transaction_count=self.on_transaction_count)
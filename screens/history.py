@@ -0,0 +1,149 @@
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.spinner import Spinner
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.core.window import Window
+from kivy.graphics import Color, RoundedRectangle
+
+from screens.common import COLORS
+
+class HistoryRow(RecycleDataViewBehavior, BoxLayout):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.orientation = 'vertical'
+        self.padding = 15
+        self.spacing = 5
+        
+        with self.canvas.before:
+            self.bg_color = Color(*COLORS['primary'])
+            self.rect = RoundedRectangle(radius=[15])
+            self.bind(pos=self.update_rect, size=self.update_rect)
+        
+        self.amount_label = Label(
+            font_size='16sp',
+            color=COLORS['light'],
+            text_size=(Window.width - 80, None)
+        )
+        self.date_label = Label(font_size='12sp', color=COLORS['light'])
+        self.add_widget(self.amount_label)
+        self.add_widget(self.date_label)
+    
+    def refresh_view_attrs(self, rv, index, data):
+        self.amount_label.text = data['text']
+        self.date_label.text = data['date']
+        self.bg_color.rgba = data['bg_color']
+        return super().refresh_view_attrs(rv, index, data)
+    
+    def update_rect(self, *args):
+        self.rect.pos = self.pos
+        self.rect.size = self.size
+
+class HistoryScreen(BoxLayout):
+    PAGE_SIZE = 50
+    
+    def __init__(self, app, **kwargs):
+        super().__init__(**kwargs)
+        self.app = app
+        self.orientation = 'vertical'
+        self.padding = [25, 20, 25, 20]
+        self.spacing = 10
+        
+        header = BoxLayout(size_hint_y=0.1)
+        back_btn = Button(text='🔙', size_hint_x=0.2, background_color=(0,0,0,0))
+        back_btn.bind(on_press=self.go_back)
+        title = Label(text='تاریخچه تراکنش‌ها', font_size='24sp', bold=True, color=COLORS['primary'])
+        header.add_widget(back_btn)
+        header.add_widget(title)
+        header.add_widget(Label(size_hint_x=0.2))
+        self.add_widget(header)
+        
+        filter_layout = BoxLayout(size_hint_y=0.08, spacing=10)
+        self.type_spinner = Spinner(
+            text='همه',
+            values=['همه', 'درآمد', 'هزینه'],
+            background_color=COLORS['light']
+        )
+        self.category_spinner = Spinner(
+            text='همه دسته‌ها',
+            values=['همه دسته‌ها'] + self.app.fm.categories,
+            background_color=COLORS['light']
+        )
+        self.type_spinner.bind(text=self.reload)
+        self.category_spinner.bind(text=self.reload)
+        filter_layout.add_widget(self.type_spinner)
+        filter_layout.add_widget(self.category_spinner)
+        self.add_widget(filter_layout)
+        
+        self.empty_label = Label(
+            text='هیچ تراکنشی ثبت نشده است',
+            font_size='18sp',
+            color=COLORS['dark'],
+            size_hint_y=None,
+            height=0,
+            opacity=0
+        )
+        self.add_widget(self.empty_label)
+        
+        # فقط به اندازه صفحه نمایش ردیف ساخته می‌شود و ردیف‌ها بازیافت می‌شوند
+        self.history_view = RecycleView(viewclass=HistoryRow)
+        history_layout = RecycleBoxLayout(
+            orientation='vertical',
+            default_size=(None, 120),
+            default_size_hint=(1, None),
+            size_hint_y=None,
+            spacing=10,
+            padding=10
+        )
+        history_layout.bind(minimum_height=history_layout.setter('height'))
+        self.history_view.add_widget(history_layout)
+        self.history_view.bind(scroll_y=self.on_scroll)
+        self.add_widget(self.history_view)
+        
+        self.reload()
+    
+    def reload(self, *args):
+        filters = {}
+        if self.type_spinner.text == 'درآمد':
+            filters['transaction_type'] = 'income'
+        elif self.type_spinner.text == 'هزینه':
+            filters['transaction_type'] = 'expense'
+        if self.category_spinner.text != 'همه دسته‌ها':
+            filters['category'] = self.category_spinner.text
+        
+        self.feed = self.app.fm.get_history_feed(**filters)
+        self.history_view.data = []
+        self.load_more()
+        
+        is_empty = not self.history_view.data
+        self.empty_label.height = 100 if is_empty else 0
+        self.empty_label.opacity = 1 if is_empty else 0
+    
+    def load_more(self):
+        if self.feed.exhausted:
+            return
+        page = self.feed.next_page(self.PAGE_SIZE)
+        self.history_view.data.extend(self.row_data(transaction) for transaction in page)
+    
+    def on_scroll(self, instance, scroll_y):
+        # نزدیک انتهای فهرست: صفحه بعدی
+        if scroll_y <= 0.1:
+            self.load_more()
+    
+    def refresh(self):
+        self.category_spinner.values = ['همه دسته‌ها'] + self.app.fm.categories
+        self.reload()
+    
+    def row_data(self, transaction):
+        if transaction['type'] == 'income':
+            text = f"درآمد: {transaction['amount']:,} تومان\n{transaction['description']}"
+            bg_color = COLORS['success']
+        else:
+            text = f"هزینه: {transaction['amount']:,} تومان\n{transaction['description']}\n{transaction['category']}"
+            bg_color = COLORS['danger']
+        return {'text': text, 'date': transaction['date'][:16], 'bg_color': bg_color}
+    
+    def go_back(self, instance):
+        self.app.show_main_screen()
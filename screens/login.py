@@ -0,0 +1,230 @@
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.textinput import TextInput
+from kivy.uix.button import Button
+from kivy.uix.popup import Popup
+
+from screens.common import COLORS, RoundedButton
+
+class LoginScreen(BoxLayout):
+    def __init__(self, app, **kwargs):
+        super().__init__(**kwargs)
+        self.app = app
+        self.orientation = 'vertical'
+        self.padding = [30, 40, 30, 40]
+        self.spacing = 20
+        
+        header = BoxLayout(size_hint_y=0.2)
+        title = Label(
+            text='💰 هوش مالی',
+            font_size='32sp',
+            bold=True,
+            color=COLORS['primary']
+        )
+        header.add_widget(title)
+        self.add_widget(header)
+        
+        form_layout = BoxLayout(orientation='vertical', spacing=15)
+        
+        self.username_input = TextInput(
+            hint_text='نام کاربری',
+            font_size='18sp',
+            size_hint_y=0.15,
+            background_color=COLORS['light'],
+            foreground_color=COLORS['dark']
+        )
+        
+        self.password_input = TextInput(
+            hint_text='رمز عبور',
+            font_size='18sp',
+            size_hint_y=0.15,
+            background_color=COLORS['light'],
+            foreground_color=COLORS['dark'],
+            password=True
+        )
+        
+        form_layout.add_widget(self.username_input)
+        form_layout.add_widget(self.password_input)
+        self.add_widget(form_layout)
+        
+        btn_layout = BoxLayout(orientation='vertical', spacing=10, size_hint_y=0.3)
+        
+        self.btn_login = RoundedButton(text='🚀 ورود به برنامه')
+        self.btn_login.canvas.before.children[0].rgba = COLORS['success']
+        self.btn_login.bind(on_press=self.login)
+        
+        btn_register = RoundedButton(text='📝 ثبت‌نام کاربر جدید')
+        btn_register.canvas.before.children[0].rgba = COLORS['primary']
+        btn_register.bind(on_press=self.show_register)
+        
+        btn_layout.add_widget(self.btn_login)
+        btn_layout.add_widget(btn_register)
+        self.add_widget(btn_layout)
+    
+    def refresh(self):
+        self.password_input.text = ''
+        self.set_loading(False)
+    
+    def set_loading(self, loading):
+        self.btn_login.disabled = loading
+        self.btn_login.text = '⏳ در حال بارگذاری...' if loading else '🚀 ورود به برنامه'
+    
+    def login(self, instance):
+        username = self.username_input.text.strip()
+        password = self.password_input.text.strip()
+        
+        if not username or not password:
+            self.show_message('خطا', 'لطفا نام کاربری و رمز عبور را وارد کنید')
+            return
+        
+        success, message = self.app.user_manager.login_user(username, password)
+        if success:
+            self.set_loading(True)
+            self.app.open_account(self.app.user_manager.get_current_user_data()['user_id'],
+                                  self.on_account_ready, self.on_account_error)
+        else:
+            self.show_message('خطا', message)
+    
+    def on_account_ready(self, fm):
+        self.set_loading(False)
+        self.app.reset_screens()
+        self.app.show_main_screen()
+        self.app.notification_manager.add_notification(
+            "خوش آمدید! 👋",
+            f"به هوش مالی خوش آمدید {self.app.user_manager.current_user}!\nموجودی فعلی شما: {fm.get_balance():,} تومان",
+            "success"
+        )
+    
+    def on_account_error(self, message):
+        self.set_loading(False)
+        self.app.user_manager.logout_user()
+        self.show_message('خطا', message)
+    
+    def show_register(self, instance):
+        self.app.show_register_screen()
+    
+    def show_message(self, title, message):
+        content = BoxLayout(orientation='vertical', padding=10, spacing=10)
+        content.add_widget(Label(text=message, font_size='18sp'))
+        
+        btn_ok = Button(text='باشه', size_hint_y=0.4, background_color=COLORS['primary'])
+        popup = Popup(title=title, content=content, size_hint=(0.7, 0.4))
+        btn_ok.bind(on_press=popup.dismiss)
+        content.add_widget(btn_ok)
+        
+        popup.open()
+
+class RegisterScreen(BoxLayout):
+    def __init__(self, app, **kwargs):
+        super().__init__(**kwargs)
+        self.app = app
+        self.orientation = 'vertical'
+        self.padding = [30, 40, 30, 40]
+        self.spacing = 20
+        
+        header = BoxLayout(size_hint_y=0.15)
+        back_btn = Button(text='🔙', size_hint_x=0.2, background_color=(0,0,0,0))
+        back_btn.bind(on_press=self.go_back)
+        title = Label(text='ثبت‌نام کاربر جدید', font_size='24sp', bold=True, color=COLORS['primary'])
+        header.add_widget(back_btn)
+        header.add_widget(title)
+        header.add_widget(Label(size_hint_x=0.2))
+        self.add_widget(header)
+        
+        form_layout = BoxLayout(orientation='vertical', spacing=15)
+        
+        self.username_input = TextInput(
+            hint_text='نام کاربری',
+            font_size='18sp',
+            size_hint_y=0.12,
+            background_color=COLORS['light'],
+            foreground_color=COLORS['dark']
+        )
+        
+        self.email_input = TextInput(
+            hint_text='ایمیل',
+            font_size='18sp',
+            size_hint_y=0.12,
+            background_color=COLORS['light'],
+            foreground_color=COLORS['dark']
+        )
+        
+        self.password_input = TextInput(
+            hint_text='رمز عبور',
+            font_size='18sp',
+            size_hint_y=0.12,
+            background_color=COLORS['light'],
+            foreground_color=COLORS['dark'],
+            password=True
+        )
+        
+        self.confirm_password_input = TextInput(
+            hint_text='تکرار رمز عبور',
+            font_size='18sp',
+            size_hint_y=0.12,
+            background_color=COLORS['light'],
+            foreground_color=COLORS['dark'],
+            password=True
+        )
+        
+        form_layout.add_widget(self.username_input)
+        form_layout.add_widget(self.email_input)
+        form_layout.add_widget(self.password_input)
+        form_layout.add_widget(self.confirm_password_input)
+        self.add_widget(form_layout)
+        
+        btn_layout = BoxLayout(size_hint_y=0.2, spacing=10)
+        btn_register = RoundedButton(text='✅ ثبت‌نام')
+        btn_register.canvas.before.children[0].rgba = COLORS['success']
+        btn_register.bind(on_press=self.register)
+        
+        btn_cancel = RoundedButton(text='❌ انصراف')
+        btn_cancel.canvas.before.children[0].rgba = COLORS['danger']
+        btn_cancel.bind(on_press=self.go_back)
+        
+        btn_layout.add_widget(btn_register)
+        btn_layout.add_widget(btn_cancel)
+        self.add_widget(btn_layout)
+    
+    def refresh(self):
+        for text_input in (self.username_input, self.email_input, self.password_input, self.confirm_password_input):
+            text_input.text = ''
+    
+    def register(self, instance):
+        username = self.username_input.text.strip()
+        email = self.email_input.text.strip()
+        password = self.password_input.text.strip()
+        confirm_password = self.confirm_password_input.text.strip()
+        
+        if not username or not email or not password:
+            self.show_message('خطا', 'لطفا تمام فیلدها را پر کنید')
+            return
+        
+        if password != confirm_password:
+            self.show_message('خطا', 'رمز عبور و تکرار آن مطابقت ندارند')
+            return
+        
+        if len(password) < 4:
+            self.show_message('خطا', 'رمز عبور باید حداقل ۴ کاراکتر باشد')
+            return
+        
+        success, message = self.app.user_manager.register_user(username, password, email)
+        if success:
+            self.show_message('موفق', message)
+            self.app.show_login_screen()
+        else:
+            self.show_message('خطا', message)
+    
+    def go_back(self, instance):
+        self.app.show_login_screen()
+    
+    def show_message(self, title, message):
+        content = BoxLayout(orientation='vertical', padding=10, spacing=10)
+        content.add_widget(Label(text=message, font_size='18sp'))
+        
+        btn_ok = Button(text='باشه', size_hint_y=0.4, background_color=COLORS['primary'])
+        popup = Popup(title=title, content=content, size_hint=(0.7, 0.4))
+        btn_ok.bind(on_press=popup.dismiss)
+        content.add_widget(btn_ok)
+        
+        popup.open()
@@ -0,0 +1,151 @@
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.scrollview import ScrollView
+from kivy.core.window import Window
+from kivy.graphics import Color, RoundedRectangle
+from kivy.utils import get_color_from_hex
+
+from screens.common import COLORS
+
+class NotificationScreen(BoxLayout):
+    def __init__(self, app, **kwargs):
+        super().__init__(**kwargs)
+        self.app = app
+        self.orientation = 'vertical'
+        self.padding = [25, 20, 25, 20]
+        self.spacing = 15
+        
+        header = BoxLayout(size_hint_y=0.1)
+        back_btn = Button(text='🔙', size_hint_x=0.2, background_color=(0,0,0,0))
+        back_btn.bind(on_press=self.go_back)
+        title = Label(text='🔔 اعلان‌ها', font_size='24sp', bold=True, color=COLORS['primary'])
+        self.count_label = Label(font_size='16sp', color=COLORS['danger'])
+        
+        header.add_widget(back_btn)
+        header.add_widget(title)
+        header.add_widget(self.count_label)
+        self.add_widget(header)
+        
+        self.btn_mark_all = Button(
+            text='📭 علامت‌گذاری همه как خوانده شده',
+            size_hint_y=0.08,
+            background_color=COLORS['success']
+        )
+        self.btn_mark_all.bind(on_press=self.mark_all_read)
+        self.add_widget(self.btn_mark_all)
+        
+        content = ScrollView()
+        self.notifications_layout = BoxLayout(orientation='vertical', spacing=10, size_hint_y=None)
+        self.notifications_layout.bind(minimum_height=self.notifications_layout.setter('height'))
+        
+        self.empty_label = Label(
+            text='📭 هیچ اعلانی وجود ندارد',
+            font_size='18sp',
+            color=COLORS['dark'],
+            size_hint_y=None,
+            height=100
+        )
+        # کارت هر اعلان یک بار ساخته و با id نگه داشته می‌شود
+        self.cards = {}
+        
+        content.add_widget(self.notifications_layout)
+        self.add_widget(content)
+        self.refresh()
+    
+    def refresh(self):
+        notification_count = self.app.notification_manager.get_unread_count()
+        self.count_label.text = f'({notification_count} جدید)'
+        # دکمه همیشه در درخت می‌ماند و فقط پنهان می‌شود
+        if notification_count > 0:
+            self.btn_mark_all.size_hint_y = 0.08
+            self.btn_mark_all.opacity = 1
+        else:
+            self.btn_mark_all.size_hint_y = None
+            self.btn_mark_all.height = 0
+            self.btn_mark_all.opacity = 0
+        self.btn_mark_all.disabled = notification_count == 0
+        
+        notifications = self.app.notification_manager.get_recent_notifications(20)
+        cards = {}
+        for notification in notifications:
+            key = (notification['id'], notification['time'], notification['read'])
+            cards[key] = self.cards.get(key) or self.create_notification_card(notification)
+        self.cards = cards
+        
+        self.notifications_layout.clear_widgets()
+        if not notifications:
+            self.notifications_layout.add_widget(self.empty_label)
+        for card in cards.values():
+            self.notifications_layout.add_widget(card)
+    
+    def create_notification_card(self, notification):
+        card = BoxLayout(
+            orientation='vertical',
+            size_hint_y=None,
+            height=120,
+            padding=15,
+            spacing=5
+        )
+        
+        if notification['type'] == 'success':
+            bg_color = COLORS['success']
+        elif notification['type'] == 'warning':
+            bg_color = COLORS['warning']
+        elif notification['type'] == 'danger':
+            bg_color = COLORS['danger']
+        else:
+            bg_color = COLORS['primary']
+        
+        with card.canvas.before:
+            Color(*bg_color)
+            RoundedRectangle(pos=card.pos, size=card.size, radius=[15])
+        
+        title_layout = BoxLayout(size_hint_y=0.4)
+        title_label = Label(
+            text=notification['title'],
+            font_size='16sp',
+            color=COLORS['light'],
+            bold=True
+        )
+        time_label = Label(
+            text=notification['time'][11:16],
+            font_size='12sp',
+            color=COLORS['light']
+        )
+        title_layout.add_widget(title_label)
+        title_layout.add_widget(time_label)
+        
+        message_label = Label(
+            text=notification['message'],
+            font_size='14sp',
+            color=COLORS['light'],
+            text_size=(Window.width - 80, None)
+        )
+        
+        if not notification['read']:
+            unread_indicator = Label(
+                text='●',
+                font_size='20sp',
+                color=get_color_from_hex('#ffeb3b')
+            )
+            title_layout.add_widget(unread_indicator)
+        
+        card.add_widget(title_layout)
+        card.add_widget(message_label)
+        
+        card.bind(on_touch_down=lambda instance, touch: self.mark_as_read(notification['id']) 
+                 if instance.collide_point(*touch.pos) else False)
+        
+        return card
+    
+    def mark_as_read(self, notification_id):
+        self.app.notification_manager.mark_as_read(notification_id)
+        self.refresh()
+    
+    def mark_all_read(self, instance):
+        self.app.notification_manager.mark_all_as_read()
+        self.refresh()
+    
+    def go_back(self, instance):
+        self.app.show_main_screen()
@@ -0,0 +1,122 @@
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.popup import Popup
+from kivy.uix.filechooser import FileChooserListView
+from kivy.graphics import Color, RoundedRectangle
+from datetime import datetime
+import os
+
+from screens.common import COLORS, RoundedButton
+
+class ProfileScreen(BoxLayout):
+    def __init__(self, app, **kwargs):
+        super().__init__(**kwargs)
+        self.app = app
+        self.orientation = 'vertical'
+        self.padding = [25, 20, 25, 20]
+        self.spacing = 20
+        
+        header = BoxLayout(size_hint_y=0.1)
+        back_btn = Button(text='🔙', size_hint_x=0.2, background_color=(0,0,0,0))
+        back_btn.bind(on_press=self.go_back)
+        title = Label(text='👤 پروفایل کاربری', font_size='24sp', bold=True, color=COLORS['primary'])
+        header.add_widget(back_btn)
+        header.add_widget(title)
+        header.add_widget(Label(size_hint_x=0.2))
+        self.add_widget(header)
+        
+        info_card = BoxLayout(orientation='vertical', size_hint_y=None, height=180, padding=15)
+        with info_card.canvas.before:
+            Color(*COLORS['primary'])
+            RoundedRectangle(pos=info_card.pos, size=info_card.size, radius=[15])
+        
+        self.username_label = Label(font_size='18sp', color=COLORS['light'])
+        self.email_label = Label(font_size='16sp', color=COLORS['light'])
+        self.join_date = Label(font_size='14sp', color=COLORS['light'])
+        
+        info_card.add_widget(self.username_label)
+        info_card.add_widget(self.email_label)
+        info_card.add_widget(self.join_date)
+        self.add_widget(info_card)
+        
+        stats_card = BoxLayout(orientation='vertical', size_hint_y=None, height=150, padding=15)
+        with stats_card.canvas.before:
+            Color(*COLORS['secondary'])
+            RoundedRectangle(pos=stats_card.pos, size=stats_card.size, radius=[15])
+        
+        self.balance_label = Label(font_size='16sp', color=COLORS['light'])
+        self.trans_count = Label(font_size='16sp', color=COLORS['light'])
+        
+        stats_card.add_widget(self.balance_label)
+        stats_card.add_widget(self.trans_count)
+        self.add_widget(stats_card)
+        
+        btn_layout = BoxLayout(orientation='vertical', spacing=10, size_hint_y=0.4)
+        
+        btn_import = RoundedButton(text='📥 ورود صورتحساب بانکی')
+        btn_import.canvas.before.children[0].rgba = COLORS['primary']
+        btn_import.bind(on_press=self.show_import_dialog)
+        
+        btn_export = RoundedButton(text='📤 خروجی CSV تراکنش‌ها')
+        btn_export.canvas.before.children[0].rgba = COLORS['secondary']
+        btn_export.bind(on_press=self.export)
+        
+        btn_logout = RoundedButton(text='🚪 خروج از حساب')
+        btn_logout.canvas.before.children[0].rgba = COLORS['danger']
+        btn_logout.bind(on_press=self.logout)
+        
+        btn_layout.add_widget(btn_import)
+        btn_layout.add_widget(btn_export)
+        btn_layout.add_widget(btn_logout)
+        self.add_widget(btn_layout)
+        self.refresh()
+    
+    def refresh(self):
+        user_data = self.app.user_manager.get_current_user_data()
+        self.username_label.text = f'👤 نام کاربری: {user_data["username"]}'
+        self.email_label.text = f'📧 ایمیل: {user_data["email"]}'
+        self.join_date.text = f'📅 عضو since: {user_data["created_at"][:10]}'
+        self.balance_label.text = f'💰 موجودی: {self.app.fm.get_balance():,} تومان'
+        self.trans_count.text = f'📊 تعداد تراکنش‌ها: {self.app.fm.totals["count"]}'
+    
+    def show_import_dialog(self, instance):
+        content = BoxLayout(orientation='vertical', padding=10, spacing=10)
+        chooser = FileChooserListView(filters=['*.csv', '*.ofx', '*.qfx'], path=os.getcwd())
+        content.add_widget(chooser)
+        
+        btn_layout = BoxLayout(size_hint_y=0.15, spacing=10)
+        btn_ok = Button(text='ورود', background_color=COLORS['success'])
+        btn_cancel = Button(text='انصراف', background_color=COLORS['danger'])
+        btn_layout.add_widget(btn_ok)
+        btn_layout.add_widget(btn_cancel)
+        content.add_widget(btn_layout)
+        
+        popup = Popup(title='انتخاب فایل صورتحساب', content=content, size_hint=(0.9, 0.9))
+        
+        def start_import(instance):
+            if chooser.selection:
+                popup.dismiss()
+                self.app.import_statement(chooser.selection[0])
+        
+        btn_ok.bind(on_press=start_import)
+        btn_cancel.bind(on_press=popup.dismiss)
+        popup.open()
+    
+    def export(self, instance):
+        filename = f'export_{self.app.fm.user_id}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+        self.app.export_transactions(os.path.join(os.getcwd(), filename))
+    
+    def logout(self, instance):
+        self.app.user_manager.logout_user()
+        self.app.reset_screens()
+        self.app.close_account()
+        self.app.show_login_screen()
+        self.app.notification_manager.add_notification(
+            "خروج موفق ✅",
+            "شما با موفقیت از حساب کاربری خود خارج شدید",
+            "info"
+        )
+    
+    def go_back(self, instance):
+        self.app.show_main_screen()
@@ -0,0 +1,94 @@
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.button import Button
+from kivy.uix.scrollview import ScrollView
+
+from screens.common import COLORS, ModernCard
+
+class ReportScreen(BoxLayout):
+    def __init__(self, app, **kwargs):
+        super().__init__(**kwargs)
+        self.app = app
+        self.orientation = 'vertical'
+        self.padding = [25, 20, 25, 20]
+        
+        header = BoxLayout(size_hint_y=0.1)
+        back_btn = Button(text='🔙', size_hint_x=0.2, background_color=(0,0,0,0))
+        back_btn.bind(on_press=self.go_back)
+        title = Label(text='گزارش مالی', font_size='24sp', bold=True, color=COLORS['primary'])
+        header.add_widget(back_btn)
+        header.add_widget(title)
+        header.add_widget(Label(size_hint_x=0.2))
+        self.add_widget(header)
+        
+        content = ScrollView()
+        self.report_layout = BoxLayout(orientation='vertical', spacing=15, size_hint_y=None)
+        self.report_layout.bind(minimum_height=self.report_layout.setter('height'))
+        
+        self.balance_card = ModernCard(
+            title='موجودی فعلی', 
+            value='',
+            color=COLORS['success'],
+            icon='💰'
+        )
+        # کارت‌های دسته و منبع با کلید نگه داشته می‌شوند و فقط مقدارشان عوض می‌شود
+        self.cards = {}
+        self.rendered_version = None
+        
+        content.add_widget(self.report_layout)
+        self.add_widget(content)
+        self.refresh()
+    
+    def card(self, key, title, color, icon):
+        if key not in self.cards:
+            self.cards[key] = ModernCard(title=title, value='', color=color, icon=icon)
+        return self.cards[key]
+    
+    # بدون تراکنش جدید از آخرین نمایش، صفحه همان‌طور که هست می‌ماند
+    def refresh(self):
+        fm = self.app.fm
+        if self.rendered_version == fm.reports.version:
+            return
+        self.rendered_version = fm.reports.version
+        
+        balance = fm.get_balance()
+        self.balance_card.set_value(f'{balance:,} تومان')
+        self.balance_card.set_color(COLORS['success'] if balance >= 0 else COLORS['danger'])
+        
+        visible = [self.balance_card]
+        comparisons = (
+            ('month', 'هزینه این ماه', fm.get_month_over_month_report(1)),
+            ('year', 'هزینه امسال', fm.get_year_over_year_report(1)),
+        )
+        for key, title, report in comparisons:
+            compare_card = self.card(('compare', key), title, COLORS['primary'], '📅')
+            compare_card.set_value(self.format_change(report[-1]['expense'], report[-1]['expense_change']))
+            visible.append(compare_card)
+        
+        expenses = fm.get_report('categories')
+        for category in fm.categories + sorted(set(expenses) - set(fm.categories)):
+            amount = expenses.get(category, 0)
+            if amount > 0:
+                expense_card = self.card(('expense', category), category, COLORS['warning'], '📋')
+                expense_card.set_value(f'{amount:,} تومان')
+                visible.append(expense_card)
+        
+        incomes = fm.get_report('sources')
+        for source, amount in sorted(incomes.items(), key=lambda item: item[1], reverse=True):
+            income_card = self.card(('income', source), source, COLORS['success'], '📈')
+            income_card.set_value(f'{amount:,} تومان')
+            visible.append(income_card)
+        
+        if list(reversed(self.report_layout.children)) != visible:
+            self.report_layout.clear_widgets()
+            for card in visible:
+                self.report_layout.add_widget(card)
+    
+    @staticmethod
+    def format_change(amount, change):
+        if change is None:
+            return f'{amount:,} تومان'
+        return f'{amount:,} تومان ({change:+}٪)'
+    
+    def go_back(self, instance):
+        self.app.show_main_screen()
@@ -0,0 +1,223 @@
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.textinput import TextInput
+from kivy.uix.button import Button
+from kivy.uix.spinner import Spinner
+from kivy.uix.popup import Popup
+
+from screens.common import COLORS, RoundedButton
+
+class IncomeScreen(BoxLayout):
+    def __init__(self, app, **kwargs):
+        super().__init__(**kwargs)
+        self.app = app
+        self.orientation = 'vertical'
+        self.padding = [25, 20, 25, 20]
+        self.spacing = 20
+        
+        header = BoxLayout(size_hint_y=0.1)
+        back_btn = Button(text='🔙', size_hint_x=0.2, background_color=(0,0,0,0))
+        back_btn.bind(on_press=self.go_back)
+        title = Label(text='ثبت درآمد جدید', font_size='24sp', bold=True, color=COLORS['primary'])
+        header.add_widget(back_btn)
+        header.add_widget(title)
+        header.add_widget(Label(size_hint_x=0.2))
+        self.add_widget(header)
+        
+        input_layout = BoxLayout(orientation='vertical', spacing=15)
+        
+        self.amount_input = TextInput(
+            hint_text='مبلغ درآمد (تومان)',
+            input_filter='float',
+            font_size='18sp',
+            size_hint_y=0.2,
+            background_color=COLORS['light'],
+            foreground_color=COLORS['dark']
+        )
+        
+        self.desc_input = TextInput(
+            hint_text='توضیحات',
+            font_size='18sp',
+            size_hint_y=0.2,
+            background_color=COLORS['light'],
+            foreground_color=COLORS['dark']
+        )
+        
+        self.source_input = TextInput(
+            hint_text='منبع درآمد',
+            font_size='18sp', 
+            size_hint_y=0.2,
+            background_color=COLORS['light'],
+            foreground_color=COLORS['dark']
+        )
+        
+        input_layout.add_widget(self.amount_input)
+        input_layout.add_widget(self.desc_input)
+        input_layout.add_widget(self.source_input)
+        self.add_widget(input_layout)
+        
+        btn_layout = BoxLayout(size_hint_y=0.2, spacing=15)
+        btn_save = RoundedButton(text='ذخیره درآمد')
+        btn_save.canvas.before.children[0].rgba = COLORS['success']
+        btn_save.bind(on_press=self.save_income)
+        
+        btn_clear = RoundedButton(text='پاک کردن')
+        btn_clear.canvas.before.children[0].rgba = COLORS['warning']
+        btn_clear.bind(on_press=self.clear_inputs)
+        
+        btn_layout.add_widget(btn_save)
+        btn_layout.add_widget(btn_clear)
+        self.add_widget(btn_layout)
+    
+    def save_income(self, instance):
+        try:
+            amount = float(self.amount_input.text)
+            description = self.desc_input.text
+            source = self.source_input.text
+            
+            if amount > 0 and description and source:
+                self.app.fm.add_income(amount, description, source)
+                self.show_message('موفق', 'درآمد با موفقیت ثبت شد!')
+                self.clear_inputs()
+                self.app.notification_manager.add_notification(
+                    "درآمد جدید 💰",
+                    f"مبلغ {amount:,} تومان از {source} ثبت شد",
+                    "success"
+                )
+                self.app.show_main_screen()
+            else:
+                self.show_message('خطا', 'لطفا همه فیلدها را پر کنید')
+        except ValueError:
+            self.show_message('خطا', 'مبلغ باید عددی باشد')
+    
+    def refresh(self):
+        self.clear_inputs()
+    
+    def clear_inputs(self, instance=None):
+        self.amount_input.text = ''
+        self.desc_input.text = '' 
+        self.source_input.text = ''
+    
+    def show_message(self, title, message):
+        content = BoxLayout(orientation='vertical', padding=10, spacing=10)
+        content.add_widget(Label(text=message, font_size='18sp'))
+        
+        btn_ok = Button(text='باشه', size_hint_y=0.4, background_color=COLORS['primary'])
+        popup = Popup(title=title, content=content, size_hint=(0.7, 0.4))
+        btn_ok.bind(on_press=popup.dismiss)
+        content.add_widget(btn_ok)
+        
+        popup.open()
+    
+    def go_back(self, instance):
+        self.app.show_main_screen()
+
+class ExpenseScreen(BoxLayout):
+    def __init__(self, app, **kwargs):
+        super().__init__(**kwargs)
+        self.app = app
+        self.orientation = 'vertical'
+        self.padding = [25, 20, 25, 20]
+        self.spacing = 20
+        
+        header = BoxLayout(size_hint_y=0.1)
+        back_btn = Button(text='🔙', size_hint_x=0.2, background_color=(0,0,0,0))
+        back_btn.bind(on_press=self.go_back)
+        title = Label(text='ثبت هزینه جدید', font_size='24sp', bold=True, color=COLORS['primary'])
+        header.add_widget(back_btn)
+        header.add_widget(title)
+        header.add_widget(Label(size_hint_x=0.2))
+        self.add_widget(header)
+        
+        input_layout = BoxLayout(orientation='vertical', spacing=15)
+        
+        self.amount_input = TextInput(
+            hint_text='مبلغ هزینه (تومان)',
+            input_filter='float',
+            font_size='18sp',
+            size_hint_y=0.2,
+            background_color=COLORS['light'],
+            foreground_color=COLORS['dark']
+        )
+        
+        self.desc_input = TextInput(
+            hint_text='توضیحات',
+            font_size='18sp',
+            size_hint_y=0.2,
+            background_color=COLORS['light'],
+            foreground_color=COLORS['dark']
+        )
+        
+        category_layout = BoxLayout(size_hint_y=0.2, spacing=10)
+        category_layout.add_widget(Label(text='دسته‌بندی:', size_hint_x=0.4, font_size='18sp'))
+        self.category_spinner = Spinner(
+            text=self.app.fm.categories[0],
+            values=self.app.fm.categories,
+            size_hint_x=0.6,
+            background_color=COLORS['light']
+        )
+        category_layout.add_widget(self.category_spinner)
+        input_layout.add_widget(category_layout)
+        
+        input_layout.add_widget(self.amount_input)
+        input_layout.add_widget(self.desc_input)
+        self.add_widget(input_layout)
+        
+        btn_layout = BoxLayout(size_hint_y=0.2, spacing=15)
+        btn_save = RoundedButton(text='ذخیره هزینه')
+        btn_save.canvas.before.children[0].rgba = COLORS['danger']
+        btn_save.bind(on_press=self.save_expense)
+        
+        btn_clear = RoundedButton(text='پاک کردن')
+        btn_clear.canvas.before.children[0].rgba = COLORS['warning']
+        btn_clear.bind(on_press=self.clear_inputs)
+        
+        btn_layout.add_widget(btn_save)
+        btn_layout.add_widget(btn_clear)
+        self.add_widget(btn_layout)
+    
+    def save_expense(self, instance):
+        try:
+            amount = float(self.amount_input.text)
+            description = self.desc_input.text
+            category = self.category_spinner.text
+            
+            if amount > 0 and description:
+                self.app.fm.add_expense(amount, description, category)
+                self.show_message('موفق', 'هزینه با موفقیت ثبت شد!')
+                self.clear_inputs()
+                self.app.notification_manager.add_notification(
+                    "هزینه جدید 💸",
+                    f"مبلغ {amount:,} تومان برای {category} ثبت شد",
+                    "info"
+                )
+                self.app.show_main_screen()
+            else:
+                self.show_message('خطا', 'لطفا همه فیلدها را پر کنید')
+        except ValueError:
+            self.show_message('خطا', 'مبلغ باید عددی باشد')
+    
+    def refresh(self):
+        self.clear_inputs()
+        categories = self.app.fm.categories
+        self.category_spinner.values = categories
+        if self.category_spinner.text not in categories:
+            self.category_spinner.text = categories[0]
+    
+    def clear_inputs(self, instance=None):
+        self.amount_input.text = ''
+        self.desc_input.text = ''
+    
+    def show_message(self, title, message):
+        content = BoxLayout(orientation='vertical', padding=10, spacing=10)
+        content.add_widget(Label(text=message, font_size='18sp'))
+        
+        btn_ok = Button(text='باشه', size_hint_y=0.4, background_color=COLORS['primary'])
+        popup = Popup(title=title, content=content, size_hint=(0.7, 0.4))
+        btn_ok.bind(on_press=popup.dismiss)
+        content.add_widget(btn_ok)
+        
+        popup.open()
+    
+    def go_back(self, instance):
+        self.app.show_main_screen()
@@ -0,0 +1,1322 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from itertools import islice
+import glob
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+
+from persistence import WRITER, write_json_atomic
+from rollups import ROLLUP_LEVELS, Rollups
+
+
+# ژورنال فقط-افزودنی تراکنش‌ها از آخرین snapshot؛ هر خط یک رکورد JSON است
+# و seq شماره ترتیبی تراکنش (از ۱) در کل تاریخچه است.
+# هنگام compaction فایل به .1 منتقل می‌شود و فقط بعد از نوشته شدن snapshot پاک می‌شود
+class TransactionJournal:
+    def __init__(self, filename):
+        self.filename = filename
+        self.rotated_filename = f'{filename}.1'
+        self.count = 0
+
+    def append(self, seq, transaction):
+        self.append_many(seq, [transaction])
+
+    # چند رکورد با یک write و یک fsync
+    def append_many(self, first_seq, transactions):
+        lines = ''.join(
+            json.dumps({'seq': seq, 'transaction': transaction}, ensure_ascii=False) + '\n'
+            for seq, transaction in enumerate(transactions, first_seq)
+        )
+        with open(self.filename, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self.count += len(transactions)
+
+    def replay(self):
+        self.count = 0
+        yield from self.replay_file(self.rotated_filename)
+        yield from self.replay_file(self.filename)
+
+    def replay_file(self, filename):
+        try:
+            with open(filename, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return
+
+        good_offset = 0
+        for line in raw.splitlines(keepends=True):
+            if not line.endswith(b'\n'):
+                break
+            try:
+                record = json.loads(line.decode('utf-8'))
+                seq = record['seq']
+                transaction = record['transaction']
+            except (ValueError, KeyError, TypeError):
+                break
+            good_offset += len(line)
+            self.count += 1
+            yield seq, transaction
+
+        if good_offset < len(raw):
+            # حذف رکورد نیمه‌کاره تا append های بعدی به آن چسبیده نشوند
+            with open(filename, 'r+b') as f:
+                f.truncate(good_offset)
+
+    def rotate(self):
+        # اگر compaction قبلی هنوز نوشته نشده، همان فایل .1 کافی است
+        if os.path.exists(self.rotated_filename) or not os.path.exists(self.filename):
+            return
+        os.replace(self.filename, self.rotated_filename)
+        self.count = 0
+
+    def discard_rotated(self):
+        if os.path.exists(self.rotated_filename):
+            os.remove(self.rotated_filename)
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+# زمان تراکنش به ثانیه از ۱۹۷۰ (بدون منطقه زمانی، همانند strftime('%s') در SQLite)
+def to_timestamp(date):
+    if isinstance(date, str):
+        date = datetime.fromisoformat(date)
+    return int((date - EPOCH).total_seconds())
+
+
+def format_timestamp(ts):
+    return (EPOCH + timedelta(seconds=ts)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def transaction_timestamp(transaction):
+    ts = transaction.get('ts')
+    if ts is None:
+        ts = transaction['ts'] = to_timestamp(transaction['date'])
+    return ts
+
+
+# فهرست مرتب زمان تراکنش‌ها با جمع پیشوندی درآمد و هزینه؛
+# جمع هر بازه زمانی با دو جستجوی دودویی و یک تفریق به دست می‌آید
+class TimeIndex:
+    def __init__(self, entries=()):
+        self.times = []
+        self.prefix = {'income': [0], 'expense': [0]}
+        # ساخت یک‌جا: مرتب‌سازی O(n log n) به جای درج‌های پراکنده
+        for ts, transaction_type, amount in sorted(entries, key=lambda entry: entry[0]):
+            self.add(ts, transaction_type, amount)
+
+    def add(self, ts, transaction_type, amount):
+        if not self.times or ts >= self.times[-1]:
+            self.times.append(ts)
+            for key, prefix in self.prefix.items():
+                prefix.append(prefix[-1] + (amount if key == transaction_type else 0))
+            return
+
+        # تراکنش با تاریخ قدیمی‌تر (مثلا از فایل بانک): درج در جای مرتب
+        position = bisect_right(self.times, ts)
+        self.times.insert(position, ts)
+        for key, prefix in self.prefix.items():
+            delta = amount if key == transaction_type else 0
+            prefix.insert(position + 1, prefix[position] + delta)
+            if delta:
+                for i in range(position + 2, len(prefix)):
+                    prefix[i] += delta
+
+    def range_totals(self, start=None, end=None):
+        i = 0 if start is None else bisect_left(self.times, start)
+        j = len(self.times) if end is None else bisect_left(self.times, end)
+        j = max(i, j)
+        totals = {key: prefix[j] - prefix[i] for key, prefix in self.prefix.items()}
+        totals['count'] = j - i
+        return totals
+
+
+# کلیدهای قابل استفاده برای گروه‌بندی جمع تراکنش‌ها
+GROUP_KEYS = {
+    'category': lambda t: t.get('category'),
+    'source': lambda t: t.get('source'),
+    'type': lambda t: t['type'],
+    'day': lambda t: t['date'][:10],
+    'month': lambda t: t['date'][:7],
+}
+
+GROUP_KEY_COLUMNS = {
+    'category': 'category',
+    'source': 'source',
+    'type': 'type',
+    'day': 'substr(date, 1, 10)',
+    'month': 'substr(date, 1, 7)',
+}
+
+
+TRANSACTION_TYPES = ('income', 'expense')
+TYPE_CODES = {name: code for code, name in enumerate(TRANSACTION_TYPES)}
+
+
+# جدول رشته‌های تکراری (دسته، منبع، توضیحات) که هر رشته یک بار ذخیره شود
+class StringTable:
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def intern(self, value):
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+# نمای dict-مانند یک سطر از ColumnarTransactions برای کدهای رابط کاربری
+class TransactionRow(Mapping):
+    __slots__ = ('columns', 'index')
+
+    def __init__(self, columns, index):
+        self.columns = columns
+        self.index = index
+
+    def __getitem__(self, key):
+        columns = self.columns
+        i = self.index
+        if key == 'type':
+            return TRANSACTION_TYPES[columns.types[i]]
+        if key == 'amount':
+            return columns.amounts[i]
+        if key == 'description':
+            return columns.strings.values[columns.descriptions[i]]
+        if key == 'date':
+            return format_timestamp(columns.times[i])
+        if key == 'ts':
+            return columns.times[i]
+        if key == 'category' or key == 'source':
+            code = (columns.categories if key == 'category' else columns.sources)[i]
+            if code >= 0:
+                return columns.strings.values[code]
+        raise KeyError(key)
+
+    def __iter__(self):
+        extra = 'source' if self.columns.types[self.index] == TYPE_CODES['income'] else 'category'
+        return iter(('type', 'amount', 'description', extra, 'date', 'ts'))
+
+    def __len__(self):
+        return 6
+
+
+# نگهداری ستونی تراکنش‌ها: مبلغ‌ها در array('d')، زمان‌ها در array('q')
+# و رشته‌ها به صورت کد در StringTable؛ چند برابر کم‌حجم‌تر از list of dict
+class ColumnarTransactions:
+    def __init__(self, rows=()):
+        self.amounts = array('d')
+        self.times = array('q')
+        self.types = array('b')
+        self.categories = array('i')
+        self.sources = array('i')
+        self.descriptions = array('i')
+        self.strings = StringTable()
+        for row in rows:
+            self.append(row)
+
+    def append(self, transaction):
+        intern = self.strings.intern
+        self.amounts.append(transaction['amount'])
+        self.times.append(transaction_timestamp(transaction))
+        self.types.append(TYPE_CODES[transaction['type']])
+        self.categories.append(intern(transaction.get('category')))
+        self.sources.append(intern(transaction.get('source')))
+        self.descriptions.append(intern(transaction.get('description', '')))
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def __iter__(self):
+        for i in range(len(self.amounts)):
+            yield TransactionRow(self, i)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TransactionRow(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('transaction index out of range')
+        return TransactionRow(self, index)
+
+    # سطرهای [start, count) به صورت dict، مستقیم از ستون‌ها؛ ستون‌ها فقط به انتها
+    # اضافه می‌شوند، پس سطرهای پیش از count ثابت‌اند
+    def to_list(self, count=None, start=0):
+        count = len(self) if count is None else count
+        values = self.strings.values
+        income = TYPE_CODES['income']
+        rows = []
+        for i in range(start, count):
+            type_code = self.types[i]
+            ts = self.times[i]
+            row = {'type': TRANSACTION_TYPES[type_code], 'amount': self.amounts[i],
+                   'description': values[self.descriptions[i]]}
+            code = (self.sources if type_code == income else self.categories)[i]
+            if code >= 0:
+                row['source' if type_code == income else 'category'] = values[code]
+            row['date'] = format_timestamp(ts)
+            row['ts'] = ts
+            rows.append(row)
+        return rows
+
+    def total(self, transaction_type):
+        code = TYPE_CODES[transaction_type]
+        return sum(amount for amount, t in zip(self.amounts, self.types) if t == code)
+
+    def entries(self):
+        return zip(self.times, (TRANSACTION_TYPES[t] for t in self.types), self.amounts)
+
+    def totals_by(self, key, transaction_type=None, start=None):
+        type_code = None if transaction_type is None else TYPE_CODES[transaction_type]
+        if key == 'type':
+            codes = self.types
+        elif key == 'category':
+            codes = self.categories
+        elif key == 'source':
+            codes = self.sources
+        else:
+            codes = [ts // 86400 for ts in self.times]
+
+        grouped = {}
+        for code, t, amount, ts in zip(codes, self.types, self.amounts, self.times):
+            if type_code is not None and t != type_code:
+                continue
+            if start is not None and ts < start:
+                continue
+            grouped[code] = grouped.get(code, 0) + amount
+
+        if key == 'type':
+            return {TRANSACTION_TYPES[code]: amount for code, amount in grouped.items()}
+        if key in ('category', 'source'):
+            return {self.strings.values[code]: amount for code, amount in grouped.items() if code >= 0}
+        length = 10 if key == 'day' else 7
+        totals = {}
+        for day, amount in grouped.items():
+            group = format_timestamp(day * 86400)[:length]
+            totals[group] = totals.get(group, 0) + amount
+        return totals
+
+
+# پرس‌وجوهای مشترک برای حالت‌هایی که همه تراکنش‌ها در حافظه هستند
+class MemoryQueries:
+    in_memory = True
+    time_index = None
+    rollups = None
+
+    columnar = False
+
+    def total(self, transaction_type):
+        if self.columnar:
+            return self.transactions.total(transaction_type)
+        return sum(t['amount'] for t in self.transactions if t['type'] == transaction_type)
+
+    def period_totals(self, start=None, end=None):
+        if self.time_index is None:
+            if self.columnar:
+                entries = self.transactions.entries()
+            else:
+                entries = ((transaction_timestamp(t), t['type'], t['amount']) for t in self.transactions)
+            self.time_index = TimeIndex(entries)
+        return self.time_index.range_totals(start, end)
+
+    # تراکنش‌ها از جدید به قدیم، با فیلتر روی فیلدها (مثلا type یا category)
+    def iter_recent(self, **filters):
+        transactions = self.transactions
+        for i in range(len(transactions) - 1, -1, -1):
+            transaction = transactions[i]
+            if all(transaction.get(key) == value for key, value in filters.items()):
+                yield transaction
+
+    # تراکنش‌ها به ترتیب ثبت، با فیلتر بازه زمانی [start, end) و فیلدها؛
+    # فقط تا طول فهرست در لحظه شروع پیمایش می‌شود
+    def iter_range(self, start=None, end=None, **filters):
+        transactions = self.transactions
+        for i in range(len(transactions)):
+            transaction = transactions[i]
+            ts = transaction_timestamp(transaction)
+            if (start is not None and ts < start) or (end is not None and ts >= end):
+                continue
+            if all(transaction.get(key) == value for key, value in filters.items()):
+                yield transaction
+
+    def index_transaction(self, transaction):
+        if self.time_index is not None:
+            self.time_index.add(transaction_timestamp(transaction), transaction['type'], transaction['amount'])
+        if self.rollups is not None:
+            self.rollups.add(transaction)
+
+    def get_rollups(self):
+        if self.rollups is None:
+            self.rollups = Rollups.build(self.transactions)
+        return self.rollups
+
+    def rebuild_rollups(self):
+        self.rollups = Rollups.build(self.transactions)
+
+    # جمع درآمد و هزینه هر دوره از جدول rollup، بدون پیمایش تراکنش‌ها
+    def rollup_totals(self, level, start=None, end=None, key=None):
+        return self.get_rollups().totals(level, start, end, key)
+
+    # start (اختیاری): فقط تراکنش‌های با ts >= start
+    def totals_by(self, key, transaction_type=None, start=None):
+        if self.columnar:
+            return self.transactions.totals_by(key, transaction_type, start)
+        key_func = GROUP_KEYS[key]
+        totals = {}
+        for t in self.transactions:
+            if transaction_type is not None and t['type'] != transaction_type:
+                continue
+            if start is not None and transaction_timestamp(t) < start:
+                continue
+            group = key_func(t)
+            if group is not None:
+                totals[group] = totals.get(group, 0) + t['amount']
+        return totals
+
+
+# تعداد تراکنش‌های هر تکه هنگام نوشتن snapshot حالت json
+SNAPSHOT_CHUNK = 4096
+
+
+class JsonStorage(MemoryQueries):
+    writer = WRITER
+
+    def __init__(self, user_id, columnar=False):
+        self.filename = f'financial_data_{user_id}.json'
+        self.columnar = columnar
+        self.transactions = self.new_transactions()
+
+    def new_transactions(self, rows=()):
+        if self.columnar:
+            return ColumnarTransactions(rows)
+        return list(rows)
+
+    # سطرهای snapshot در تکه‌های SNAPSHOT_CHUNK تایی تا کل فهرست یک‌جا ساخته نشود
+    def serialized_chunks(self, transactions, count):
+        for start in range(0, count, SNAPSHOT_CHUNK):
+            end = min(start + SNAPSHOT_CHUNK, count)
+            yield transactions.to_list(end, start) if self.columnar else transactions[start:end]
+
+    # state شامل بودجه و سایر داده‌های کنار تراکنش‌هاست (مثل جمع‌های جاری)
+    def load(self):
+        if self.writer.is_pending(self.filename):
+            self.writer.flush(self.filename)
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            self.transactions = self.new_transactions()
+            self.rollups = None
+            return None
+        self.transactions = self.new_transactions(data.pop('transactions', []))
+        self.time_index = None
+        # rollup ذخیره‌شده فقط اگر دقیقا همین تراکنش‌ها را پوشش دهد
+        rollups = data.pop('rollups', None)
+        if rollups is not None and rollups['count'] == len(self.transactions):
+            self.rollups = Rollups.from_state(rollups)
+        else:
+            self.rollups = None
+        return data
+
+    def append(self, transaction, state):
+        self.transactions.append(transaction)
+        self.index_transaction(transaction)
+        self.save(state)
+
+    def append_many(self, transactions, state):
+        self.extend(transactions)
+        self.save(state)
+
+    def extend(self, transactions):
+        for transaction in transactions:
+            self.transactions.append(transaction)
+            if self.rollups is not None:
+                self.rollups.add(transaction)
+        # تاریخ‌های وارد شده ممکن است نامرتب باشند؛ فهرست زمانی دوباره ساخته می‌شود
+        self.time_index = None
+
+    # تعداد سطرها و rollup در thread فراخواننده گرفته می‌شوند؛ WRITER فقط همین سطرها را
+    # می‌خواند و تراکنش‌هایی که در این فاصله اضافه می‌شوند وارد این snapshot نمی‌شوند
+    def save(self, state):
+        transactions, count = self.transactions, len(self.transactions)
+        rollups = self.get_rollups().copy()
+        self.writer.schedule(self.filename, lambda: self.write_snapshot(state, transactions, count, rollups))
+
+    # فهرست تراکنش‌ها تکه به تکه نوشته می‌شود؛ بقیه داده (state و rollup) با یک json.dumps
+    def write_snapshot(self, state, transactions, count, rollups):
+        tail = json.dumps({**state, 'rollups': rollups.get_state()}, ensure_ascii=False)
+        tmp_filename = f'{self.filename}.tmp'
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            f.write('{"transactions": [')
+            separator = ''
+            for chunk in self.serialized_chunks(transactions, count):
+                f.write(separator + json.dumps(chunk, ensure_ascii=False)[1:-1])
+                separator = ', '
+            f.write('], ' + tail[1:])
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, self.filename)
+
+    def close(self):
+        self.writer.flush(self.filename)
+
+
+class JournalStorage(JsonStorage):
+    # هر چند تراکنش ژورنال در snapshot ادغام شود
+    COMPACT_EVERY = 500
+
+    def __init__(self, user_id, columnar=False):
+        super().__init__(user_id, columnar)
+        self.journal = TransactionJournal(f'financial_data_{user_id}.journal')
+
+    def load(self):
+        state = super().load()
+        for seq, transaction in self.journal.replay():
+            # رکوردهایی که قبلا در snapshot ذخیره شده‌اند (قطع برنامه بین rename و truncate)
+            if seq <= len(self.transactions):
+                continue
+            if seq != len(self.transactions) + 1:
+                break
+            self.transactions.append(transaction)
+            self.index_transaction(transaction)
+        return state
+
+    def append(self, transaction, state):
+        self.transactions.append(transaction)
+        self.index_transaction(transaction)
+        self.journal.append(len(self.transactions), transaction)
+        if self.journal.count >= self.COMPACT_EVERY:
+            self.save(state)
+
+    def append_many(self, transactions, state):
+        first_seq = len(self.transactions) + 1
+        self.extend(transactions)
+        self.journal.append_many(first_seq, transactions)
+        if self.journal.count >= self.COMPACT_EVERY:
+            self.save(state)
+
+    def save(self, state):
+        self.journal.rotate()
+        super().save(state)
+
+    def write_snapshot(self, state, transactions, count, rollups):
+        super().write_snapshot(state, transactions, count, rollups)
+        self.journal.discard_rotated()
+
+
+TRANSACTION_COLUMNS = ('type', 'amount', 'description', 'category', 'source', 'date', 'ts')
+
+
+# ستون‌های REAL مبلغ صحیح را هم float برمی‌گردانند (5000.0)؛ مثل ذخیره JSON عدد صحیح نگه داشته می‌شود
+def plain_number(value):
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+
+def row_to_transaction(row):
+    transaction = {key: value for key, value in zip(TRANSACTION_COLUMNS, row) if value is not None}
+    transaction['amount'] = plain_number(transaction['amount'])
+    return transaction
+
+
+# نمای فقط-خواندنی روی جدول تراکنش‌ها که مثل list رفتار می‌کند
+# (len، اندیس منفی و slice) بدون اینکه کل تاریخچه در حافظه بارگذاری شود
+class SQLiteTransactionView:
+    def __init__(self, storage):
+        self.storage = storage
+
+    def __len__(self):
+        return self.storage.count
+
+    def __iter__(self):
+        cursor = self.storage.conn.execute(
+            f"SELECT {', '.join(TRANSACTION_COLUMNS)} FROM transactions ORDER BY id")
+        for row in cursor:
+            yield row_to_transaction(row)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            if stop <= start:
+                return []
+            cursor = self.storage.conn.execute(
+                f"SELECT {', '.join(TRANSACTION_COLUMNS)} FROM transactions ORDER BY id LIMIT ? OFFSET ?",
+                (stop - start, start))
+            return [row_to_transaction(row) for row in cursor]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('transaction index out of range')
+        row = self.storage.conn.execute(
+            f"SELECT {', '.join(TRANSACTION_COLUMNS)} FROM transactions ORDER BY id LIMIT 1 OFFSET ?",
+            (index,)).fetchone()
+        return row_to_transaction(row)
+
+
+# صفحه‌بندی تنبل روی iter_recent برای صفحه تاریخچه
+class HistoryFeed:
+    def __init__(self, transactions):
+        self.transactions = iter(transactions)
+        self.exhausted = False
+
+    def next_page(self, count):
+        page = list(islice(self.transactions, count))
+        if len(page) < count:
+            self.exhausted = True
+        return page
+
+
+class SQLiteStorage:
+    in_memory = False
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.filename = f'financial_data_{user_id}.db'
+        self.conn = None
+        self.count = 0
+        self.transactions = SQLiteTransactionView(self)
+
+    def load(self):
+        is_new = not os.path.exists(self.filename)
+        self.conn = sqlite3.connect(self.filename, check_same_thread=False)
+        has_rollups = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rollups'").fetchone() is not None
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS transactions (
+                    id INTEGER PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    amount REAL NOT NULL,
+                    description TEXT,
+                    category TEXT,
+                    source TEXT,
+                    date TEXT NOT NULL,
+                    ts INTEGER
+                )""")
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(transactions)")]
+            if 'ts' not in columns:
+                self.conn.execute("ALTER TABLE transactions ADD COLUMN ts INTEGER")
+                self.conn.execute("UPDATE transactions SET ts = CAST(strftime('%s', date) AS INTEGER)")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_transactions_type_category_date "
+                "ON transactions (type, category, date)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_ts ON transactions (ts)")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS budget (category TEXT PRIMARY KEY, amount REAL NOT NULL)")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS rollups (
+                    level TEXT NOT NULL,
+                    period TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    amount REAL NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (level, period, type, key)
+                )""")
+
+        if is_new:
+            self.import_json()
+
+        self.count = self.conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+        # پایگاه داده‌های قدیمی‌تر از جدول rollup یک بار از روی تراکنش‌ها پر می‌شوند
+        if not has_rollups and not is_new and self.count:
+            self.rebuild_rollups()
+        budget = {category: plain_number(amount)
+                  for category, amount in self.conn.execute("SELECT category, amount FROM budget")}
+        meta = {key: json.loads(value) for key, value in self.conn.execute("SELECT key, value FROM meta")}
+        if not budget and not meta and not self.count:
+            return None
+        return {'budget': budget, **meta}
+
+    def import_json(self):
+        migrate_legacy_json(self.user_id, self.write_legacy)
+
+    def write_legacy(self, transactions, state):
+        with self.conn:
+            self.insert_many(transactions)
+            self.write_state(state)
+
+    def insert_many(self, transactions):
+        placeholders = ', '.join('?' * len(TRANSACTION_COLUMNS))
+        self.conn.executemany(
+            f"INSERT INTO transactions ({', '.join(TRANSACTION_COLUMNS)}) VALUES ({placeholders})",
+            (tuple(t.get(key) for key in TRANSACTION_COLUMNS[:-1]) + (transaction_timestamp(t),)
+             for t in transactions))
+        rollups = Rollups.build(transactions)
+        self.conn.executemany(
+            "INSERT INTO rollups (level, period, type, key, amount, count) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (level, period, type, key) DO UPDATE SET "
+            "amount = amount + excluded.amount, count = count + excluded.count",
+            rollups.get_state()['rows'])
+
+    def write_state(self, state, include_budget=True):
+        for key, value in state.items():
+            if key != 'budget':
+                self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                  (key, json.dumps(value, ensure_ascii=False)))
+        if include_budget:
+            self.conn.execute("DELETE FROM budget")
+            self.conn.executemany("INSERT INTO budget (category, amount) VALUES (?, ?)",
+                                  state.get('budget', {}).items())
+
+    def append(self, transaction, state):
+        with self.conn:
+            self.insert_many([transaction])
+            self.write_state(state, include_budget=False)
+        self.count += 1
+
+    def append_many(self, transactions, state):
+        with self.conn:
+            self.insert_many(transactions)
+            self.write_state(state, include_budget=False)
+        self.count += len(transactions)
+
+    def save(self, state):
+        with self.conn:
+            self.write_state(state)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def total(self, transaction_type):
+        row = self.conn.execute(
+            "SELECT COALESCE(SUM(amount), 0) FROM transactions WHERE type = ?",
+            (transaction_type,)).fetchone()
+        return plain_number(row[0])
+
+    def period_totals(self, start=None, end=None):
+        query = "SELECT type, SUM(amount), COUNT(*) FROM transactions WHERE 1"
+        params = []
+        if start is not None:
+            query += " AND ts >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND ts < ?"
+            params.append(end)
+        totals = {'income': 0, 'expense': 0, 'count': 0}
+        for transaction_type, amount, count in self.conn.execute(query + " GROUP BY type", params):
+            totals[transaction_type] = plain_number(amount)
+            totals['count'] += count
+        return totals
+
+    # همان صفحه‌بندی keyset به ترتیب ثبت (id > آخرین id) برای خروجی گرفتن
+    def iter_range(self, start=None, end=None, chunk_size=1000, **filters):
+        for key in filters:
+            if key not in TRANSACTION_COLUMNS:
+                raise ValueError(f'unknown transaction field: {key}')
+        where = ''.join(f" AND {key} = ?" for key in filters)
+        params = list(filters.values())
+        if start is not None:
+            where += " AND ts >= ?"
+            params.append(start)
+        if end is not None:
+            where += " AND ts < ?"
+            params.append(end)
+        last_id = 0
+        while True:
+            rows = self.conn.execute(
+                f"SELECT id, {', '.join(TRANSACTION_COLUMNS)} FROM transactions WHERE id > ?{where} "
+                "ORDER BY id LIMIT ?", [last_id] + params + [chunk_size]).fetchall()
+            for row in rows:
+                yield row_to_transaction(row[1:])
+            if len(rows) < chunk_size:
+                return
+            last_id = rows[-1][0]
+
+    # صفحه‌بندی keyset (id < آخرین id) تا هزینه هر صفحه به عمق آن بستگی نداشته باشد
+    def iter_recent(self, chunk_size=200, **filters):
+        for key in filters:
+            if key not in TRANSACTION_COLUMNS:
+                raise ValueError(f'unknown transaction field: {key}')
+        where = ''.join(f" AND {key} = ?" for key in filters)
+        last_id = None
+        while True:
+            query = f"SELECT id, {', '.join(TRANSACTION_COLUMNS)} FROM transactions WHERE 1{where}"
+            params = list(filters.values())
+            if last_id is not None:
+                query += " AND id < ?"
+                params.append(last_id)
+            rows = self.conn.execute(query + " ORDER BY id DESC LIMIT ?", params + [chunk_size]).fetchall()
+            for row in rows:
+                yield row_to_transaction(row[1:])
+            if len(rows) < chunk_size:
+                return
+            last_id = rows[-1][0]
+
+    def totals_by(self, key, transaction_type=None, start=None):
+        column = GROUP_KEY_COLUMNS[key]
+        query = f"SELECT {column}, SUM(amount) FROM transactions WHERE {column} IS NOT NULL"
+        params = []
+        if transaction_type is not None:
+            query += " AND type = ?"
+            params.append(transaction_type)
+        if start is not None:
+            query += " AND ts >= ?"
+            params.append(start)
+        return {group: plain_number(amount)
+                for group, amount in self.conn.execute(query + f" GROUP BY {column}", params)}
+
+    def rebuild_rollups(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM rollups")
+            for level, length in ROLLUP_LEVELS.items():
+                self.conn.execute(
+                    "INSERT INTO rollups (level, period, type, key, amount, count) "
+                    f"SELECT ?, substr(date, 1, {length}), type, "
+                    "COALESCE(NULLIF(category, ''), NULLIF(source, ''), ''), SUM(amount), COUNT(*) "
+                    "FROM transactions GROUP BY 2, 3, 4", (level,))
+
+    def rollup_totals(self, level, start=None, end=None, key=None):
+        query = "SELECT period, type, SUM(amount) FROM rollups WHERE level = ?"
+        params = [level]
+        if start is not None:
+            query += " AND period >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND period < ?"
+            params.append(end)
+        if key is not None:
+            query += " AND key = ?"
+            params.append(key)
+        totals = {}
+        for period, transaction_type, amount in self.conn.execute(query + " GROUP BY period, type", params):
+            totals.setdefault(period, {'income': 0, 'expense': 0})[transaction_type] = plain_number(amount)
+        return totals
+
+
+MMAP_MAGIC = b'HMTXREC1'
+MMAP_HEADER = struct.Struct('<8sI4x')
+# ts، مبلغ، نوع، کد دسته/منبع در جدول رشته‌ها، آفست توضیحات در heap
+MMAP_RECORD = struct.Struct('<qdb3xiQ')
+MMAP_UNSORTED = 1
+
+
+# نمای فقط-خواندنی مثل list روی رکوردهای فایل mmap؛ هر رکورد فقط هنگام دسترسی باز می‌شود
+class MmapTransactionView:
+    def __init__(self, storage):
+        self.storage = storage
+
+    def __len__(self):
+        return self.storage.count
+
+    def __iter__(self):
+        storage = self.storage
+        for _, record in storage.scan(0, storage.count):
+            yield storage.decode(record)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('transaction index out of range')
+        return self.storage.record(index)
+
+
+# رکوردهای با طول ثابت در یک فایل باینری که با mmap خوانده می‌شود: رکورد i در آفست
+# ثابت است، پس آخرین رکوردها یا بازه‌ای زمانی بدون خواندن کل فایل در دسترس‌اند.
+# توضیحات در فایل heap (طول + UTF-8) و دسته‌ها/منبع‌ها در فایل رشته‌ها (هر خط یک JSON)
+# نگه داشته می‌شوند؛ state مثل حالت json با WRITER نوشته می‌شود
+class MmapStorage:
+    in_memory = False
+    writer = WRITER
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        base = f'financial_data_{user_id}'
+        self.filename = f'{base}.bin'
+        self.heap_filename = f'{base}.heap'
+        self.strings_filename = f'{base}.strings'
+        self.state_filename = f'{base}.state.json'
+        self.rollups_filename = f'{base}.rollups.json'
+        self.count = 0
+        self.flags = 0
+        self.last_ts = None
+        self.heap_size = 0
+        self.strings = []
+        self.codes = {}
+        self.maps = {}
+        self.rollups = None
+        self.transactions = MmapTransactionView(self)
+
+    def load(self):
+        for filename in (self.state_filename, self.rollups_filename):
+            if self.writer.is_pending(filename):
+                self.writer.flush(filename)
+        is_new = not os.path.exists(self.filename)
+        if is_new:
+            with open(self.filename, 'wb') as f:
+                f.write(MMAP_HEADER.pack(MMAP_MAGIC, 0))
+            # آفست صفر همیشه رشته خالی است
+            with open(self.heap_filename, 'wb') as f:
+                f.write(struct.pack('<I', 0))
+
+        with open(self.filename, 'r+b') as f:
+            magic, self.flags = MMAP_HEADER.unpack(f.read(MMAP_HEADER.size))
+            if magic != MMAP_MAGIC:
+                raise ValueError(f'not a transaction file: {self.filename}')
+            size = os.fstat(f.fileno()).st_size - MMAP_HEADER.size
+            self.count = size // MMAP_RECORD.size
+            if size % MMAP_RECORD.size:
+                # رکورد نیمه‌کاره از قطع برنامه هنگام نوشتن
+                f.truncate(MMAP_HEADER.size + self.count * MMAP_RECORD.size)
+        self.heap_size = os.path.getsize(self.heap_filename)
+        self.load_strings()
+        self.maps = {}
+        self.rollups = None
+        self.last_ts = self.raw(self.count - 1)[0] if self.count else None
+
+        if is_new:
+            self.import_json()
+        try:
+            with open(self.state_filename, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            state = None
+        if state is None and not self.count:
+            return None
+        return state or {}
+
+    def load_strings(self):
+        self.strings = []
+        try:
+            with open(self.strings_filename, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            raw = b''
+        good_offset = 0
+        for line in raw.splitlines(keepends=True):
+            if not line.endswith(b'\n'):
+                break
+            self.strings.append(json.loads(line.decode('utf-8')))
+            good_offset += len(line)
+        if good_offset < len(raw):
+            with open(self.strings_filename, 'r+b') as f:
+                f.truncate(good_offset)
+        self.codes = {value: code for code, value in enumerate(self.strings)}
+
+    def import_json(self):
+        migrate_legacy_json(self.user_id, self.write_legacy)
+
+    def write_legacy(self, transactions, state):
+        self.append_many(transactions, state)
+        if self.flags & MMAP_UNSORTED:
+            self.compact(state)
+        self.writer.flush(self.state_filename)
+
+    # نگاشت فایل فقط وقتی دوباره ساخته می‌شود که داده‌ای بیرون از نگاشت فعلی خوانده شود؛
+    # نگاشت قبلی بسته نمی‌شود تا پیمایش‌های در جریان (مثلا خروجی گرفتن) معتبر بمانند
+    def mapped(self, filename, size):
+        current = self.maps.get(filename)
+        if current is None or len(current) < size:
+            with open(filename, 'rb') as f:
+                current = self.maps[filename] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return current
+
+    def records_map(self):
+        return self.mapped(self.filename, MMAP_HEADER.size + self.count * MMAP_RECORD.size)
+
+    def raw(self, index):
+        return MMAP_RECORD.unpack_from(self.records_map(), MMAP_HEADER.size + index * MMAP_RECORD.size)
+
+    # (اندیس، رکورد خام) برای رکوردهای [first, last) بدون ساختن dict
+    def scan(self, first, last, chunk_size=4096):
+        if first >= last:
+            return
+        data = self.records_map()
+        for chunk_start in range(first, last, chunk_size):
+            chunk_end = min(chunk_start + chunk_size, last)
+            chunk = data[MMAP_HEADER.size + chunk_start * MMAP_RECORD.size:
+                         MMAP_HEADER.size + chunk_end * MMAP_RECORD.size]
+            yield from enumerate(MMAP_RECORD.iter_unpack(chunk), chunk_start)
+
+    def description(self, offset):
+        heap = self.mapped(self.heap_filename, self.heap_size)
+        length = struct.unpack_from('<I', heap, offset)[0]
+        return heap[offset + 4:offset + 4 + length].decode('utf-8')
+
+    def decode(self, record):
+        ts, amount, type_code, code, offset = record
+        transaction = {
+            'type': TRANSACTION_TYPES[type_code],
+            'amount': plain_number(amount),
+            'description': self.description(offset) if offset else '',
+            'date': format_timestamp(ts),
+            'ts': ts,
+        }
+        if code >= 0:
+            transaction['source' if type_code == TYPE_CODES['income'] else 'category'] = self.strings[code]
+        return transaction
+
+    def record(self, index):
+        return self.decode(self.raw(index))
+
+    def matches(self, record, filters):
+        for key, value in filters.items():
+            if key == 'type':
+                if record[2] != TYPE_CODES[value]:
+                    return False
+            elif key in ('category', 'source'):
+                label = 'source' if record[2] == TYPE_CODES['income'] else 'category'
+                if key != label or record[3] < 0 or self.strings[record[3]] != value:
+                    return False
+            elif self.decode(record).get(key) != value:
+                return False
+        return True
+
+    def append(self, transaction, state):
+        self.append_many([transaction], state)
+
+    # ترتیب نوشتن: رشته‌ها، heap و در آخر رکوردها تا رکورد کامل همیشه به داده معتبر اشاره کند
+    def append_many(self, transactions, state):
+        records = bytearray()
+        heap = bytearray()
+        strings = []
+        flags = self.flags
+        last_ts = self.last_ts
+        for transaction in transactions:
+            ts = transaction_timestamp(transaction)
+            label = transaction.get('source' if transaction['type'] == 'income' else 'category')
+            code = -1
+            if label is not None:
+                code = self.codes.get(label)
+                if code is None:
+                    code = self.codes[label] = len(self.strings)
+                    self.strings.append(label)
+                    strings.append(json.dumps(label, ensure_ascii=False) + '\n')
+            offset = 0
+            description = transaction.get('description') or ''
+            if description:
+                offset = self.heap_size + len(heap)
+                data = description.encode('utf-8')
+                heap += struct.pack('<I', len(data)) + data
+            if last_ts is not None and ts < last_ts:
+                flags |= MMAP_UNSORTED
+            last_ts = ts if last_ts is None else max(last_ts, ts)
+            records += MMAP_RECORD.pack(ts, transaction['amount'], TYPE_CODES[transaction['type']], code, offset)
+
+        if strings:
+            self.write_tail(self.strings_filename, ''.join(strings).encode('utf-8'))
+        if heap:
+            self.write_tail(self.heap_filename, heap)
+        if flags != self.flags:
+            with open(self.filename, 'r+b') as f:
+                f.write(MMAP_HEADER.pack(MMAP_MAGIC, flags))
+            self.flags = flags
+        self.write_tail(self.filename, records)
+        self.heap_size += len(heap)
+        self.count += len(transactions)
+        self.last_ts = last_ts
+        if self.rollups is not None:
+            for transaction in transactions:
+                self.rollups.add(transaction)
+        self.save_state(state)
+
+    def write_tail(self, filename, data):
+        with open(filename, 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def save_state(self, state):
+        self.writer.schedule(self.state_filename, lambda: write_json_atomic(self.state_filename, state))
+
+    # rollup فقط در ذخیره کامل نوشته می‌شود؛ رکوردهای بعد از آن هنگام بارگذاری اضافه می‌شوند
+    def save(self, state):
+        if self.flags & MMAP_UNSORTED:
+            self.compact(state)
+        self.save_state(state)
+        if self.rollups is not None:
+            rollups = self.rollups.get_state()
+            self.writer.schedule(self.rollups_filename, lambda: write_json_atomic(self.rollups_filename, rollups))
+
+    # بازنویسی رکوردها به ترتیب زمان در فایل موقت و جایگزینی آن تا جستجوی دودویی دوباره ممکن شود.
+    # heap و رشته‌ها تغییر نمی‌کنند؛ rollup وابسته به ترتیب رکوردهاست، پس پیش از جایگزینی
+    # کامل در حافظه ساخته و فایل آن حذف می‌شود تا با قطع برنامه از نو ساخته شود.
+    # جمع‌های state با شمارش رکوردها از دنباله فایل تکمیل می‌شوند، پس state پیش از
+    # جایگزینی و بدون WRITER نوشته می‌شود؛ جمع‌هایی که همه رکوردها را پوشش ندهند حذف
+    # می‌شوند تا هنگام بارگذاری از نو حساب شوند
+    def compact(self, state):
+        rollups = self.get_rollups()
+        data = self.records_map()
+        order = sorted(range(self.count), key=lambda index: MMAP_RECORD.unpack_from(
+            data, MMAP_HEADER.size + index * MMAP_RECORD.size)[0])
+        temp_filename = f'{self.filename}.tmp'
+        with open(temp_filename, 'wb') as f:
+            f.write(MMAP_HEADER.pack(MMAP_MAGIC, self.flags & ~MMAP_UNSORTED))
+            for chunk_start in range(0, self.count, 4096):
+                f.write(b''.join(
+                    data[MMAP_HEADER.size + index * MMAP_RECORD.size:MMAP_HEADER.size + (index + 1) * MMAP_RECORD.size]
+                    for index in order[chunk_start:chunk_start + 4096]))
+            f.flush()
+            os.fsync(f.fileno())
+        if (state.get('totals') or {}).get('count') != self.count:
+            state = {key: value for key, value in state.items() if key != 'totals'}
+        self.writer.flush(self.state_filename)
+        write_json_atomic(self.state_filename, state)
+        self.writer.flush(self.rollups_filename)
+        if os.path.exists(self.rollups_filename):
+            os.remove(self.rollups_filename)
+        os.replace(temp_filename, self.filename)
+        # نگاشت‌های قبلی بسته نمی‌شوند تا پیمایش‌های در جریان روی فایل قبلی ادامه دهند
+        self.maps = {}
+        self.flags &= ~MMAP_UNSORTED
+        self.rollups = rollups
+
+    def close(self):
+        self.writer.flush(self.state_filename)
+        self.writer.flush(self.rollups_filename)
+        for data in self.maps.values():
+            data.close()
+        self.maps = {}
+
+    # اولین اندیس با ts >= value؛ فقط وقتی رکوردها به ترتیب زمان نوشته شده‌اند
+    def lower_bound(self, value):
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.raw(middle)[0] < value:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    # رکوردهای خام در بازه زمانی [start, end)؛ با ترتیب زمانی فقط همان بازه خوانده می‌شود
+    def scan_range(self, start=None, end=None):
+        if self.flags & MMAP_UNSORTED:
+            for index, record in self.scan(0, self.count):
+                if (start is None or record[0] >= start) and (end is None or record[0] < end):
+                    yield index, record
+            return
+        first = 0 if start is None else self.lower_bound(start)
+        last = self.count if end is None else self.lower_bound(end)
+        yield from self.scan(first, last)
+
+    def iter_range(self, start=None, end=None, **filters):
+        for _, record in self.scan_range(start, end):
+            if self.matches(record, filters):
+                yield self.decode(record)
+
+    def iter_recent(self, **filters):
+        for index in range(self.count - 1, -1, -1):
+            record = self.raw(index)
+            if self.matches(record, filters):
+                yield self.decode(record)
+
+    def total(self, transaction_type):
+        code = TYPE_CODES[transaction_type]
+        return plain_number(float(sum(record[1] for _, record in self.scan(0, self.count) if record[2] == code)))
+
+    def period_totals(self, start=None, end=None):
+        totals = {'income': 0, 'expense': 0, 'count': 0}
+        for _, record in self.scan_range(start, end):
+            totals[TRANSACTION_TYPES[record[2]]] += record[1]
+            totals['count'] += 1
+        totals['income'] = plain_number(float(totals['income']))
+        totals['expense'] = plain_number(float(totals['expense']))
+        return totals
+
+    def totals_by(self, key, transaction_type=None, start=None):
+        type_code = None if transaction_type is None else TYPE_CODES[transaction_type]
+        grouped = {}
+        for _, record in self.scan_range(start):
+            ts, amount, record_type, code = record[:4]
+            if type_code is not None and record_type != type_code:
+                continue
+            if key == 'type':
+                group = record_type
+            elif key in ('category', 'source'):
+                if code < 0 or (record_type == TYPE_CODES['income']) != (key == 'source'):
+                    continue
+                group = code
+            else:
+                group = ts // 86400
+            grouped[group] = grouped.get(group, 0) + amount
+
+        if key == 'type':
+            return {TRANSACTION_TYPES[group]: plain_number(amount) for group, amount in grouped.items()}
+        if key in ('category', 'source'):
+            return {self.strings[group]: plain_number(amount) for group, amount in grouped.items()}
+        length = 10 if key == 'day' else 7
+        totals = {}
+        for day, amount in grouped.items():
+            group = format_timestamp(day * 86400)[:length]
+            totals[group] = plain_number(totals.get(group, 0) + amount)
+        return totals
+
+    # rollup ذخیره‌شده با رکوردهای بعد از آن تکمیل می‌شود و در صورت نبودن از نو ساخته می‌شود
+    def get_rollups(self):
+        if self.rollups is None:
+            try:
+                with open(self.rollups_filename, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except FileNotFoundError:
+                state = None
+            if state is not None and state['count'] <= self.count:
+                rollups = Rollups.from_state(state)
+                for _, record in self.scan(rollups.count, self.count):
+                    rollups.add(self.decode(record))
+                self.rollups = rollups
+            else:
+                self.rebuild_rollups()
+        return self.rollups
+
+    def rebuild_rollups(self):
+        self.rollups = Rollups.build(self.transactions)
+
+    def rollup_totals(self, level, start=None, end=None, key=None):
+        return self.get_rollups().totals(level, start, end, key)
+
+
+USER_COLUMNS = ('username', 'user_id', 'password', 'email', 'created_at', 'last_login')
+
+
+# فهرست کاربران در جدول SQLite با کلید username: جستجو و ثبت‌نام فقط یک
+# سطر را می‌خوانند یا می‌نویسند و هزینه آن‌ها به تعداد کاربران بستگی ندارد.
+# last_login ها در حافظه جمع و با تاخیر، دسته‌ای نوشته می‌شوند
+class UserDirectory:
+    writer = WRITER
+
+    def __init__(self, filename='users.db', legacy_filename='users.json'):
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.last_logins = {}
+        self.conn = sqlite3.connect(filename, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    username TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    password TEXT NOT NULL,
+                    email TEXT,
+                    created_at TEXT,
+                    last_login TEXT
+                )""")
+        self.import_json(legacy_filename)
+
+    def import_json(self, filename):
+        # مهاجرت یک‌باره از users.json قدیمی
+        if not os.path.exists(filename):
+            return
+        with open(filename, 'r', encoding='utf-8') as f:
+            users = json.load(f)
+        placeholders = ', '.join('?' * len(USER_COLUMNS))
+        with self.lock, self.conn:
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO users ({', '.join(USER_COLUMNS)}) VALUES ({placeholders})",
+                (tuple(dict(user, username=username).get(key) for key in USER_COLUMNS)
+                 for username, user in users.items()))
+        os.replace(filename, f'{filename}.migrated')
+
+    def get(self, username):
+        with self.lock:
+            row = self.conn.execute(
+                f"SELECT {', '.join(USER_COLUMNS)} FROM users WHERE username = ?", (username,)).fetchone()
+            if row is None:
+                return None
+            user = dict(zip(USER_COLUMNS, row))
+            if username in self.last_logins:
+                user['last_login'] = self.last_logins[username]
+            return user
+
+    def add(self, user):
+        placeholders = ', '.join('?' * len(USER_COLUMNS))
+        try:
+            with self.lock, self.conn:
+                self.conn.execute(f"INSERT INTO users ({', '.join(USER_COLUMNS)}) VALUES ({placeholders})",
+                                  tuple(user.get(key) for key in USER_COLUMNS))
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def update(self, user):
+        columns = USER_COLUMNS[1:]
+        with self.lock, self.conn:
+            self.conn.execute(f"UPDATE users SET {', '.join(f'{key} = ?' for key in columns)} WHERE username = ?",
+                              tuple(user.get(key) for key in columns) + (user['username'],))
+
+    def touch(self, username, last_login, delay=None):
+        with self.lock:
+            self.last_logins[username] = last_login
+        self.writer.schedule(self.filename, self.flush_logins, delay)
+
+    def flush_logins(self):
+        with self.lock:
+            last_logins, self.last_logins = self.last_logins, {}
+            if self.conn is None:
+                return
+            with self.conn:
+                self.conn.executemany("UPDATE users SET last_login = ? WHERE username = ?",
+                                      [(value, username) for username, value in last_logins.items()])
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def close(self):
+        self.writer.flush(self.filename)
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+
+STORAGE_BACKENDS = {
+    'json': JsonStorage,
+    'journal': JournalStorage,
+    'sqlite': SQLiteStorage,
+    'mmap': MmapStorage,
+}
+
+
+# مهاجرت یک‌باره از فایل JSON (و ژورنال) قدیمی همین کاربر؛ write(transactions, state)
+# داده را در ذخیره‌ساز جدید می‌نویسد و پس از آن فایل‌های قدیمی کنار گذاشته می‌شوند
+def migrate_legacy_json(user_id, write):
+    legacy = JournalStorage(user_id)
+    legacy_files = (legacy.filename, legacy.journal.rotated_filename, legacy.journal.filename)
+    if not any(os.path.exists(filename) for filename in legacy_files):
+        return False
+    state = legacy.load() or {}
+    write(legacy.transactions, state)
+    for filename in legacy_files:
+        if os.path.exists(filename):
+            os.replace(filename, f'{filename}.migrated')
+    return True
+
+
+def migrate_json_files():
+    # همه فایل‌های financial_data_<user_id>.json را به SQLite منتقل می‌کند؛
+    # فایل‌های جانبی mmap (مثل .state.json و .rollups.json) حساب جداگانه نیستند
+    migrated = []
+    for filename in glob.glob('financial_data_*.json'):
+        user_id = filename[len('financial_data_'):-len('.json')]
+        if '.' in user_id:
+            continue
+        storage = SQLiteStorage(user_id)
+        storage.load()
+        storage.close()
+        migrated.append(user_id)
+    return migrated
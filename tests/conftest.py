@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from persistence import WRITER  # noqa: E402
+
+
+# فایل‌های داده نسبت به پوشه جاری ساخته می‌شوند؛ هر آزمون پوشه خالی خودش را دارد
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    WRITER.flush()
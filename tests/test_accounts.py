@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from accounts import AccountService
+from managers import FinancialManager
+from persistence import WRITER
+from storage import STORAGE_BACKENDS
+
+MODES = sorted(STORAGE_BACKENDS)
+USERS = [f'user{i}' for i in range(8)]
+
+
+# تعداد حساب‌ها بیشتر از max_accounts است، پس حساب‌ها مدام بسته و دوباره باز می‌شوند
+@pytest.mark.parametrize('mode', MODES)
+def test_concurrent_writes_across_evictions(workdir, mode):
+    service = AccountService(max_accounts=3, storage_mode=mode)
+
+    def write(i):
+        user_id = USERS[i % len(USERS)]
+        service.add_expense(user_id, 10 + i % 3, f'خرید {i}', '📦 دیگر')
+        assert len(service.accounts) <= service.max_accounts + 8
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(write, range(400)))
+    assert len(service.accounts) <= service.max_accounts
+    service.close()
+    WRITER.flush()
+
+    for index, user_id in enumerate(USERS):
+        expected = sum(10 + i % 3 for i in range(index, 400, len(USERS)))
+        fm = FinancialManager(user_id, mode)
+        assert len(fm.transactions) == 400 // len(USERS)
+        assert fm.get_balance() == -expected
+        fm.close()
+
+
+def test_locks_are_released_with_accounts(workdir):
+    service = AccountService(max_accounts=2)
+    for user_id in USERS:
+        service.add_income(user_id, 100, 'حقوق', 'حقوق')
+    assert len(service.locks) == 0
+    assert list(service.accounts) == USERS[-2:]
+    service.close()
+
+
+def test_pool_stays_bounded_when_caller_fails(workdir):
+    service = AccountService(max_accounts=2)
+    for user_id in USERS:
+        with pytest.raises(RuntimeError):
+            with service.account(user_id):
+                raise RuntimeError('request failed')
+    assert len(service.accounts) == 2
+    service.close()
+
+
+def test_failed_open_is_not_pooled(workdir):
+    def factory(user_id, storage_mode):
+        if user_id == 'broken':
+            raise OSError('disk unavailable')
+        return FinancialManager(user_id, storage_mode)
+
+    service = AccountService(max_accounts=2, factory=factory)
+    service.get_balance('u1')
+    with pytest.raises(OSError):
+        service.get_balance('broken')
+    assert list(service.accounts) == ['u1']
+    assert service.get_balance('u1') == 0
+    service.close()
@@ -0,0 +1,189 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('kivy')
+
+import main  # noqa: E402
+import managers  # noqa: E402
+
+
+class ManualClock:
+    def __init__(self):
+        self.callbacks = []
+
+    def schedule_once(self, callback, timeout=0):
+        self.callbacks.append(callback)
+        return SimpleNamespace(cancel=lambda: None)
+
+    def run(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback(0)
+
+
+class InlineThread:
+    def __init__(self, target, daemon=None):
+        self.target = target
+
+    def start(self):
+        self.target()
+
+
+@pytest.fixture
+def app(workdir, monkeypatch):
+    clock = ManualClock()
+    monkeypatch.setattr(main, 'Clock', clock)
+    monkeypatch.setattr(main, 'threading', SimpleNamespace(
+        Thread=InlineThread, Semaphore=threading.Semaphore, Event=threading.Event))
+    app = main.FinancialIntelligenceApp()
+    app.clock = clock
+    yield app
+    if app.fm is not None:
+        app.fm.close()
+
+
+def latest_notification(app):
+    return app.notification_manager.get_recent_notifications(1)[0]
+
+
+def test_open_account_error_reaches_callback(app, monkeypatch):
+    def broken(user_id):
+        raise OSError('disk unavailable')
+
+    monkeypatch.setattr(managers, 'FinancialManager', broken)
+    errors = []
+    app.open_account('u1', on_ready=lambda fm: None, on_error=errors.append)
+    app.clock.run()
+    assert errors == ['disk unavailable']
+
+
+# ورود به حساب دیگر و خروج، حساب قبلی را می‌بندند
+def test_previous_account_is_closed(app):
+    opened = []
+    app.open_account('u1', on_ready=opened.append)
+    app.clock.run()
+    first = opened[0]
+    first.add_income(5000, 'حقوق', 'حقوق')
+    app.open_account('u2', on_ready=opened.append)
+    app.clock.run()
+    assert app.fm is opened[1]
+    assert first.storage.conn is None
+    app.close_account()
+    assert app.fm is None
+    assert opened[1].storage.conn is None
+    reopened = managers.FinancialManager('u1')
+    assert reopened.get_balance() == 5000
+    reopened.close()
+
+
+def test_import_error_is_notified(app):
+    app.fm = managers.FinancialManager('u1')
+    app.import_statement('missing.csv')
+    app.clock.run()
+    notification = latest_notification(app)
+    assert notification['title'].startswith('خطا در ورود صورتحساب')
+    assert 'missing.csv' in notification['message']
+
+
+def test_export_error_is_notified(app):
+    app.fm = managers.FinancialManager('u1')
+    app.export_transactions('history.xlsx')
+    app.clock.run()
+    notification = latest_notification(app)
+    assert notification['title'].startswith('خطا در خروجی گرفتن')
+    assert 'xlsx' in notification['message']
+
+
+def test_export_success_is_notified(app, workdir):
+    app.fm = managers.FinancialManager('u1')
+    app.fm.add_expense(1000, 'نان', app.fm.categories[0])
+    app.export_transactions('history.csv')
+    app.clock.run()
+    assert latest_notification(app)['title'].startswith('خروجی تراکنش‌ها')
+    assert (workdir / 'history.csv').exists()
+
+
+def test_import_applies_batches_on_main_thread(app, workdir):
+    (workdir / 'statement.csv').write_text(
+        'date,amount,description\n2024-07-01,-1000,نان\n2024-07-02,3000,حقوق\n', encoding='utf-8')
+    app.fm = managers.FinancialManager('u1')
+    app.import_statement('statement.csv')
+    # thread فقط فایل را خوانده است
+    assert len(app.fm.transactions) == 0
+    while app.clock.callbacks:
+        app.clock.run()
+    assert len(app.fm.transactions) == 2
+    assert latest_notification(app)['title'].startswith('ورود صورتحساب')
+
+
+def test_import_stops_when_account_closes(app, workdir):
+    (workdir / 'statement.csv').write_text('date,amount,description\n2024-07-01,-1000,نان\n', encoding='utf-8')
+    fm = app.fm = managers.FinancialManager('u1')
+    app.import_statement('statement.csv')
+    app.fm = None
+    while app.clock.callbacks:
+        app.clock.run()
+    assert len(fm.transactions) == 0
+    fm.close()
+
+
+def write_statement(path, rows):
+    lines = ['date,amount,description']
+    lines += [f'2024-07-{day % 28 + 1:02d} 10:{day % 60:02d}:00,-{100 + day},خرید {day}' for day in range(rows)]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+# thread واقعی که برای انتظار تا پایان کارش نگه داشته می‌شود
+@pytest.fixture
+def threads(monkeypatch):
+    started = []
+
+    class RecordingThread(threading.Thread):
+        def start(self):
+            started.append(self)
+            super().start()
+
+    monkeypatch.setattr(main, 'threading', SimpleNamespace(
+        Thread=RecordingThread, Semaphore=threading.Semaphore, Event=threading.Event))
+    return started
+
+
+# اجرای Clock تا پایان thread و همه callback ها؛ خروجی: بیشترین callback در انتظار
+def drain(app, threads):
+    pending = 0
+    deadline = time.monotonic() + 10
+    while threads[0].is_alive() or app.clock.callbacks:
+        assert time.monotonic() < deadline
+        pending = max(pending, len(app.clock.callbacks))
+        app.clock.run()
+        time.sleep(0.001)
+    return pending
+
+
+# thread خواننده بیش از IMPORT_BACKLOG دسته جلوتر از ثبت نمی‌رود
+def test_import_streams_with_backlog(app, workdir, threads):
+    app.IMPORT_BATCH_SIZE = 2
+    write_statement(workdir / 'statement.csv', 15)
+    app.fm = managers.FinancialManager('u1')
+    app.import_statement('statement.csv')
+    assert drain(app, threads) <= app.IMPORT_BACKLOG + 1
+    assert latest_notification(app)['title'].startswith('ورود صورتحساب')
+    assert len(app.fm.transactions) == 15
+    assert app.fm.get_total_expense() == sum(100 + day for day in range(15))
+
+
+def test_import_worker_exits_when_account_closes(app, workdir, threads):
+    app.IMPORT_BATCH_SIZE = 2
+    write_statement(workdir / 'statement.csv', 15)
+    fm = app.fm = managers.FinancialManager('u1')
+    app.import_statement('statement.csv')
+    while not app.clock.callbacks:
+        time.sleep(0.001)
+    app.clock.run()
+    app.fm = None
+    drain(app, threads)
+    assert 0 < len(fm.transactions) < 15
+    fm.close()
@@ -0,0 +1,147 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from accounts import AccountService
+from async_api import AsyncAccountService, AsyncFinancialManager, AsyncUserManager
+from credentials import PasswordHasher, SessionCache
+from managers import FinancialManager, UserManager
+
+
+@pytest.fixture
+def users(workdir):
+    um = UserManager(PasswordHasher('pbkdf2_sha256', iterations=1000))
+    for name in ('alice', 'bob'):
+        um.register_user(name, f'{name}-password', f'{name}@example.com')
+    yield um
+    um.directory.close()
+
+
+def test_concurrent_logins_get_separate_sessions(users):
+    async def scenario():
+        with ThreadPoolExecutor(4) as executor:
+            api = AsyncUserManager(users, executor)
+            (ok_a, _, alice), (ok_b, _, bob) = await asyncio.gather(
+                api.login_user('alice', 'alice-password'), api.login_user('bob', 'bob-password'))
+            assert ok_a and ok_b
+            assert (await api.get_user_data(alice))['username'] == 'alice'
+            assert (await api.get_user_data(bob))['username'] == 'bob'
+
+            await api.logout_user(alice)
+            assert await api.get_user_data(alice) is None
+            assert (await api.get_user_data(bob))['username'] == 'bob'
+
+            failed = await api.login_user('bob', 'wrong')
+            assert failed[0] is False and failed[2] is None
+
+    asyncio.run(scenario())
+    # نشست‌های async به کاربر رابط گرافیکی دست نمی‌زنند
+    assert users.current_user is None
+
+
+def test_session_cache_under_threads():
+    cache = SessionCache(max_entries=50)
+
+    def worker(i):
+        token = cache.remember(f'user{i % 10}', 'secret')
+        assert cache.check(f'user{i % 10}', 'secret')
+        cache.resume(token)
+        cache.revoke(token)
+        if i % 7 == 0:
+            cache.forget(f'user{i % 10}')
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(worker, range(2000)))
+    assert len(cache.tokens) <= 50
+
+
+def record_batches(monkeypatch, fm):
+    sizes = []
+    add_transactions = fm.add_transactions
+
+    def recording(transactions):
+        sizes.append(len(transactions))
+        add_transactions(transactions)
+
+    monkeypatch.setattr(fm, 'add_transactions', recording)
+    return sizes
+
+
+def test_concurrent_expenses_are_batched(workdir, monkeypatch):
+    fm = FinancialManager('u1')
+    sizes = record_batches(monkeypatch, fm)
+
+    async def scenario():
+        with ThreadPoolExecutor(2) as executor:
+            api = AsyncFinancialManager(fm, executor)
+            results = await asyncio.gather(*(api.add_expense(10, f'خرید {i}', fm.categories[0]) for i in range(200)))
+            assert all(results)
+            return await api.get_balance()
+
+    assert asyncio.run(scenario()) == -2000
+    assert sum(sizes) == 200
+    assert len(sizes) < 200
+    fm.close()
+
+
+# درخواست‌هایی که هنگام نوشتن دسته قبلی می‌رسند دسته بعدی را می‌سازند
+def test_requests_during_a_write_form_the_next_batch(workdir, monkeypatch):
+    fm = FinancialManager('u1')
+    sizes = record_batches(monkeypatch, fm)
+
+    async def scenario():
+        with ThreadPoolExecutor(2) as executor:
+            api = AsyncFinancialManager(fm, executor)
+            first = asyncio.ensure_future(api.add_income(500, 'حقوق', 'حقوق'))
+            await asyncio.sleep(0)
+            rest = [api.add_expense(10, f'خرید {i}', fm.categories[0]) for i in range(50)]
+            await asyncio.gather(first, *rest)
+
+    asyncio.run(scenario())
+    assert sizes == [1, 50]
+    assert fm.get_balance() == 0
+    fm.close()
+
+
+def test_batch_failure_reaches_every_caller(workdir, monkeypatch):
+    fm = FinancialManager('u1')
+
+    def broken(transactions):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(fm, 'add_transactions', broken)
+
+    async def scenario():
+        api = AsyncFinancialManager(fm)
+        return await asyncio.gather(*(api.add_expense(10, 'x', fm.categories[0]) for _ in range(5)),
+                                    return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert len(results) == 5
+    assert all(isinstance(result, OSError) for result in results)
+    fm.close()
+
+
+def test_account_service_batches_per_user(workdir, monkeypatch):
+    service = AccountService(max_accounts=2)
+    batches = []
+    add_transactions = FinancialManager.add_transactions
+
+    def recording(fm, transactions):
+        batches.append((fm.user_id, len(transactions)))
+        add_transactions(fm, transactions)
+
+    monkeypatch.setattr(FinancialManager, 'add_transactions', recording)
+
+    async def scenario():
+        with ThreadPoolExecutor(4) as executor:
+            api = AsyncAccountService(service, executor)
+            users = [f'user{i}' for i in range(4)]
+            await asyncio.gather(*(api.add_expense(users[i % 4], 5, 'x', '📦 دیگر') for i in range(100)))
+            return [await api.get_balance(user_id) for user_id in users]
+
+    assert asyncio.run(scenario()) == [-125] * 4
+    assert sum(size for _, size in batches) == 100
+    assert len(batches) < 100
+    service.close()
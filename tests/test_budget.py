@@ -0,0 +1,92 @@
+from datetime import datetime
+
+import pytest
+
+from budget import BudgetAlertEngine, alert_message
+from managers import FinancialManager
+from persistence import WRITER
+from storage import STORAGE_BACKENDS, to_timestamp
+
+MODES = sorted(STORAGE_BACKENDS)
+JULY = datetime(2024, 7, 15, 12)
+AUGUST = datetime(2024, 8, 2, 12)
+
+
+def expense(amount, date, category='food'):
+    return {'type': 'expense', 'amount': amount, 'category': category,
+            'date': date.strftime("%Y-%m-%d %H:%M:%S"), 'ts': to_timestamp(date)}
+
+
+def thresholds(alerts):
+    return [alert['threshold'] for alert in alerts]
+
+
+# عبور یک‌باره از ۱۰۰٪ فقط هشدار ۱۰۰٪ را می‌دهد، حتی اگر آستانه‌ها نامرتب داده شوند
+def test_jump_past_budget_reports_highest_threshold():
+    engine = BudgetAlertEngine({'food': 1000}, {}, thresholds=(1.0, 0.9))
+    alerts = engine.record(expense(1200, JULY), JULY)
+    assert thresholds(alerts) == [1.0]
+    assert alert_message(alerts[0]).endswith('تمام شده است!')
+    assert engine.record(expense(10, JULY), JULY) == []
+
+
+def test_each_threshold_fires_once_per_period():
+    engine = BudgetAlertEngine({'food': 1000}, {})
+    assert engine.record(expense(850, JULY), JULY) == []
+    assert thresholds(engine.record(expense(60, JULY), JULY)) == [0.9]
+    assert engine.record(expense(40, JULY), JULY) == []
+    assert thresholds(engine.record(expense(50, JULY), JULY)) == [1.0]
+    assert engine.record(expense(500, JULY), JULY) == []
+
+
+@pytest.mark.parametrize('period, later', [('month', AUGUST), ('week', datetime(2024, 7, 22, 9))])
+def test_alerts_reset_in_next_period(period, later):
+    engine = BudgetAlertEngine({'food': 1000}, {'food': period})
+    assert thresholds(engine.record(expense(950, JULY), JULY)) == [0.9]
+    assert engine.record(expense(100, later), later) == []
+    assert thresholds(engine.record(expense(850, later), later)) == [0.9]
+    assert thresholds(engine.status(later)) == [0.9]
+
+
+def test_expense_from_previous_period_is_ignored():
+    engine = BudgetAlertEngine({'food': 1000}, {})
+    assert engine.record(expense(2000, JULY), AUGUST) == []
+    assert engine.status(AUGUST) == []
+
+
+def test_load_keeps_only_current_period_alerts():
+    engine = BudgetAlertEngine({'food': 1000}, {})
+    engine.record(expense(950, JULY), JULY)
+    state = engine.get_state()
+
+    restored = BudgetAlertEngine({'food': 1000}, {})
+    restored.load(lambda start: {'food': 950}, state, JULY)
+    assert restored.record(expense(20, JULY), JULY) == []
+
+    next_month = BudgetAlertEngine({'food': 1000}, {})
+    next_month.load(lambda start: {'food': 0}, state, AUGUST)
+    assert next_month.emitted == set()
+
+
+# هشدارهای صادرشده پس از بستن و باز کردن حساب دوباره صادر نمی‌شوند
+@pytest.mark.parametrize('mode', MODES)
+def test_emitted_alerts_survive_reopen(workdir, mode):
+    fm = FinancialManager('u1', mode)
+    category = fm.categories[0]
+    fm.set_budget(category, 1000)
+    alerts = []
+    fm.bind(budget_alert=lambda manager, alert: alerts.append(alert))
+    fm.add_expense(920, 'خرید', category)
+    assert thresholds(alerts) == [0.9]
+    fm.close()
+    WRITER.flush()
+
+    reopened = FinancialManager('u1', mode)
+    alerts = []
+    reopened.bind(budget_alert=lambda manager, alert: alerts.append(alert))
+    reopened.add_expense(30, 'نان', category)
+    assert alerts == []
+    reopened.add_expense(60, 'میوه', category)
+    assert thresholds(alerts) == [1.0]
+    assert reopened.check_budget_alerts() == [f'هشدار: بودجه {category} تمام شده است!']
+    reopened.close()
@@ -0,0 +1,78 @@
+import csv
+from datetime import datetime
+import json
+
+import pytest
+
+from exporters import read_columnar, write_columnar
+from managers import FinancialManager
+from storage import STORAGE_BACKENDS
+from test_storage import history
+
+MODES = sorted(STORAGE_BACKENDS)
+
+
+def read_csv_export(path):
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return [(row['date'], row['type'], float(row['amount']), row['description']) for row in csv.DictReader(f)]
+
+
+def read_jsonl_export(path):
+    with open(path, encoding='utf-8') as f:
+        return [(t['date'], t['type'], t['amount'], t['description']) for t in map(json.loads, f)]
+
+
+def read_hmc_export(path):
+    return [(t['date'], t['type'], t['amount'], t['description']) for t in read_columnar(path)]
+
+
+READERS = {
+    'csv': read_csv_export,
+    'jsonl': read_jsonl_export,
+    'hmc': read_hmc_export,
+}
+
+FILTERS = [
+    {},
+    {'start': datetime(2024, 5, 15), 'end': datetime(2024, 6, 30)},
+    {'transaction_type': 'income'},
+    {'category': '🚗 حمل‌ونقل'},
+]
+
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('fmt', sorted(READERS))
+@pytest.mark.parametrize('filters', FILTERS)
+def test_export_round_trip(workdir, mode, fmt, filters):
+    fm = FinancialManager('u1', mode)
+    fm.add_transactions(history(fm))
+    expected = sorted((t['date'], t['type'], t['amount'], t['description'])
+                      for t in fm.iter_transactions(**filters))
+    assert expected
+
+    path = f'export.{fmt}'
+    count = fm.export_transactions(path, **filters)
+    assert count == len(expected)
+    assert sorted(READERS[fmt](path)) == expected
+    assert not (workdir / f'{path}.tmp').exists()
+    fm.close()
+
+
+def test_columnar_row_groups(workdir):
+    fm = FinancialManager('u1')
+    transactions = history(fm)
+    assert write_columnar('small.hmc', transactions, group_size=4) == len(transactions)
+    restored = list(read_columnar('small.hmc'))
+    assert [(t['ts'], t['amount'], t.get('category'), t.get('source')) for t in restored] == \
+        [(t['ts'], t['amount'], t.get('category'), t.get('source')) for t in transactions]
+    fm.close()
+
+
+def test_truncated_columnar_file(workdir):
+    fm = FinancialManager('u1')
+    write_columnar('full.hmc', history(fm))
+    data = (workdir / 'full.hmc').read_bytes()
+    (workdir / 'cut.hmc').write_bytes(data[:len(data) // 2])
+    with pytest.raises(ValueError):
+        list(read_columnar('cut.hmc'))
+    fm.close()
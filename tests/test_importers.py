@@ -0,0 +1,130 @@
+from datetime import datetime
+
+import pytest
+
+from importers import parse_date
+from managers import FinancialManager
+from storage import STORAGE_BACKENDS, to_timestamp
+
+MODES = sorted(STORAGE_BACKENDS)
+
+CSV_STATEMENT = '''date,amount,description
+2024-07-01,-120000,Snapp taxi
+2024-07-01,-120000,Snapp taxi
+2024-07-03,5000000,Salary
+2024-07-05,,broken row
+'''
+
+OFX_STATEMENT = '''OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240702120000<TRNAMT>-45000<NAME>Cafe Lamiz</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240704<TRNAMT>250000<NAME>Refund</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+'''
+
+
+@pytest.fixture
+def statement(workdir):
+    (workdir / 'statement.csv').write_text(CSV_STATEMENT, encoding='utf-8')
+    (workdir / 'statement.ofx').write_text(OFX_STATEMENT, encoding='utf-8')
+    return workdir
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_import_csv(statement, mode):
+    fm = FinancialManager('u1', mode)
+    stats = fm.import_statement('statement.csv')
+    assert stats['imported'] == 3
+    assert stats['skipped'] == 1
+    assert stats['expense'] == 240000
+    assert fm.get_balance() == 5000000 - 240000
+    fm.close()
+
+
+@pytest.mark.parametrize('name', ['statement.ofx', 'statement.qfx'])
+def test_import_ofx(statement, name):
+    (statement / name).write_text(OFX_STATEMENT, encoding='utf-8')
+    fm = FinancialManager('u1')
+    stats = fm.import_statement(name)
+    assert stats['imported'] == 2
+    assert fm.get_balance() == 250000 - 45000
+    fm.close()
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_reimport_skips_duplicates(statement, mode):
+    fm = FinancialManager('u1', mode)
+    fm.import_statement('statement.csv')
+    stats = fm.import_statement('statement.csv')
+    assert stats['imported'] == 0
+    assert stats['duplicates'] == 3
+    assert len(fm.transactions) == 3
+    fm.close()
+
+
+def test_dedupe_reads_only_statement_range(statement, monkeypatch):
+    fm = FinancialManager('u1')
+    fm.import_statement('statement.csv')
+    fm.import_statement('statement.ofx')
+    ranges = []
+    iter_range = fm.storage.iter_range
+
+    def recording(start=None, end=None, **filters):
+        ranges.append((start, end))
+        return iter_range(start, end, **filters)
+
+    monkeypatch.setattr(fm.storage, 'iter_range', recording)
+    job = fm.statement_import('statement.ofx')
+    job.read_range()
+    assert (job.start, job.end) == (to_timestamp(datetime(2024, 7, 2, 12)), to_timestamp(datetime(2024, 7, 4)))
+    keys = fm.existing_keys(job.start, job.end)
+    assert ranges == [(job.start, job.end + 1)]
+    assert sum(keys.values()) == 3
+    assert not any(key[3] == 'Snapp taxi' for key in keys)
+    fm.close()
+
+
+# دسته‌ها در گذر دوم از فایل ساخته می‌شوند؛ تکراری‌های یک کلید در دسته‌های مختلف هم شمرده می‌شوند
+def test_import_streams_batches(statement, monkeypatch):
+    fm = FinancialManager('u1')
+    fm.import_statement('statement.csv')
+    (statement / 'statement.csv').write_text(CSV_STATEMENT + '2024-07-01,-120000,Snapp taxi\n', encoding='utf-8')
+    sizes = []
+    add_transactions = fm.add_transactions
+
+    def recording(batch):
+        sizes.append(len(batch))
+        add_transactions(batch)
+
+    monkeypatch.setattr(fm, 'add_transactions', recording)
+    stats = fm.import_statement('statement.csv', batch_size=1)
+    assert sizes == [1]
+    assert stats['imported'] == 1
+    assert stats['duplicates'] == 3
+    assert stats['skipped'] == 1
+    fm.close()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('1403/05/10', datetime(2024, 7, 31)),
+    ('1403/01/01', datetime(2024, 3, 20)),
+    ('۱۴۰۲/۱۲/۲۹', datetime(2024, 3, 19)),
+    ('1403-12-30 14:05', datetime(2025, 3, 20, 14, 5)),
+    ('2024-07-31', datetime(2024, 7, 31)),
+    ('31/07/2024', datetime(2024, 7, 31)),
+])
+def test_parse_date(text, expected):
+    assert parse_date(text) == expected
+
+
+@pytest.mark.parametrize('text', ['1403/07/31', '1403/13/01', 'دیروز'])
+def test_parse_date_rejects_invalid(text):
+    assert parse_date(text) is None
+
+
+def test_import_jalali_csv(workdir):
+    (workdir / 'jalali.csv').write_text('تاریخ,مبلغ,شرح\n۱۴۰۳/۰۵/۱۰,-۲۵۰۰۰,نان\n', encoding='utf-8')
+    fm = FinancialManager('u1')
+    fm.import_statement('jalali.csv')
+    assert fm.transactions[0]['date'] == '2024-07-31 00:00:00'
+    fm.close()
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from persistence import WriteBehind
+
+
+# thread پس‌زمینه بعد از برداشتن کلید و پیش از نوشتن کمی صبر می‌کند
+class SlowWriteBehind(WriteBehind):
+    def __init__(self, delay=0):
+        super().__init__(delay)
+        self.taken = threading.Event()
+
+    def write(self, key, writer, retries=0):
+        if threading.current_thread() is self.thread:
+            self.taken.set()
+            time.sleep(0.2)
+        super().write(key, writer, retries)
+
+
+def test_writes_are_debounced():
+    writer = WriteBehind(delay=60)
+    written = []
+    for i in range(5):
+        writer.schedule('k', lambda i=i: written.append(i))
+    assert writer.is_pending('k')
+    writer.flush('k')
+    assert written == [4]
+    assert not writer.is_pending('k')
+
+
+def test_flush_waits_for_older_write_of_same_key():
+    writer = SlowWriteBehind()
+    written = []
+    writer.schedule('k', lambda: written.append('old'))
+    assert writer.taken.wait(5)
+    writer.schedule('k', lambda: written.append('new'))
+    writer.flush('k')
+    assert written == ['old', 'new']
+
+
+def test_flush_all_waits_for_older_writes():
+    writer = SlowWriteBehind()
+    written = []
+    writer.schedule('a', lambda: written.append('a-old'))
+    assert writer.taken.wait(5)
+    writer.schedule('a', lambda: written.append('a-new'))
+    writer.schedule('b', lambda: written.append('b'))
+    writer.flush()
+    assert written.index('a-old') < written.index('a-new')
+    assert sorted(written) == ['a-new', 'a-old', 'b']
+
+
+def test_failed_write_is_retried():
+    writer = WriteBehind(delay=0)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise OSError('disk busy')
+
+    writer.schedule('k', flaky)
+    deadline = time.monotonic() + 5
+    while len(attempts) < 2:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    writer.flush()
+    assert len(attempts) == 2
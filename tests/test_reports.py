@@ -0,0 +1,90 @@
+from datetime import datetime
+
+import pytest
+
+from budget import period_start
+from managers import FinancialManager
+from reports import REPORT_PERIODS, REPORT_TYPES
+from storage import STORAGE_BACKENDS
+from test_storage import dated, history
+
+MODES = sorted(STORAGE_BACKENDS)
+JUNE = datetime(2024, 6, 20, 12)
+JULY = datetime(2024, 7, 10, 12)
+
+
+def fresh(fm, report_type, period, now):
+    start = None if period == 'all' else period_start(period, now)
+    return REPORT_TYPES[report_type][0](fm, start)
+
+
+def later_transactions(fm):
+    return [
+        dated(FinancialManager.expense_transaction(75, 'نان', fm.categories[0]), datetime(2024, 6, 19, 8)),
+        dated(FinancialManager.income_transaction(400, 'پروژه', 'آزادکاری'), datetime(2024, 6, 20, 10)),
+        dated(FinancialManager.expense_transaction(30, 'قدیمی', fm.categories[2]), datetime(2024, 3, 1, 10)),
+    ]
+
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('report_type', sorted(REPORT_TYPES))
+@pytest.mark.parametrize('period', REPORT_PERIODS)
+def test_patched_report_matches_recompute(workdir, mode, report_type, period):
+    fm = FinancialManager('u1', mode)
+    fm.add_transactions(history(fm))
+    assert fm.reports.get(fm, report_type, period, JUNE) == fresh(fm, report_type, period, JUNE)
+    for transaction in later_transactions(fm):
+        fm.add_transaction(transaction)
+    patches = fm.reports.patches
+    assert fm.reports.get(fm, report_type, period, JUNE) == fresh(fm, report_type, period, JUNE)
+    assert fm.reports.patches == patches + 1
+    fm.close()
+
+
+def test_report_beyond_log_window_is_recomputed(workdir):
+    fm = FinancialManager('u1')
+    fm.reports.log = fm.reports.log.__class__(maxlen=2)
+    fm.add_transactions(history(fm))
+    fm.reports.get(fm, 'categories', 'month', JUNE)
+    for transaction in later_transactions(fm):
+        fm.add_transaction(transaction)
+    misses = fm.reports.misses
+    assert fm.reports.get(fm, 'categories', 'month', JUNE) == fresh(fm, 'categories', 'month', JUNE)
+    assert fm.reports.misses == misses + 1
+    fm.close()
+
+
+def test_report_is_recomputed_in_new_period(workdir):
+    fm = FinancialManager('u1')
+    fm.add_transactions(history(fm))
+    june = fm.reports.get(fm, 'summary', 'month', JUNE)
+    assert june['income'] == 9000
+    misses = fm.reports.misses
+    july = fm.reports.get(fm, 'summary', 'month', JULY)
+    assert fm.reports.misses == misses + 1
+    assert july == fresh(fm, 'summary', 'month', JULY)
+    assert july['income'] == 0
+    fm.close()
+
+
+def test_invalidate_forces_recompute(workdir):
+    fm = FinancialManager('u1')
+    fm.add_transactions(history(fm))
+    fm.reports.get(fm, 'sources', 'all')
+    fm.reports.invalidate()
+    assert fm.reports.stats()['entries'] == 0
+    misses = fm.reports.misses
+    assert fm.reports.get(fm, 'sources', 'all') == fresh(fm, 'sources', 'all', None)
+    assert fm.reports.misses == misses + 1
+    fm.close()
+
+
+# تغییر گزارش برگردانده‌شده روی نسخه ذخیره‌شده اثری ندارد
+def test_report_is_returned_as_copy(workdir):
+    fm = FinancialManager('u1')
+    fm.add_transactions(history(fm))
+    report = fm.get_report('categories')
+    report[fm.categories[0]] = -1
+    report['extra'] = 5
+    assert fm.get_report('categories') == fresh(fm, 'categories', 'all', None)
+    fm.close()
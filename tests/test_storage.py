@@ -0,0 +1,329 @@
+from datetime import datetime
+import json
+
+import pytest
+
+from managers import FinancialManager
+from persistence import WRITER
+from rollups import Rollups
+import storage
+from storage import MMAP_UNSORTED, STORAGE_BACKENDS, migrate_json_files, to_timestamp
+
+MODES = sorted(STORAGE_BACKENDS)
+
+
+# شبیه‌سازی قطع برنامه: نوشتن‌های در صف هرگز انجام نمی‌شوند
+def drop_pending_writes():
+    with WRITER.condition:
+        WRITER.pending.clear()
+
+
+def dated(transaction, date):
+    return dict(transaction, date=date.strftime("%Y-%m-%d %H:%M:%S"), ts=to_timestamp(date))
+
+
+# تاریخچه‌ای در چند ماه که عمدا به ترتیب زمان ثبت نشده است
+def history(fm):
+    food, transport = fm.categories[0], fm.categories[1]
+    return [
+        dated(FinancialManager.income_transaction(9000, 'حقوق خرداد', 'حقوق'), datetime(2024, 6, 1, 9)),
+        dated(FinancialManager.expense_transaction(450, 'نان', food), datetime(2024, 6, 3, 8)),
+        dated(FinancialManager.expense_transaction(1200, 'اسنپ', transport), datetime(2024, 5, 20, 18)),
+        dated(FinancialManager.income_transaction(8500, 'حقوق اردیبهشت', 'حقوق'), datetime(2024, 5, 1, 9)),
+        dated(FinancialManager.expense_transaction(300.5, 'کافه', food), datetime(2024, 7, 2, 16)),
+        dated(FinancialManager.expense_transaction(700, 'بنزین', transport), datetime(2023, 12, 30, 11)),
+    ]
+
+
+def snapshot(fm):
+    return {
+        'balance': fm.get_balance(),
+        'categories': fm.get_category_expenses(),
+        'june': fm.get_period_report(datetime(2024, 6, 1), datetime(2024, 7, 1)),
+        'months': fm.get_rollup_totals('month'),
+        'food_months': fm.get_rollup_totals('month', category=fm.categories[0]),
+        'years': fm.get_rollup_totals('year'),
+        'range': sorted((t['ts'], t['amount'], t['description'])
+                        for t in fm.iter_transactions(datetime(2024, 5, 15), datetime(2024, 6, 30))),
+    }
+
+
+def add_sample(fm):
+    fm.add_income(5000, 'حقوق', 'حقوق')
+    fm.add_expense(1200, 'نان', fm.categories[0])
+    fm.add_expense(800, 'تاکسی', fm.categories[1])
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_reopen_after_close(workdir, mode):
+    fm = FinancialManager('u1', mode)
+    add_sample(fm)
+    fm.close()
+    WRITER.flush()
+
+    fm = FinancialManager('u1', mode)
+    assert len(fm.transactions) == 3
+    assert fm.get_balance() == 3000
+    assert fm.get_category_expenses()[fm.categories[0]] == 1200
+    fm.close()
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_reopen_without_close(workdir, mode):
+    fm = FinancialManager('u1', mode)
+    add_sample(fm)
+    WRITER.flush()
+
+    reopened = FinancialManager('u1', mode)
+    assert len(reopened.transactions) == 3
+    assert reopened.get_balance() == 3000
+    assert reopened.verify_totals()
+    reopened.close()
+    fm.storage.close()
+
+
+# قطع برنامه پیش از اولین snapshot: فقط ژورنال روی دیسک است
+def test_journal_crash_recovery(workdir):
+    fm = FinancialManager('u1', 'journal')
+    for i in range(12):
+        fm.add_expense(100, f'خرید {i}', fm.categories[i % 3])
+    drop_pending_writes()
+
+    recovered = FinancialManager('u1', 'journal')
+    assert len(recovered.transactions) == 12
+    assert recovered.get_balance() == -1200
+    assert recovered.totals['categories'][fm.categories[0]] == 400
+    recovered.close()
+
+
+def test_journal_recovery_drops_partial_record(workdir):
+    fm = FinancialManager('u1', 'journal')
+    add_sample(fm)
+    with open(fm.storage.journal.filename, 'a', encoding='utf-8') as f:
+        f.write('{"seq": 4, "transaction": {"type": "exp')
+    drop_pending_writes()
+
+    recovered = FinancialManager('u1', 'journal')
+    assert len(recovered.transactions) == 3
+    assert recovered.get_balance() == 3000
+    recovered.close()
+
+
+def test_migrate_json_files_skips_mmap_sidecars(workdir):
+    fm = FinancialManager('u1', 'json')
+    add_sample(fm)
+    fm.close()
+    fm = FinancialManager('u2', 'mmap')
+    add_sample(fm)
+    fm.close()
+    WRITER.flush()
+
+    assert migrate_json_files() == ['u1']
+    assert not (workdir / 'financial_data_u2.state.db').exists()
+    assert not (workdir / 'financial_data_u2.rollups.db').exists()
+    fm = FinancialManager('u1', 'sqlite')
+    assert fm.get_balance() == 3000
+    fm.close()
+
+
+def test_backend_parity(workdir):
+    results = {}
+    for mode in MODES:
+        fm = FinancialManager(f'parity_{mode}', mode)
+        fm.add_transactions(history(fm))
+        results[mode] = snapshot(fm)
+        fm.close()
+        WRITER.flush()
+        reopened = FinancialManager(f'parity_{mode}', mode)
+        assert snapshot(reopened) == results[mode]
+        reopened.close()
+    expected = results.pop('json')
+    assert expected['months']['2024-06'] == {'income': 9000, 'expense': 450}
+    for mode, result in results.items():
+        assert result == expected, mode
+        # 5000 و 5000.0 برابرند؛ خروجی JSON نوع عدد را هم مقایسه می‌کند
+        assert json.dumps(result, sort_keys=True) == json.dumps(expected, sort_keys=True), mode
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_amounts_stay_plain_numbers(workdir, mode):
+    fm = FinancialManager('u1', mode)
+    add_sample(fm)
+    fm.set_budget(fm.categories[0], 2000)
+    fm.close()
+    WRITER.flush()
+    fm = FinancialManager('u1', mode)
+    assert repr(fm.get_weekly_report()) == '(5000, 2000)'
+    assert repr(fm.storage.total('income')) == '5000'
+    assert [repr(t['amount']) for t in fm.iter_transactions()] == ['5000', '1200', '800']
+    assert repr(fm.get_totals_by('source')) == "{'حقوق': 5000}"
+    assert repr(fm.budget[fm.categories[0]]) == '2000'
+    fm.close()
+
+
+@pytest.mark.parametrize('mode', ['sqlite', 'mmap'])
+def test_legacy_json_migration(workdir, mode):
+    fm = FinancialManager('u1', 'journal')
+    fm.add_transactions(history(fm))
+    expected = snapshot(fm)
+    fm.close()
+    WRITER.flush()
+
+    migrated = FinancialManager('u1', mode)
+    assert snapshot(migrated) == expected
+    migrated.close()
+    assert (workdir / 'financial_data_u1.json.migrated').exists()
+    assert not (workdir / 'financial_data_u1.json').exists()
+
+
+def test_mmap_compaction_clears_unsorted_flag(workdir):
+    fm = FinancialManager('u1', 'mmap')
+    fm.add_transactions(history(fm))
+    assert fm.storage.flags & MMAP_UNSORTED
+    expected = snapshot(fm)
+    fm.save_data()
+    assert not fm.storage.flags & MMAP_UNSORTED
+    timestamps = [t['ts'] for t in fm.transactions]
+    assert timestamps == sorted(timestamps)
+    assert snapshot(fm) == expected
+    fm.close()
+    WRITER.flush()
+
+    reopened = FinancialManager('u1', 'mmap')
+    assert not reopened.storage.flags & MMAP_UNSORTED
+    assert snapshot(reopened) == expected
+    reopened.close()
+
+
+# قطع برنامه بعد از مرتب‌سازی فایل و پیش از نوشتن state توسط WRITER
+def test_mmap_compaction_crash(workdir):
+    fm = FinancialManager('u1', 'mmap')
+    transactions = history(fm)
+    fm.add_transactions(transactions[:2])
+    WRITER.flush()
+    fm.add_transactions(transactions[2:])
+    expected = snapshot(fm)
+    fm.save_data()
+    drop_pending_writes()
+
+    reopened = FinancialManager('u1', 'mmap')
+    assert snapshot(reopened) == expected
+    assert reopened.totals == reopened.compute_totals()
+    reopened.close()
+
+
+# snapshot قدیمی با دنباله ژورنال: جمع‌های آن همه تراکنش‌ها را پوشش نمی‌دهند
+def test_mmap_migration_from_journal_tail(workdir):
+    fm = FinancialManager('u1', 'journal')
+    transactions = history(fm)
+    fm.add_transactions(transactions[:3])
+    fm.save_data()
+    WRITER.flush()
+    fm.add_transactions(transactions[3:])
+    expected = snapshot(fm)
+    drop_pending_writes()
+
+    migrated = FinancialManager('u1', 'mmap')
+    assert snapshot(migrated) == expected
+    assert migrated.totals == migrated.compute_totals()
+    migrated.close()
+
+
+@pytest.mark.parametrize('mode', ['sqlite', 'mmap'])
+def test_columnar_rejects_disk_backends(workdir, mode):
+    with pytest.raises(ValueError, match=mode):
+        FinancialManager('u1', mode, columnar=True)
+
+
+@pytest.mark.parametrize('mode', ['json', 'journal'])
+def test_columnar_reopen(workdir, mode):
+    fm = FinancialManager('u1', mode, columnar=True)
+    fm.add_transactions(history(fm))
+    expected = snapshot(fm)
+    fm.close()
+    WRITER.flush()
+
+    reopened = FinancialManager('u1', mode, columnar=True)
+    assert snapshot(reopened) == expected
+    reopened.close()
+
+
+# تراکنشی که بعد از save و پیش از اجرای WRITER اضافه شود، در آن snapshot نوشته نمی‌شود
+@pytest.mark.parametrize('columnar', [False, True])
+def test_snapshot_uses_row_count_at_save(workdir, columnar):
+    fm = FinancialManager('u1', 'json', columnar=columnar)
+    add_sample(fm)
+    WRITER.flush()
+    fm.storage.save(fm.get_state())
+    fm.storage.transactions.append(FinancialManager.expense_transaction(50, 'دیرتر', fm.categories[0]))
+    WRITER.flush()
+
+    with open(fm.storage.filename, encoding='utf-8') as f:
+        data = json.load(f)
+    assert len(data['transactions']) == 3
+    assert data['rollups']['count'] == 3
+
+
+# rollup ذخیره‌شده باید بدون ساختن دوباره از تراکنش‌ها بارگذاری شود
+@pytest.mark.parametrize('mode', MODES)
+def test_rollups_persist(workdir, mode, monkeypatch):
+    fm = FinancialManager('u1', mode)
+    fm.add_transactions(history(fm))
+    expected = fm.get_rollup_totals('month')
+    fm.close()
+    WRITER.flush()
+
+    def rebuild(transactions):
+        raise AssertionError('rollups rebuilt on load')
+
+    monkeypatch.setattr(Rollups, 'build', rebuild)
+    reopened = FinancialManager('u1', mode)
+    assert reopened.get_rollup_totals('month') == expected
+    reopened.close()
+
+
+# تراکنش‌های بعد از آخرین ذخیره کامل به rollup ذخیره‌شده اضافه می‌شوند؛
+# حالت json جز snapshot چیزی روی دیسک ندارد
+@pytest.mark.parametrize('mode', [mode for mode in MODES if mode != 'json'])
+def test_rollups_include_later_transactions(workdir, mode):
+    fm = FinancialManager('u1', mode)
+    fm.add_transactions(history(fm))
+    fm.get_rollup_totals('month')
+    fm.save_data()
+    WRITER.flush()
+    fm.add_transaction(dated(FinancialManager.expense_transaction(99, 'دارو', fm.categories[4]),
+                             datetime(2024, 6, 10, 12)))
+    drop_pending_writes()
+
+    reopened = FinancialManager('u1', mode)
+    assert reopened.get_rollup_totals('month')['2024-06'] == {'income': 9000, 'expense': 549}
+    totals = reopened.get_rollup_totals('year')
+    reopened.storage.rebuild_rollups()
+    assert reopened.get_rollup_totals('year') == totals
+    reopened.close()
+
+
+# snapshot از rollup نگه‌داشته‌شده استفاده می‌کند و تراکنش‌ها را تکه به تکه می‌نویسد
+@pytest.mark.parametrize('columnar', [False, True])
+def test_snapshot_reuses_rollups(workdir, monkeypatch, columnar):
+    monkeypatch.setattr(storage, 'SNAPSHOT_CHUNK', 4)
+    fm = FinancialManager('u1', 'json', columnar=columnar)
+    fm.add_transactions(history(fm))
+    fm.get_rollup_totals('month')
+    expected = snapshot(fm)
+
+    def rebuild(transactions):
+        raise AssertionError('rollups rebuilt on save')
+
+    monkeypatch.setattr(Rollups, 'build', rebuild)
+    fm.close()
+    WRITER.flush()
+    with open(fm.storage.filename, encoding='utf-8') as f:
+        data = json.load(f)
+    assert len(data['transactions']) == 6
+    assert data['rollups']['count'] == 6
+    assert data['transactions'][0]['description'] == 'حقوق خرداد'
+
+    reopened = FinancialManager('u1', 'json', columnar=columnar)
+    assert snapshot(reopened) == expected
+    reopened.close()